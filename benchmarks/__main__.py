@@ -0,0 +1,245 @@
+"""Benchmarks of the parsers & exporters hot paths on synthetic data (see ps1_argonaut/synthetic.py), at several
+data sizes. Run from the repository root: python -m benchmarks [-o results.json] [--compare baseline.json]"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from io import BytesIO, StringIO
+from pathlib import Path
+
+# WADFile must be imported first to resolve the circular imports of the sections
+from ps1_argonaut.files.WADFile import WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.wad_sections.DPSX.AnimationData import AnimationData
+from ps1_argonaut.wad_sections.DPSX.Model3DData import Model3DData
+from ps1_argonaut.wad_sections.SPSX.VAGSoundData import MONO, VAGSoundData
+from ps1_argonaut.wad_sections.TPSX.TextureFile import TextureFile
+from ps1_argonaut import synthetic
+
+results_version = 1
+# Models are parsed & exported by batches, a single one is too fast to be timed accurately
+models_batch_size = 20
+n_vertices_groups = 20
+
+
+class Benchmark:
+    def __init__(
+        self,
+        name: str,
+        sizes: tuple[int, ...],
+        setup: Callable[[Configuration, int], tuple[Callable[[], object], int, int]],
+        items: str,
+    ):
+        """setup(conf, size) generates the data and returns the function to time, the number of processed bytes & the
+        number of processed items (of the given kind)."""
+        self.name = name
+        self.sizes = sizes
+        self.setup = setup
+        self.items = items
+
+
+def setup_texture_file(conf: Configuration, n_textures: int):
+    data = synthetic.texture_file_bytes(conf, n_textures)
+    return (
+        lambda: TextureFile.parse(
+            BytesIO(data), conf, has_legacy_textures=False, end=len(data)
+        ),
+        len(data),
+        n_textures,
+    )
+
+
+def setup_models(conf: Configuration, n_vertices: int):
+    data = b"".join(
+        synthetic.model_3d_bytes(
+            conf, n_vertices, n_vertices, 84, n_vertices_groups, seed
+        )
+        for seed in range(models_batch_size)
+    )
+
+    def parse_models():
+        data_in = BytesIO(data)
+        return [Model3DData.parse(data_in, conf) for _ in range(models_batch_size)]
+
+    return parse_models, len(data), models_batch_size
+
+
+def setup_animation(conf: Configuration, n_frames: int):
+    data = synthetic.animation_bytes(conf, n_frames, n_vertices_groups)
+    return lambda: AnimationData.parse(BytesIO(data), conf), len(data), n_frames
+
+
+def setup_vag(conf: Configuration, n_blocks: int):
+    data = synthetic.vag_bytes(n_blocks)
+    sound = VAGSoundData(data, MONO, 22050, conf)
+    return lambda: sound.to_wav("BENCH"), len(data), 28 * n_blocks
+
+
+def setup_obj(conf: Configuration, n_vertices: int):
+    texture_file_data = synthetic.texture_file_bytes(conf, 100)
+    textures = TextureFile.parse(
+        BytesIO(texture_file_data),
+        conf,
+        has_legacy_textures=False,
+        end=len(texture_file_data),
+    ).textures
+    data_in = BytesIO(
+        b"".join(
+            synthetic.model_3d_bytes(
+                conf, n_vertices, n_vertices, len(textures), n_vertices_groups, seed
+            )
+            for seed in range(models_batch_size)
+        )
+    )
+    models = [Model3DData.parse(data_in, conf) for _ in range(models_batch_size)]
+
+    def export_models():
+        for model in models:
+            model.to_single_obj(StringIO(), "BENCH", textures)
+
+    return export_models, len(data_in.getvalue()), models_batch_size
+
+
+def synthetic_wad(conf: Configuration, scale: int):
+    """Synthetic WAD whose assets counts & level area are scale times those of a small level."""
+    n_grid = round(8 * scale**0.5)
+    return synthetic.wad_file(
+        conf,
+        n_textures=min(100 * scale, 4000),
+        n_models=10 * scale,
+        n_animations=10 * scale,
+        n_rows=n_grid,
+        n_columns=n_grid,
+        n_sounds=6 * scale,
+    )
+
+
+def setup_wad_parse(conf: Configuration, scale: int):
+    data = synthetic_wad(conf, scale)._data
+    return (
+        lambda: WADFile("SYNTH", data=data).parse(conf),
+        len(data),
+        10 * scale,
+    )
+
+
+def setup_wad_scan(conf: Configuration, scale: int):
+    data = synthetic_wad(conf, scale)._data
+    return lambda: WADFile("SYNTH", data=data).scan(conf), len(data), 10 * scale
+
+
+benchmarks = (
+    Benchmark("TextureFile.parse", (100, 1000, 4000), setup_texture_file, "textures"),
+    Benchmark("Model3DData.parse", (100, 500, 1000), setup_models, "models"),
+    Benchmark("AnimationData.parse", (10, 100, 500), setup_animation, "frames"),
+    Benchmark("VAGSoundData.to_wav", (500, 2000, 8000), setup_vag, "samples"),
+    Benchmark("Model3DData.to_single_obj", (100, 500, 1000), setup_obj, "models"),
+    Benchmark("WADFile.parse", (1, 10), setup_wad_parse, "models"),
+    Benchmark("WADFile.scan", (1, 10, 100), setup_wad_scan, "models"),
+)
+
+
+def run(benchmark: Benchmark, conf: Configuration, size: int, repeat: int):
+    function, n_bytes, n_items = benchmark.setup(conf, size)
+    function()  # Warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {
+        "benchmark": benchmark.name,
+        "size": size,
+        "bytes": n_bytes,
+        "items": n_items,
+        "items_kind": benchmark.items,
+        "best": best,
+        "median": statistics.median(timings),
+        "mb_per_s": n_bytes / best / 1e6,
+        "items_per_s": n_items / best,
+    }
+
+
+def compare(results: dict, baseline: dict, max_slowdown: float = None):
+    """Prints the ratios of the best timings to the baseline ones, returns whether they're all within max_slowdown."""
+    ok = True
+    print(f"\n{'Benchmark':<40}{'Baseline (s)':>14}{'Current (s)':>14}{'Ratio':>8}")
+    for key, result in results["results"].items():
+        if key not in baseline["results"]:
+            continue
+        baseline_best = baseline["results"][key]["best"]
+        ratio = result["best"] / baseline_best
+        slower = max_slowdown is not None and ratio > max_slowdown
+        ok &= not slower
+        print(
+            f"{key:<40}{baseline_best:>14.6f}{result['best']:>14.6f}{ratio:>8.2f}"
+            + ("  SLOWER" if slower else "")
+        )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks the parsers & exporters on synthetic data.",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="Saves the results to this JSON file"
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="Compares the results to this JSON results file"
+    )
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        help="With --compare, exits with an error if a benchmark is slower than the baseline by more than this ratio",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs of each benchmark"
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="Only runs the benchmarks whose name contains this string",
+    )
+    args = parser.parse_args()
+
+    conf = Configuration(G.HARRY_POTTER_2_PS1)
+    results = {
+        "version": results_version,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "game": conf.game.title,
+        "results": {},
+    }
+    print(
+        f"{'Benchmark':<40}{'Best (s)':>12}{'Median (s)':>12}{'MB/s':>10}{'Items/s':>14}"
+    )
+    for benchmark in benchmarks:
+        if args.filter not in benchmark.name:
+            continue
+        for size in benchmark.sizes:
+            result = run(benchmark, conf, size, args.repeat)
+            key = f"{benchmark.name}[{size}]"
+            results["results"][key] = result
+            print(
+                f"{key:<40}{result['best']:>12.6f}{result['median']:>12.6f}{result['mb_per_s']:>10.2f}"
+                f"{result['items_per_s']:>14.1f} {benchmark.items}"
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="UTF-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="UTF-8"))
+        if not compare(results, baseline, args.max_slowdown):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,25 @@ import argparse
 import sys
 from pathlib import Path
 
+from ps1_argonaut.AssetsCatalog import AssetsCatalog
 from ps1_argonaut.configuration import (
     Configuration,
     PARSABLE_GAMES,
     SLICEABLE_GAMES,
     SUPPORTED_GAMES,
 )
+from ps1_argonaut.ContentStore import ContentStore
 from ps1_argonaut.DIR_DAT import DIR_DAT
+from ps1_argonaut.ExportManifest import ExportManifest
 from ps1_argonaut.files.DATFile import DATFile
 from ps1_argonaut.files.IMGFile import IMGFile
 from ps1_argonaut.files.WADFile import WADFile
+from ps1_argonaut.ImageWriter import ImageWriter
+from ps1_argonaut.Profiler import Profiler
+from ps1_argonaut.TextureArray import TextureArrayWriter
 from ps1_argonaut.wad_sections.DPSX.DPSXSection import DPSXSection
 from ps1_argonaut.wad_sections.SPSX.SPSXSection import SPSXSection
+from ps1_argonaut.wad_sections.SPSX.VAGIndex import VAGIndex
 from ps1_argonaut.wad_sections.TPSX.TPSXSection import TPSXSection
 
 
@@ -59,6 +66,26 @@ def parse_args(_args):
         help="Extracts WAD 3D models to the given folder.",
         metavar="FOLDER_PATH",
     )
+    parser.add_argument(
+        "-anim",
+        "--export-animated-models",
+        type=str,
+        help="Bakes every compatible animation of each WAD 3D model into binary glTF (GLB) files "
+        "(one morph target per frame) in the given folder.",
+        metavar="FOLDER_PATH",
+    )
+    parser.add_argument(
+        "--dedup-assets",
+        action="store_true",
+        help="Stores exported textures & 3D models in a content-addressed tree (an objects folder and one JSON "
+        "manifest per WAD): identical assets found in several WADs are only encoded & written once.",
+    )
+    parser.add_argument(
+        "--crop-textures",
+        action="store_true",
+        help="With --export-models or --export-levels, each model or level gets its own texture, only made of the "
+        "textures it uses, instead of the whole WAD texture (not compatible with --dedup-assets).",
+    )
     parser.add_argument(
         "-aud",
         "--export-audio",
@@ -72,6 +99,18 @@ def parse_args(_args):
         help="Unpack WAD audio tracks to the given folder (PS1 VAG format).",
         metavar="FOLDER_PATH",
     )
+    parser.add_argument(
+        "--dedup-audio",
+        action="store_true",
+        help="Exports/unpacks each unique sound only once across all WADs, "
+        f"duplicates are listed in a {VAGIndex.manifest_filename} manifest. The sounds are indexed in a "
+        f"{VAGIndex.index_filename} file, so that the next exports to the same folder don't write them again.",
+    )
+    parser.add_argument(
+        "--hardlink-duplicates",
+        action="store_true",
+        help="With --dedup-audio, hardlinks duplicates to the exported sounds instead of listing them.",
+    )
     parser.add_argument(
         "-lvl",
         "--export-levels",
@@ -79,12 +118,149 @@ def parse_args(_args):
         help="Extracts WAD levels as 3D models to the given folder.",
         metavar="FOLDER_PATH",
     )
+    parser.add_argument(
+        "--weld-levels",
+        action="store_true",
+        help="With --export-levels, merges the duplicate vertices of OBJ levels (like the shared edges of adjacent "
+        "chunks) into a single compact object.",
+    )
+    parser.add_argument(
+        "--level-lighting",
+        action="store_true",
+        help="With --export-levels, also exports levels with their lighting as binary glTF (GLB) files.",
+    )
+    parser.add_argument(
+        "--level-actors",
+        action="store_true",
+        help="With --export-levels, also exports levels with their actors (VERY EXPERIMENTAL) as binary glTF (GLB) "
+        "files. Actors are placed as empty nodes holding their script id & sound level, their models aren't "
+        "reversed yet.",
+    )
+    parser.add_argument(
+        "--level-lods",
+        action="store_true",
+        help="With --export-levels, also exports levels as binary glTF (GLB) files holding decimated levels of "
+        "detail (MSFT_lod extension), coarsest first.",
+    )
+    level_filters = parser.add_mutually_exclusive_group()
+    level_filters.add_argument(
+        "--level-region",
+        type=int,
+        nargs=4,
+        help="With --export-levels, only exports the chunks that intersect this rectangle (level coordinates, "
+        "chunks are 4096-large).",
+        metavar=("X_MIN", "Z_MIN", "X_MAX", "Z_MAX"),
+    )
+    level_filters.add_argument(
+        "--level-radius",
+        type=int,
+        nargs=3,
+        help="With --export-levels, only exports the chunks that intersect this circle (level coordinates).",
+        metavar=("X", "Z", "RADIUS"),
+    )
+    level_filters.add_argument(
+        "--level-zone",
+        type=int,
+        help="With --export-levels, only exports the chunks of this zone.",
+        metavar="ZONE_ID",
+    )
     parser.add_argument(
         "-img",
         "--export-images",
         type=str,
         help="Extracts .IMG files to the given folder.",
     )
+    parser.add_argument(
+        "--image-format",
+        choices=ImageWriter.formats,
+        default="PNG",
+        help="Format of the exported images & WAD textures. RAW writes uncompressed RGBA bytes along with a JSON "
+        "file giving their dimensions.",
+    )
+    parser.add_argument(
+        "--png-compression",
+        type=int,
+        choices=range(10),
+        default=6,
+        help="PNG compression level, from 0 (fastest, biggest files) to 9.",
+        metavar="LEVEL",
+    )
+    parser.add_argument(
+        "--image-threads",
+        type=int,
+        default=0,
+        help="Encodes & writes images & WAD textures in this many threads.",
+        metavar="N_THREADS",
+    )
+    parser.add_argument(
+        "--texture-array",
+        type=str,
+        help="Also packs all the .IMG images into this single memory-mappable file (raw RGBA pixels, then an index "
+        "of names, dimensions & offsets, see ps1_argonaut.TextureArray).",
+        metavar="FILE_PATH",
+    )
+    parser.add_argument(
+        "--texture-array-wads",
+        action="store_true",
+        help="With --texture-array, also packs each WAD's texture page.",
+    )
+    parser.add_argument(
+        "--catalog",
+        type=str,
+        help="Indexes the WADs (sections, textures, models, animations, sounds & level grids, with their offsets) "
+        "into this SQLite database.",
+        metavar="FILE_PATH",
+    )
+    parser.add_argument(
+        "--select",
+        type=str,
+        help="Queries the existing --catalog database instead of updating it, and only processes the WADs having "
+        "catalog rows that match the query, like models:n_vertices_groups=12 or wads:n_sounds=0 (tables: "
+        f"{', '.join(AssetsCatalog.tables)}). Other files are skipped.",
+        metavar="TABLE:COLUMN=VALUE[,COLUMN=VALUE...]",
+    )
+    parser.add_argument(
+        "--incremental",
+        type=str,
+        help="Only exports the files that changed since the export recorded in this JSON manifest (or whose export "
+        "options changed). The outputs of the files that disappeared are deleted, only if the DIR/DAT (or the "
+        "-files paths) didn't change. The manifest is created if it doesn't exist (not compatible with the "
+        "deduplication options & --texture-array).",
+        metavar="MANIFEST_PATH",
+    )
+    parser.add_argument(
+        "--scan-only",
+        action="store_true",
+        help="Only reads the WADs' headers to print their assets counts, much faster than a complete parsing "
+        "(the WAD exports & catalog are skipped).",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        help="Measures the time spent (and the bytes & items processed) by the WAD & sections parsing and by each "
+        "exporter, prints a table for each of the slowest files & for all the files, and saves a per-file & total "
+        "JSON report to this path.",
+        metavar="REPORT_PATH",
+    )
+    parser.add_argument(
+        "--profile-file",
+        type=str,
+        help="With --profile, also captures a cProfile of this file's parsing & exports (like LEVEL.WAD), prints "
+        "its slowest functions and saves it next to the report (.prof suffix).",
+        metavar="FILENAME",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile, also measures the peak memory allocated by each stage (with tracemalloc, which slows "
+        "everything down) and the peak RSS of the process after each file.",
+    )
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Parsed WAD sections don't keep a view of their raw data, which this script never needs, so the WADs' "
+        "data is freed once they are parsed.",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enables debug prints"
     )
@@ -96,7 +272,30 @@ def parse_args(_args):
     parser.add_argument(
         "--no-confirm", action="store_true", help="Automatically answers questions."
     )
-    return parser.parse_args(_args)
+    args = parser.parse_args(_args)
+    if args.incremental and (
+        args.dedup_assets or args.dedup_audio or args.texture_array
+    ):
+        # Skipped files wouldn't be part of these outputs, which are shared by all the files
+        parser.error(
+            "--incremental isn't compatible with --dedup-assets, --dedup-audio & --texture-array."
+        )
+    if args.select:
+        if not args.catalog or not Path(args.catalog).is_file():
+            parser.error("--select needs an existing --catalog database.")
+        if args.incremental:
+            parser.error("--select isn't compatible with --incremental.")
+        try:
+            args.select = AssetsCatalog.parse_query(args.select)
+        except ValueError as e:
+            parser.error(f"--select: {e}")
+    if args.crop_textures and args.dedup_assets:
+        parser.error("--crop-textures isn't compatible with --dedup-assets.")
+    if args.hardlink_duplicates and not args.dedup_audio:
+        parser.error("--hardlink-duplicates needs --dedup-audio.")
+    if (args.profile_file or args.profile_memory) and not args.profile:
+        parser.error("--profile-file & --profile-memory need --profile.")
+    return args
 
 
 def create_export_directory(path: Path):
@@ -106,59 +305,237 @@ def create_export_directory(path: Path):
         path.mkdir(parents=True)
 
 
-def export_images_from_img(img_file: IMGFile, output_dir: Path):
+def export_images_from_img(
+    img_file: IMGFile, output_dir: Path, image_writer: ImageWriter
+):
+    """Returns the paths of the exported images."""
+    if len(img_file) == 1:
+        return image_writer.save(img_file[0], output_dir / img_file.stem)
+    outputs = []
+    for i, image in enumerate(img_file):
+        outputs += image_writer.save(image, output_dir / f"{img_file.stem}_{i}")
+    return outputs
+
+
+def add_images_to_texture_array(
+    img_file: IMGFile, texture_array_writer: TextureArrayWriter
+):
+    """Images are named like their exports (see export_images_from_img), with the IMG suffix."""
     if len(img_file) == 1:
-        img_file[0].save(output_dir / f"{img_file.stem}.PNG")
+        texture_array_writer.add(img_file.name, img_file[0])
     else:
         for i, image in enumerate(img_file):
-            image.save(output_dir / f"{img_file.stem}_{i}.PNG")
+            texture_array_writer.add(f"{img_file.stem}_{i}.{img_file.suffix}", image)
 
 
-def export_assets_from_wad(wad_file: WADFile, args, conf: Configuration):
+def export_assets_from_wad(
+    wad_file: WADFile,
+    args,
+    conf: Configuration,
+    image_writer: ImageWriter,
+    wav_index: VAGIndex = None,
+    vag_index: VAGIndex = None,
+    textures_store: ContentStore = None,
+    models_store: ContentStore = None,
+    texture_array_writer: TextureArrayWriter = None,
+):
+    """Returns the paths of the WAD's outputs (files & folders), except its deduplicated assets."""
+    outputs = []
     if conf.game in TPSXSection.supported_games:
-        if args.export_textures:
-            wad_file.tpsx.texture_file.to_colorized_texture().save(
-                Path(args.export_textures) / f"{wad_file.stem}.PNG"
+        if texture_array_writer is not None:
+            texture_array_writer.add(
+                wad_file.name, wad_file.tpsx.texture_file.to_colorized_texture()
             )
+        if args.export_textures:
+            with conf.measure("export_textures", n_items=wad_file.n_textures):
+                if textures_store is not None:
+                    wad_file.store_texture(textures_store, wad_file.stem)
+                else:
+                    outputs += image_writer.save(
+                        wad_file.tpsx.texture_file.to_colorized_texture(),
+                        Path(args.export_textures) / wad_file.stem,
+                    )
 
     if conf.game in SPSXSection.supported_games:
         if args.export_audio:
             wad_audio_export_folder_path = Path(args.export_audio) / wad_file.stem
             create_export_directory(wad_audio_export_folder_path)
-            wad_file.export_audio_to_wav(wad_audio_export_folder_path, wad_file.stem)
+            outputs.append(wad_audio_export_folder_path)
+            with conf.measure("export_audio", n_items=wad_file.n_sounds):
+                wad_file.export_audio_to_wav(
+                    wad_audio_export_folder_path, wad_file.stem, wav_index
+                )
 
         if args.unpack_audio:
             wad_audio_unpack_folder_path = Path(args.unpack_audio) / wad_file.stem
             create_export_directory(wad_audio_unpack_folder_path)
-            wad_file.export_audio_to_vag(wad_audio_unpack_folder_path, wad_file.stem)
+            outputs.append(wad_audio_unpack_folder_path)
+            with conf.measure("unpack_audio", n_items=wad_file.n_sounds):
+                wad_file.export_audio_to_vag(
+                    wad_audio_unpack_folder_path, wad_file.stem, vag_index
+                )
 
     if conf.game in DPSXSection.supported_games:
         if args.export_models:
-            wad_models_3d_folder_path = Path(args.export_models) / wad_file.stem
-            create_export_directory(wad_models_3d_folder_path)
-            wad_file.export_experimental_models(
-                wad_models_3d_folder_path, wad_file.stem
-            )
+            with conf.measure("export_models", n_items=wad_file.n_models):
+                if models_store is not None:
+                    wad_file.store_experimental_models(models_store, wad_file.stem)
+                else:
+                    wad_models_3d_folder_path = Path(args.export_models) / wad_file.stem
+                    create_export_directory(wad_models_3d_folder_path)
+                    outputs.append(wad_models_3d_folder_path)
+                    wad_file.export_experimental_models(
+                        wad_models_3d_folder_path, wad_file.stem, args.crop_textures
+                    )
+        if args.export_animated_models:
+            wad_clips_folder_path = Path(args.export_animated_models) / wad_file.stem
+            create_export_directory(wad_clips_folder_path)
+            outputs.append(wad_clips_folder_path)
+            with conf.measure("export_animated_models", n_items=wad_file.n_models):
+                wad_file.export_animated_models(wad_clips_folder_path, wad_file.stem)
         if args.export_levels:
             wad_level_folder_path = (
                 Path(args.export_levels) / "No actors - No lighting" / wad_file.stem
             )
             create_export_directory(wad_level_folder_path)
-            wad_file.export_level(wad_level_folder_path, wad_file.stem)
+            outputs.append(wad_level_folder_path)
+            if args.level_region:
+                chunk_ids = wad_file.chunks_index.chunks_in_box(*args.level_region)
+            elif args.level_radius:
+                chunk_ids = wad_file.chunks_index.chunks_in_radius(*args.level_radius)
+            elif args.level_zone is not None:
+                chunk_ids = wad_file.chunks_index.chunks_in_zone(args.level_zone)
+            else:
+                chunk_ids = None
+            n_sub_chunks = (
+                wad_file.chunks_matrix.n_sub_chunks
+                if chunk_ids is None
+                else len(wad_file.chunks_index.sub_chunks(chunk_ids))
+            )
+            with conf.measure("export_level", n_items=n_sub_chunks):
+                wad_file.export_level(
+                    wad_level_folder_path,
+                    wad_file.stem,
+                    chunk_ids,
+                    args.weld_levels,
+                    args.crop_textures,
+                )
+            if args.level_lighting or args.level_actors or args.level_lods:
+                wad_gltf_level_folder_path = (
+                    Path(args.export_levels)
+                    / (
+                        f"{'Actors' if args.level_actors else 'No actors'} - "
+                        f"{'Lighting' if args.level_lighting else 'No lighting'}"
+                    )
+                    / wad_file.stem
+                )
+                create_export_directory(wad_gltf_level_folder_path)
+                outputs.append(wad_gltf_level_folder_path)
+                with conf.measure("export_level_gltf", n_items=n_sub_chunks):
+                    wad_file.export_level_gltf(
+                        wad_gltf_level_folder_path,
+                        wad_file.stem,
+                        chunk_ids,
+                        args.level_lighting,
+                        args.level_actors,
+                        args.level_lods,
+                    )
+    return outputs
+
+
+# Number of files whose own profiling table is printed, the slowest ones
+profiled_files_shown = 5
+
+# Options that don't change the exported files, ignored by incremental exports
+incremental_ignored_options = (
+    "dirdat",
+    "files",
+    "incremental",
+    "catalog",
+    "select",
+    "scan_only",
+    "profile",
+    "profile_file",
+    "profile_memory",
+    "low_memory",
+    "image_threads",
+    "verbose",
+    "ignore_warnings",
+    "no_confirm",
+)
 
 
 def export_assets(args):
+    def is_exported(dat_file: DATFile):
+        return (
+            isinstance(dat_file, IMGFile)
+            and (args.export_images or texture_array_writer is not None)
+        ) or (
+            isinstance(dat_file, WADFile) and wads_parsing_needed and not args.scan_only
+        )
+
+    def parse_file(dat_file: DATFile):
+        """Parses (or scans) the file and exports its assets, returns the paths of its outputs."""
+        outputs = []
+        if isinstance(dat_file, IMGFile) and (
+            args.export_images or texture_array_writer is not None
+        ):
+            with conf.measure("IMGFile.parse", dat_file.size) as counters:
+                dat_file.parse(conf)
+                counters["items"] = len(dat_file)
+            if args.export_images:
+                with conf.measure("export_images", n_items=len(dat_file)):
+                    outputs += export_images_from_img(
+                        dat_file, Path(args.export_images), image_writer
+                    )
+            if texture_array_writer is not None:
+                add_images_to_texture_array(dat_file, texture_array_writer)
+        elif isinstance(dat_file, WADFile) and args.scan_only:
+            dat_file.scan(conf)
+        elif isinstance(dat_file, WADFile) and wads_parsing_needed:
+            dat_file.parse(conf)
+            if catalog is not None:
+                with conf.measure("AssetsCatalog.add_wad"):
+                    catalog.add_wad(dat_file)
+            outputs += export_assets_from_wad(
+                dat_file,
+                args,
+                conf,
+                image_writer,
+                wav_index,
+                vag_index,
+                textures_store,
+                models_store,
+                wads_texture_array_writer,
+            )
+        return outputs
+
     def parse_files():
         n_files = len(dir_dat)
         n_digits = len(str(n_files))
         for i, dat_file in enumerate(dir_dat):  # type: int, DATFile
             print(f"[{i + 1:>{n_digits}}/{n_files}] {dat_file.name:>12}: ", end="")
-            if isinstance(dat_file, IMGFile) and args.export_images:
-                dat_file.parse(conf)
-                export_images_from_img(dat_file, Path(args.export_images))
-            elif isinstance(dat_file, WADFile) and wads_parsing_needed:
-                dat_file.parse(conf)
-                export_assets_from_wad(dat_file, args, conf)
+            if selected_wads is not None and dat_file.name not in selected_wads:
+                print("Not selected, skipped.", end="\n\n")
+                continue
+            fingerprint = None
+            if manifest is not None and is_exported(dat_file):
+                fingerprint = manifest.fingerprint(dat_file)
+                # Unchanged WADs are still parsed if the catalog doesn't have them yet (like a new catalog)
+                if manifest.is_up_to_date(dat_file, fingerprint) and (
+                    catalog is None
+                    or not isinstance(dat_file, WADFile)
+                    or dat_file.name in catalog
+                ):
+                    print("Unchanged, skipped.", end="\n\n")
+                    continue
+            if profiler is not None:
+                with profiler.file(dat_file.name):
+                    outputs = parse_file(dat_file)
+            else:
+                outputs = parse_file(dat_file)
+            if fingerprint is not None:
+                manifest.update(dat_file, fingerprint, outputs)
             print(dat_file, end="\n\n")
 
     game = next((game for game in SUPPORTED_GAMES if game.title == args.game), None)
@@ -168,7 +545,12 @@ def export_assets(args):
             "If you just want to extract them, use the extract_files_from_dat.py script."
         )
 
-    conf = Configuration(game, args.ignore_warnings)
+    profiler = (
+        Profiler(args.profile_file, args.profile_memory) if args.profile else None
+    )
+    conf = Configuration(
+        game, args.ignore_warnings, profiler=profiler, low_memory=args.low_memory
+    )
 
     if args.dirdat:
         dir_dat = DIR_DAT.from_dir_dat(Path(args.dirdat), conf)
@@ -179,6 +561,7 @@ def export_assets(args):
         args.export_images,
         args.export_textures,
         args.export_models,
+        args.export_animated_models,
         args.export_audio,
         args.unpack_audio,
         args.export_levels,
@@ -187,9 +570,12 @@ def export_assets(args):
         (
             args.export_textures,
             args.export_models,
+            args.export_animated_models,
             args.export_audio,
             args.unpack_audio,
             args.export_levels,
+            args.texture_array and args.texture_array_wads,
+            args.catalog and not args.select,
         )
     )
     [
@@ -197,12 +583,97 @@ def export_assets(args):
         for export_path in export_paths
         if export_path
     ]
-    parse_files()
+
+    wav_index = None
+    vag_index = None
+    if args.dedup_audio:
+        if args.export_audio:
+            wav_index = VAGIndex.load(Path(args.export_audio), args.hardlink_duplicates)
+        if args.unpack_audio:
+            vag_index = VAGIndex.load(Path(args.unpack_audio), args.hardlink_duplicates)
+
+    textures_store = None
+    models_store = None
+    if args.dedup_assets:
+        if args.export_textures:
+            textures_store = ContentStore(Path(args.export_textures))
+        if args.export_models:
+            models_store = ContentStore(Path(args.export_models))
+
+    image_writer = ImageWriter(
+        args.image_format, args.png_compression, args.image_threads
+    )
+    texture_array_writer = (
+        TextureArrayWriter(Path(args.texture_array)) if args.texture_array else None
+    )
+    wads_texture_array_writer = (
+        texture_array_writer if args.texture_array_wads else None
+    )
+    catalog = None
+    selected_wads = None
+    if args.select:
+        table, conditions = args.select
+        with AssetsCatalog(Path(args.catalog)) as selection_catalog:
+            selected_wads = selection_catalog.find_wads_names(table, **conditions)
+        print(f"{len(selected_wads)} WADs selected by the catalog query.", end="\n\n")
+    elif args.catalog:
+        catalog = AssetsCatalog(Path(args.catalog))
+    manifest = (
+        ExportManifest(
+            Path(args.incremental),
+            {
+                option: value
+                for option, value in vars(args).items()
+                if option not in incremental_ignored_options
+            },
+            (
+                str(Path(args.dirdat).resolve())
+                if args.dirdat
+                else sorted(str(Path(file).resolve()) for file in args.files)
+            ),
+        )
+        if args.incremental
+        else None
+    )
+    with image_writer:
+        parse_files()
+    if manifest is not None:
+        for name in manifest.remove_stale(dat_file.name for dat_file in dir_dat):
+            print(f"{name} disappeared, its outputs were deleted.")
+            if catalog is not None:
+                catalog.remove_wad(name)
+        manifest.save()
+    if texture_array_writer is not None:
+        texture_array_writer.close()
+    if catalog is not None:
+        catalog.close()
+
+    for store in (textures_store, models_store):
+        if store is not None:
+            store.save_manifests()
+    for index, export_path in (
+        (wav_index, args.export_audio),
+        (vag_index, args.unpack_audio),
+    ):
+        if index is not None:
+            index.save(Path(export_path))
+            if not args.hardlink_duplicates:
+                index.save_manifest(Path(export_path))
+
+    if profiler is not None:
+        profiler.save(Path(args.profile))
+        for name in profiler.slowest_files(profiled_files_shown):
+            print(f"{name} ({profiler.files_seconds[name]:.3f} s)")
+            print(profiler.table(profiler.files.get(name, {})), end="\n\n")
+        print("All files")
+        print(profiler.table(profiler.total), end="\n\n")
+        if profiler.cprofile_stats is not None:
+            profiler.cprofile_stats.sort_stats("cumulative").print_stats(20)
 
 
 if __name__ == "__main__":
     _args = parse_args(sys.argv[1:])
-    if _args.export_models and not _args.no_confirm:
+    if (_args.export_models or _args.export_animated_models) and not _args.no_confirm:
         input(
             "Models export is VERY EXPERIMENTAL, some models will be completely broken or even missing. "
             "Press <Enter> to continue.\n"
@@ -0,0 +1,239 @@
+import sqlite3
+from pathlib import Path
+
+from ps1_argonaut.files.WADFile import WADFile
+from ps1_argonaut.wad_sections.DPSX.DPSXSection import DPSXSection
+from ps1_argonaut.wad_sections.SPSX.SPSXSection import SPSXSection
+
+
+class AssetsCatalog:
+    """SQLite index of the WADs of a DIR/DAT, built once so that later queries don't need to parse every WAD.
+    Offsets are relative to the beginning of the WAD, whose own offset in the DAT file is wads.dat_offset: a WAD,
+    section, model or animation can be read directly at dat_offset + offset."""
+
+    # Columns of each table, all integers except the WAD names, sections codenames & sounds containers
+    tables = {
+        "wads": (
+            "wad_id",
+            "name",
+            "dat_offset",
+            "size",
+            "n_textures",
+            "n_sounds",
+            "n_models",
+            "n_animations",
+            "n_scripts",
+            "n_rows",
+            "n_columns",
+            "n_filled_chunks",
+            "n_sub_chunks",
+        ),
+        "sections": ("wad_id", "codename", "offset"),
+        "models": (
+            "wad_id",
+            "model_id",
+            "offset",
+            "n_vertices",
+            "n_faces",
+            "n_vertices_groups",
+        ),
+        "animations": (
+            "wad_id",
+            "animation_id",
+            "offset",
+            "n_total_frames",
+            "n_stored_frames",
+            "n_vertices_groups",
+        ),
+        "sounds": ("wad_id", "container", "sound_id", "size", "sampling_rate"),
+    }
+    text_columns = ("name", "codename", "container")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.row_factory = sqlite3.Row
+        for table, columns in self.tables.items():
+            columns_definitions = ", ".join(
+                f"{column} {'TEXT' if column in self.text_columns else 'INTEGER'}"
+                + (" PRIMARY KEY" if table == "wads" and column == "wad_id" else "")
+                + (" UNIQUE" if column == "name" else "")
+                for column in columns
+            )
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ({columns_definitions})"
+            )
+            if table != "wads":
+                self._connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_wad_id ON {table} (wad_id)"
+                )
+
+    def _insert(self, table: str, rows: list[tuple]):
+        self._connection.executemany(
+            f"INSERT INTO {table} VALUES ({', '.join('?' * len(self.tables[table]))})",
+            rows,
+        )
+
+    def add_wad(self, wad_file: WADFile):
+        """Indexes a parsed WAD, replacing its previous entries if it was already indexed. Each WAD is committed on its
+        own, so that an interrupted run keeps the WADs already indexed."""
+        with self._connection:
+            self._add_wad(wad_file)
+
+    def _add_wad(self, wad_file: WADFile):
+        self._remove_wad(wad_file.name)
+        chunks_matrix = wad_file.chunks_matrix
+        wad_id = self._connection.execute(
+            "INSERT INTO wads VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                wad_file.name,
+                wad_file.dat_offset,
+                wad_file.size,
+                wad_file.n_textures,
+                wad_file.n_sounds,
+                wad_file.n_models,
+                wad_file.n_animations,
+                wad_file.n_scripts,
+                None if chunks_matrix is None else chunks_matrix.n_rows,
+                None if chunks_matrix is None else chunks_matrix.n_columns,
+                wad_file.n_filled_chunks,
+                None if chunks_matrix is None else chunks_matrix.n_sub_chunks,
+            ),
+        ).lastrowid
+
+        sections_offsets = wad_file.sections_offsets
+        self._insert(
+            "sections",
+            [
+                (wad_id, codename.decode("latin1"), offset)
+                for codename, offset in sections_offsets.items()
+            ],
+        )
+
+        dpsx = wad_file.dpsx
+        if isinstance(dpsx, DPSXSection):
+            dpsx_offset = sections_offsets.get(DPSXSection.codename_bytes)
+            models_offsets = dpsx.models_3d_offsets or [None] * len(dpsx.models_3d)
+            animations_offsets = dpsx.animations_offsets or [None] * len(
+                dpsx.animations
+            )
+            self._insert(
+                "models",
+                [
+                    (
+                        wad_id,
+                        i,
+                        None if offset is None else dpsx_offset + offset,
+                        model.n_vertices,
+                        model.n_faces,
+                        model.n_vertices_groups,
+                    )
+                    for i, (model, offset) in enumerate(
+                        zip(dpsx.models_3d, models_offsets)
+                    )
+                ],
+            )
+            self._insert(
+                "animations",
+                [
+                    (
+                        wad_id,
+                        i,
+                        None if offset is None else dpsx_offset + offset,
+                        animation.header.n_total_frames,
+                        animation.header.n_stored_frames,
+                        animation.n_vertices_groups,
+                    )
+                    for i, (animation, offset) in enumerate(
+                        zip(dpsx.animations, animations_offsets)
+                    )
+                ],
+            )
+
+        spsx = wad_file.spsx
+        if isinstance(spsx, SPSXSection):
+            containers = {
+                "common_sfx": spsx.common_sfx,
+                "ambient_tracks": spsx.ambient_tracks,
+                "level_sfx": spsx.level_sfx_groups.sounds,
+                "dialogues_bgms": spsx.dialogues_bgms,
+            }
+            self._insert(
+                "sounds",
+                [
+                    (wad_id, container, i, sound.size, sound.sampling_rate)
+                    for container, sounds in containers.items()
+                    for i, sound in enumerate(sounds)
+                ],
+            )
+
+    def __contains__(self, wad_name: str):
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM wads WHERE name = ?", (wad_name,)
+            ).fetchone()
+            is not None
+        )
+
+    def remove_wad(self, name: str):
+        with self._connection:
+            self._remove_wad(name)
+
+    def _remove_wad(self, name: str):
+        row = self._connection.execute(
+            "SELECT wad_id FROM wads WHERE name = ?", (name,)
+        ).fetchone()
+        if row is not None:
+            for table in self.tables:
+                self._connection.execute(
+                    f"DELETE FROM {table} WHERE wad_id = ?", (row["wad_id"],)
+                )
+
+    def find(self, table: str, **conditions) -> list[sqlite3.Row]:
+        """Rows of the given table whose columns equal the given values, along with their WAD's name & DAT offset.
+        For example, catalog.find("models", n_vertices=42)."""
+        if table not in self.tables:
+            raise ValueError(f"Unknown catalog table: {table}")
+        for column in conditions:
+            if column not in self.tables[table]:
+                raise ValueError(f"Unknown column of the {table} table: {column}")
+        where = " AND ".join(f"{table}.{column} = ?" for column in conditions)
+        query = (
+            f"SELECT {table}.*"
+            if table == "wads"
+            else f"SELECT {table}.*, wads.name, wads.dat_offset AS wad_dat_offset"
+        ) + f" FROM {table}"
+        if table != "wads":
+            query += f" JOIN wads ON wads.wad_id = {table}.wad_id"
+        if where:
+            query += f" WHERE {where}"
+        return self._connection.execute(query, tuple(conditions.values())).fetchall()
+
+    @classmethod
+    def parse_query(cls, query: str) -> tuple[str, dict[str, int | str]]:
+        """Parses a "table:column=value,column=value" query into the table & the conditions of find. For example,
+        "models:n_vertices_groups=12" gives ("models", {"n_vertices_groups": 12})."""
+        table, _, conditions = query.partition(":")
+        if table not in cls.tables:
+            raise ValueError(f"Unknown catalog table: {table}")
+        res = {}
+        for condition in conditions.split(",") if conditions else ():
+            column, sep, value = condition.partition("=")
+            if not sep or column not in cls.tables[table]:
+                raise ValueError(f"Invalid condition on the {table} table: {condition}")
+            res[column] = value if column in cls.text_columns else int(value)
+        return table, res
+
+    def find_wads_names(self, table: str, **conditions) -> set[str]:
+        """Names of the WADs having rows of the given table that match the conditions, see find."""
+        return {row["name"] for row in self.find(table, **conditions)}
+
+    def close(self):
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
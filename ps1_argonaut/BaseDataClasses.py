@@ -2,6 +2,7 @@ from io import BufferedIOBase
 
 from ps1_argonaut.configuration import Configuration, G
 from ps1_argonaut.errors_warnings import (
+    MissingFallbackData,
     SectionNameError,
     SectionSizeMismatch,
     UnsupportedParsing,
@@ -51,6 +52,12 @@ class BaseWADSection(BaseDataClass):
         cls.check_codename(data_in)
         return int.from_bytes(data_in.read(4), "little"), data_in.tell()
 
+    @classmethod
+    def scan(cls, data_in: BufferedIOBase, conf: Configuration) -> dict:
+        """Header-only alternative to parse: only reads the section's assets counts (see WADFile.scan). Sections
+        without assets to count have none."""
+        return {}
+
     def serialize(self, data_out: BufferedIOBase, conf: Configuration, *args, **kwargs):
         if conf.game not in self.supported_games:
             raise UnsupportedSerialization(self.section_content_description)
@@ -79,5 +86,12 @@ class BaseWADSection(BaseDataClass):
     def fallback_parse(cls, data_in: BufferedIOBase):
         return cls(cls.fallback_parse_data(data_in))
 
+    def set_fallback_data(self, data: bytes | memoryview):
+        """Raw data (codename & size included) written back by fallback_serialize, WADFile.parse gives the parsed
+        sections a memoryview of the WAD's data, so that it isn't copied until the section is serialized."""
+        self._data = data
+
     def fallback_serialize(self, data_out: BufferedIOBase):
+        if not hasattr(self, "_data"):
+            raise MissingFallbackData(type(self).__name__)
         data_out.write(self._data)
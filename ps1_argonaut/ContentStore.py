@@ -0,0 +1,63 @@
+import hashlib
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+
+class ContentStore:
+    """Content-addressed export folder: each unique asset is written once in the objects folder, named after its
+    content hash, and each WAD gets a JSON manifest that maps its assets' usual filenames to these objects."""
+
+    objects_folder_name = "objects"
+
+    def __init__(self, folder_path: Path):
+        self.folder_path = folder_path
+        self.objects_path = folder_path / self.objects_folder_name
+        if not self.objects_path.exists():
+            self.objects_path.mkdir(parents=True)
+        elif self.objects_path.is_file():
+            raise FileExistsError
+        self.manifests: dict[str, dict[str, str]] = {}
+        self._stored_objects: set[str] = set()
+
+    @staticmethod
+    def digest(*parts: bytes | str | np.ndarray) -> str:
+        res = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                part = f"{part.dtype.str}{part.shape}".encode("ASCII") + part.tobytes()
+            elif isinstance(part, str):
+                part = part.encode("ASCII")
+            # Parts are length-prefixed, so that different splits of the same bytes don't collide
+            res.update(len(part).to_bytes(8, "little"))
+            res.update(part)
+        return res.hexdigest()
+
+    def store(
+        self,
+        manifest_name: str,
+        asset_name: str,
+        digest: str,
+        suffix: str,
+        write: Callable[[Path], None],
+    ):
+        """Calls write() with the object path only if this content isn't stored yet (even by a previous export),
+        then maps the asset name to this object in the given manifest."""
+        object_name = f"{digest}.{suffix}"
+        if object_name not in self._stored_objects:
+            object_path = self.objects_path / object_name
+            if not object_path.exists():
+                write(object_path)
+            self._stored_objects.add(object_name)
+        self.manifests.setdefault(manifest_name, {})[
+            asset_name
+        ] = f"{self.objects_folder_name}/{object_name}"
+        return object_name
+
+    def save_manifests(self):
+        for manifest_name, manifest in self.manifests.items():
+            (self.folder_path / f"{manifest_name}.json").write_text(
+                json.dumps(manifest, indent=2), encoding="ASCII"
+            )
@@ -9,13 +9,14 @@ from ps1_argonaut.utils import pad_in_2048_bytes, pad_out_2048_bytes
 from ps1_argonaut.wad_sections.TPSX.TPSXSection import TPSXSection
 
 
-def parse_dat_file(name: str, data: bytes):
+def parse_dat_file(name: str, data: bytes, dat_offset: int = None):
     stem, suffix = name.rsplit(".", 1)
     dat_class: type[DATFile] = guess_dat_file_type(stem, suffix).file_class
     if dat_class is None:
         dat_file = DATFile(stem, suffix, data)
     else:
         dat_file = dat_class(stem, data=data)
+    dat_file.dat_offset = dat_offset
     return dat_file
 
 
@@ -65,12 +66,15 @@ class DIR_DAT(list[DATFile]):
                         dat_data.seek(start)
                         files.append(
                             parse_dat_file(
-                                name.strip(b"\x00").decode("ASCII"), dat_data.read(size)
+                                name.strip(b"\x00").decode("ASCII"),
+                                dat_data.read(size),
+                                start,
                             )
                         )
             else:  # Croc 2 Demo DUMMY
                 while True:
-                    name = hex(dat_data.tell())[2:].rjust(7, "0")
+                    start = dat_data.tell()
+                    name = hex(start)[2:].rjust(7, "0")
                     size_bytes = dat_data.read(4)
                     size = int.from_bytes(size_bytes, "little")
                     if size == 0:
@@ -84,7 +88,9 @@ class DIR_DAT(list[DATFile]):
                     dat_data.seek(-4, SEEK_CUR)
                     data = dat_data.read(size - 4)
                     pad_in_2048_bytes(dat_data)
-                    files.append(parse_dat_file(name + suffix, size_bytes + data))
+                    files.append(
+                        parse_dat_file(name + suffix, size_bytes + data, start)
+                    )
         return cls(files)
 
     @classmethod
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import shutil
+from collections.abc import Iterable
+from pathlib import Path
+
+from ps1_argonaut.files.DATFile import DATFile
+
+
+class ExportManifest:
+    """JSON record of a previous export, used to only re-export what changed: for each exported DAT file, its
+    fingerprint (size & content hash) and the outputs it produced, along with the export options.
+    Files whose fingerprint & options didn't change are skipped, the outputs of the files that changed are deleted.
+    The outputs of the files that disappeared are only deleted if the input source is the same as in the previous
+    export, so that exporting a subset of the files doesn't delete the others' outputs."""
+
+    version = 2
+
+    def __init__(self, path: Path, options: dict, source: str | list[str]):
+        """options are the export options (any JSON-serializable dict), all the files are exported again if they
+        changed. source identifies the input files (like the DIR/DAT path)."""
+        self.path = path
+        self.options = options
+        self.source = source
+        self.files: dict[str, dict] = {}
+        self.same_options = False
+        self.same_source = False
+        if path.is_file():
+            manifest = json.loads(path.read_text(encoding="UTF-8"))
+            if manifest.get("version") == self.version:
+                self.files = manifest["files"]
+                self.same_options = manifest["options"] == options
+                self.same_source = manifest["source"] == source
+
+    @staticmethod
+    def fingerprint(dat_file: DATFile):
+        """Size & content hash of a DAT file, must be computed before parsing it (parsing frees its raw data)."""
+        return f"{dat_file.size}:{hashlib.blake2b(dat_file._data, digest_size=16).hexdigest()}"
+
+    def is_up_to_date(self, dat_file: DATFile, fingerprint: str):
+        """Whether the file was already exported with the same content & options, and its outputs still exist."""
+        entry = self.files.get(dat_file.name)
+        return (
+            self.same_options
+            and entry is not None
+            and entry["fingerprint"] == fingerprint
+            and all(Path(output).exists() for output in entry["outputs"])
+        )
+
+    @staticmethod
+    def _delete(output: Path):
+        if output.is_dir():
+            shutil.rmtree(output)
+        elif output.exists():
+            output.unlink()
+
+    def update(self, dat_file: DATFile, fingerprint: str, outputs: Iterable[Path]):
+        """Records a new export of the file, deleting the outputs of its previous export that it no longer has."""
+        outputs = [str(output) for output in outputs]
+        previous_entry = self.files.get(dat_file.name)
+        if previous_entry is not None:
+            for output in set(previous_entry["outputs"]).difference(outputs):
+                self._delete(Path(output))
+        self.files[dat_file.name] = {"fingerprint": fingerprint, "outputs": outputs}
+
+    def remove_stale(self, names: Iterable[str]):
+        """Deletes the outputs of the files that aren't among the given ones anymore, returns their names.
+        Nothing is deleted if the input source changed, as the missing files may just not be part of it."""
+        if not self.same_source:
+            return []
+        names = set(names)
+        stale_names = [name for name in self.files if name not in names]
+        for name in stale_names:
+            for output in self.files.pop(name)["outputs"]:
+                self._delete(Path(output))
+        return stale_names
+
+    def save(self):
+        self.path.write_text(
+            json.dumps(
+                {
+                    "version": self.version,
+                    "options": self.options,
+                    "source": self.source,
+                    "files": self.files,
+                },
+                indent=2,
+            ),
+            encoding="UTF-8",
+        )
@@ -0,0 +1,233 @@
+import json
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+
+from ps1_argonaut.configuration import gltf_generator
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+NEAREST = 9728
+CLAMP_TO_EDGE = 33071
+
+component_types = {
+    np.dtype(np.int8): 5120,
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.int16): 5122,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+accessor_types = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4"}
+
+
+class GLTFBuilder:
+    """Minimal binary glTF 2.0 (GLB) writer: all arrays are stored in a single binary buffer."""
+
+    def __init__(self):
+        self.gltf = {
+            "asset": {"version": "2.0", "generator": gltf_generator},
+            "scene": 0,
+            "scenes": [{"nodes": []}],
+            "nodes": [],
+            "meshes": [],
+            "materials": [],
+            "textures": [],
+            "images": [],
+            "samplers": [],
+            "animations": [],
+            "accessors": [],
+            "bufferViews": [],
+            "buffers": [],
+            "extensionsUsed": [],
+        }
+        self.binary = BytesIO()
+
+    def _add(self, key: str, item: dict):
+        self.gltf[key].append(item)
+        return len(self.gltf[key]) - 1
+
+    def add_accessor(
+        self,
+        array: np.ndarray,
+        target: int = None,
+        normalized=False,
+        with_bounds=False,
+    ):
+        """Appends an array (one element per row) to the binary buffer and returns its accessor index."""
+        array = np.ascontiguousarray(array)
+        self.binary.write(b"\x00" * (-self.binary.tell() % 4))
+        buffer_view = {
+            "buffer": 0,
+            "byteOffset": self.binary.tell(),
+            "byteLength": array.nbytes,
+        }
+        if target is not None:
+            buffer_view["target"] = target
+        self.binary.write(array.tobytes())
+
+        accessor = {
+            "bufferView": self._add("bufferViews", buffer_view),
+            "componentType": component_types[array.dtype],
+            "count": len(array),
+            "type": accessor_types[1 if array.ndim == 1 else array.shape[1]],
+        }
+        if normalized:
+            accessor["normalized"] = True
+        # Empty arrays have no bounds
+        if with_bounds and len(array):
+            accessor["min"] = np.atleast_1d(array.min(axis=0)).tolist()
+            accessor["max"] = np.atleast_1d(array.max(axis=0)).tolist()
+        return self._add("accessors", accessor)
+
+    def add_textured_material(self, name: str, image_uri: str):
+        """PS1 textures are pixelated, so they are sampled without filtering."""
+        sampler = self._add(
+            "samplers",
+            {
+                "magFilter": NEAREST,
+                "minFilter": NEAREST,
+                "wrapS": CLAMP_TO_EDGE,
+                "wrapT": CLAMP_TO_EDGE,
+            },
+        )
+        image = self._add("images", {"uri": image_uri})
+        texture = self._add("textures", {"sampler": sampler, "source": image})
+        return self._add(
+            "materials",
+            {
+                "name": name,
+                "pbrMetallicRoughness": {
+                    "baseColorTexture": {"index": texture},
+                    "metallicFactor": 0.0,
+                },
+                "alphaMode": "MASK",
+            },
+        )
+
+    def add_mesh(
+        self,
+        name: str,
+        positions: np.ndarray,
+        indices: np.ndarray = None,
+        uvs: np.ndarray = None,
+        colors: np.ndarray = None,
+        material: int = None,
+        morph_targets: list[np.ndarray] = None,
+    ):
+        """Adds a single-primitive triangles mesh. Colors are RGB(A) uint8 (normalized) vertex colors,
+        morph targets are position displacements. Returns None without adding anything if there are no positions, as
+        glTF forbids empty accessors."""
+        if not len(positions):
+            return None
+        attributes = {
+            "POSITION": self.add_accessor(
+                positions.astype(np.float32), ARRAY_BUFFER, with_bounds=True
+            )
+        }
+        if uvs is not None:
+            attributes["TEXCOORD_0"] = self.add_accessor(
+                uvs.astype(np.float32), ARRAY_BUFFER
+            )
+        if colors is not None:
+            attributes["COLOR_0"] = self.add_accessor(
+                colors.astype(np.uint8), ARRAY_BUFFER, normalized=True
+            )
+        primitive = {"attributes": attributes}
+        if indices is not None:
+            primitive["indices"] = self.add_accessor(
+                indices.astype(np.uint32).flatten(), ELEMENT_ARRAY_BUFFER
+            )
+        if material is not None:
+            primitive["material"] = material
+        mesh = {"name": name, "primitives": [primitive]}
+        if morph_targets:
+            primitive["targets"] = [
+                {
+                    "POSITION": self.add_accessor(
+                        target.astype(np.float32), ARRAY_BUFFER, with_bounds=True
+                    )
+                }
+                for target in morph_targets
+            ]
+            mesh["weights"] = [0.0] * len(morph_targets)
+        return self._add("meshes", mesh)
+
+    def add_node(
+        self,
+        name: str = None,
+        mesh: int = None,
+        translation: tuple[float, float, float] = None,
+        children: list[int] = None,
+        extras: dict = None,
+        extensions: dict = None,
+        root=True,
+    ):
+        """Root nodes are added to the default scene."""
+        node = {}
+        for key, value in (
+            ("name", name),
+            ("mesh", mesh),
+            ("translation", translation),
+            ("children", children),
+            ("extras", extras),
+            ("extensions", extensions),
+        ):
+            if value is not None:
+                node[key] = list(value) if key == "translation" else value
+        node_id = self._add("nodes", node)
+        if root:
+            self.gltf["scenes"][0]["nodes"].append(node_id)
+        return node_id
+
+    def add_morph_animation(
+        self, name: str, node: int, n_targets: int, frame_duration: float
+    ):
+        """Plays each morph target of the node's mesh in turn, one per frame."""
+        times = np.arange(n_targets, dtype=np.float32) * frame_duration
+        sampler = {
+            "input": self.add_accessor(times, with_bounds=True),
+            "output": self.add_accessor(
+                np.identity(n_targets, dtype=np.float32).flatten()
+            ),
+            "interpolation": "STEP",
+        }
+        return self._add(
+            "animations",
+            {
+                "name": name,
+                "samplers": [sampler],
+                "channels": [
+                    {"sampler": 0, "target": {"node": node, "path": "weights"}}
+                ],
+            },
+        )
+
+    def use_extension(self, extension_name: str):
+        if extension_name not in self.gltf["extensionsUsed"]:
+            self.gltf["extensionsUsed"].append(extension_name)
+
+    def save(self, path: Path):
+        self.binary.write(b"\x00" * (-self.binary.tell() % 4))
+        binary = self.binary.getvalue()
+        # glTF forbids empty arrays
+        gltf = {key: value for key, value in self.gltf.items() if value != []}
+        if binary:
+            gltf["buffers"] = [{"byteLength": len(binary)}]
+        json_chunk = json.dumps(gltf, separators=(",", ":")).encode("ASCII")
+        json_chunk += b" " * (-len(json_chunk) % 4)
+
+        with path.open("wb") as glb_file:
+            glb_file.write(b"glTF")
+            glb_file.write((2).to_bytes(4, "little"))
+            glb_file.write(
+                (
+                    12 + 8 + len(json_chunk) + (8 + len(binary) if binary else 0)
+                ).to_bytes(4, "little")
+            )
+            glb_file.write(len(json_chunk).to_bytes(4, "little") + b"JSON")
+            glb_file.write(json_chunk)
+            if binary:
+                glb_file.write(len(binary).to_bytes(4, "little") + b"BIN\x00")
+                glb_file.write(binary)
@@ -0,0 +1,82 @@
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import BoundedSemaphore
+
+from PIL import Image
+
+
+class ImageWriter:
+    """Saves images as PNG (with a given zlib compression level), TGA or raw RGBA bytes with a JSON sidecar
+    (dimensions & mode). With threads, images are encoded & written in a thread pool (Pillow releases the GIL while
+    encoding): call close() (or use a with statement) to wait for them and raise their errors. At most 2 images per
+    thread are queued, save() waits for a slot beforehand, so that pending images don't pile up in memory."""
+
+    formats = ("PNG", "TGA", "RAW")
+    sidecar_suffix = ".JSON"
+
+    def __init__(self, fmt="PNG", compress_level=6, n_threads=0):
+        if fmt not in self.formats:
+            raise ValueError(f"Unsupported image format: {fmt}")
+        self.fmt = fmt
+        self.compress_level = compress_level
+        self._executor = ThreadPoolExecutor(n_threads) if n_threads > 0 else None
+        self._slots = BoundedSemaphore(2 * n_threads) if n_threads > 0 else None
+        # Errors of the finished writes, completed writes aren't kept
+        self._errors: list[BaseException] = []
+
+    @property
+    def suffix(self):
+        return f".{self.fmt}"
+
+    def _write(self, image: Image.Image, path: Path):
+        if self.fmt == "PNG":
+            image.save(path, "PNG", compress_level=self.compress_level)
+        elif self.fmt == "TGA":
+            image.save(path, "TGA")
+        else:
+            image = image.convert("RGBA")
+            path.write_bytes(image.tobytes())
+            path.with_suffix(self.sidecar_suffix).write_text(
+                json.dumps(
+                    {"width": image.width, "height": image.height, "mode": image.mode}
+                ),
+                encoding="ASCII",
+            )
+
+    def save(self, image: Image.Image, path: Path):
+        """Saves the image at the given path, with this writer's format suffix. Returns the paths of the written
+        files."""
+        path = path.with_suffix(self.suffix)
+        if self._executor is None:
+            self._write(image, path)
+        else:
+            self._raise_errors()
+            self._slots.acquire()
+            self._executor.submit(self._write, image, path).add_done_callback(
+                self._write_done
+            )
+        if self.fmt == "RAW":
+            return [path, path.with_suffix(self.sidecar_suffix)]
+        return [path]
+
+    def _write_done(self, future: Future):
+        if future.exception() is not None:
+            self._errors.append(future.exception())
+        self._slots.release()
+
+    def _raise_errors(self):
+        if self._errors:
+            errors, self._errors = self._errors, []
+            raise errors[0]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._raise_errors()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
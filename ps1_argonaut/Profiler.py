@@ -0,0 +1,176 @@
+import cProfile
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def max_rss():
+    """Peak resident set size of the process in bytes, None if the platform doesn't provide it."""
+    if resource is None:
+        return None
+    res = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return res if sys.platform == "darwin" else 1024 * res
+
+
+class Profiler:
+    """Cumulated wall-clock time, calls, bytes & items counts of named stages (WAD & section parsing/serialization,
+    exporters...), recorded per DAT file and summed over all files. Stages may be nested, a stage's time includes
+    the time of the stages it encloses. Optionally captures a cProfile of a chosen file.
+    With trace_memory, the peak Python memory allocated during each stage is measured with tracemalloc (which slows
+    everything down) and the peak RSS of the process is recorded after each file."""
+
+    counters = ("calls", "seconds", "bytes", "items")
+    # Counters whose maximum is kept instead of their sum
+    max_counters = ("peak_memory",)
+
+    def __init__(self, cprofile_file: str = None, trace_memory=False):
+        """cprofile_file is the name of the DAT file (like LEVEL.WAD) whose processing is captured with cProfile."""
+        self.cprofile_file = cprofile_file
+        self.cprofile_stats: pstats.Stats | None = None
+        self.trace_memory = trace_memory
+        # File name -> stage -> counters
+        self.files: dict[str, dict[str, dict[str, int | float]]] = {}
+        # File name -> wall-clock time spent processing the file
+        self.files_seconds: dict[str, float] = {}
+        # File name -> peak RSS of the process once the file was processed
+        self.files_max_rss: dict[str, int | None] = {}
+        self.current_file: str | None = None
+        # Traced memory when each running stage started & its peak before its sub-stages reset it
+        self._memory_stack: list[list[int]] = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def file(self, name: str):
+        """Stages measured inside this context are recorded for the given file."""
+        previous_file, self.current_file = self.current_file, name
+        profile = cProfile.Profile() if name == self.cprofile_file else None
+        start = time.perf_counter()
+        try:
+            if profile is not None:
+                profile.enable()
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self.cprofile_stats = pstats.Stats(profile)
+            self.files_seconds[name] = (
+                self.files_seconds.get(name, 0) + time.perf_counter() - start
+            )
+            if self.trace_memory:
+                self.files_max_rss[name] = max_rss()
+            self.current_file = previous_file
+
+    def _new_record(self):
+        return dict.fromkeys(
+            self.counters + (self.max_counters if self.trace_memory else ()), 0
+        )
+
+    @contextmanager
+    def measure(self, stage: str, n_bytes=0, n_items=0):
+        """Times the enclosed code as a call of the given stage. Yields the call's counters, so that the bytes & items
+        counts can be set once they are known."""
+        counters = {"bytes": n_bytes, "items": n_items}
+        if self.trace_memory:
+            # The peak is reset for this stage, so the enclosing stage keeps its own peak so far
+            current_memory, peak = tracemalloc.get_traced_memory()
+            if self._memory_stack:
+                self._memory_stack[-1][1] = max(self._memory_stack[-1][1], peak)
+            self._memory_stack.append([current_memory, 0])
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield counters
+        finally:
+            seconds = time.perf_counter() - start
+            record = self.files.setdefault(self.current_file, {}).setdefault(
+                stage, self._new_record()
+            )
+            record["calls"] += 1
+            record["seconds"] += seconds
+            record["bytes"] += counters["bytes"]
+            record["items"] += counters["items"]
+            if self.trace_memory:
+                start_memory, sub_stages_peak = self._memory_stack.pop()
+                peak = max(tracemalloc.get_traced_memory()[1], sub_stages_peak)
+                if self._memory_stack:
+                    self._memory_stack[-1][1] = max(self._memory_stack[-1][1], peak)
+                record["peak_memory"] = max(record["peak_memory"], peak - start_memory)
+
+    @property
+    def total(self) -> dict[str, dict[str, int | float]]:
+        """Counters of each stage, summed over all files."""
+        res = {}
+        for stages in self.files.values():
+            for stage, record in stages.items():
+                total_record = res.setdefault(stage, self._new_record())
+                for counter in self.counters:
+                    total_record[counter] += record[counter]
+                for counter in self.max_counters:
+                    if counter in record:
+                        total_record[counter] = max(
+                            total_record[counter], record[counter]
+                        )
+        return res
+
+    def report(self):
+        res = {
+            "files": {
+                name if name is not None else "": stages
+                for name, stages in self.files.items()
+            },
+            "total": self.total,
+            "files_seconds": self.files_seconds,
+        }
+        if self.trace_memory:
+            res["files_max_rss"] = self.files_max_rss
+            res["max_rss"] = max_rss()
+        return res
+
+    def save(self, path: Path):
+        """Saves the report as JSON, and the cProfile capture (if any) next to it, with a .prof suffix."""
+        path.write_text(json.dumps(self.report(), indent=2), encoding="UTF-8")
+        if self.cprofile_stats is not None:
+            self.cprofile_stats.dump_stats(path.with_suffix(".prof"))
+
+    def slowest_files(self, n_files: int):
+        """Names of the n_files files that took the most time to process, slowest first."""
+        return sorted(self.files_seconds, key=self.files_seconds.get, reverse=True)[
+            :n_files
+        ]
+
+    @classmethod
+    def table(cls, stages: dict[str, dict[str, int | float]]):
+        """Human-readable table of the given stages' counters, slowest stages first. The peak memory column is only
+        shown if it was traced."""
+        has_peak_memory = any("peak_memory" in record for record in stages.values())
+        lines = [
+            f"{'Stage':<40}{'Calls':>8}{'Seconds':>10}{'MB':>10}{'MB/s':>10}{'Items':>10}{'Items/s':>12}"
+            + (f"{'Peak MB':>10}" if has_peak_memory else "")
+        ]
+        for stage, record in sorted(
+            stages.items(), key=lambda item: item[1]["seconds"], reverse=True
+        ):
+            seconds = record["seconds"]
+            mb = record["bytes"] / 1e6
+            lines.append(
+                f"{stage:<40}{record['calls']:>8}{seconds:>10.3f}{mb:>10.2f}"
+                f"{mb / seconds if seconds else 0:>10.2f}{record['items']:>10}"
+                f"{record['items'] / seconds if seconds else 0:>12.1f}"
+                + (
+                    f"{record.get('peak_memory', 0) / 1e6:>10.2f}"
+                    if has_peak_memory
+                    else ""
+                )
+            )
+        return "\n".join(lines)
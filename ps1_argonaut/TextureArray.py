@@ -0,0 +1,129 @@
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Header: magic, format version, number of images, offset of the index
+header_dtype = np.dtype(
+    [("magic", "S8"), ("version", "<u4"), ("n_images", "<u4"), ("index_offset", "<u8")]
+)
+# One index entry per image (struct "<32sIIQ"), pointing to its RGBA pixels (height x width x 4 bytes)
+index_entry_dtype = np.dtype(
+    [("name", "S32"), ("width", "<u4"), ("height", "<u4"), ("offset", "<u8")]
+)
+
+
+class TextureArray:
+    """Memory-mapped texture array container: a header, the images' raw RGBA pixels, then an index of their names,
+    dimensions & offsets (written last, so that images can be streamed to the file). Images are (height, width, 4)
+    uint8 views of the file, so reading one doesn't decode or copy anything."""
+
+    magic = b"PS1TXARR"
+    version = 2
+    # Pixel blocks are aligned to this many bytes
+    alignment = 16
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._mmap = np.memmap(path, dtype=np.uint8, mode="r")
+        header = self._mmap[: header_dtype.itemsize].view(header_dtype)[0]
+        if header["magic"] != self.magic or header["version"] != self.version:
+            raise ValueError(f"{path} is not a version {self.version} texture array.")
+        index_offset = int(header["index_offset"])
+        self.index = self._mmap[
+            index_offset : index_offset
+            + int(header["n_images"]) * index_entry_dtype.itemsize
+        ].view(index_entry_dtype)
+        self.names = [name.decode("ASCII") for name in self.index["name"].tolist()]
+        self._ids = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name: str):
+        return name in self._ids
+
+    def __getitem__(self, key: int | str) -> np.ndarray:
+        entry = self.index[self._ids[key] if isinstance(key, str) else key]
+        width, height, offset = (
+            int(entry["width"]),
+            int(entry["height"]),
+            int(entry["offset"]),
+        )
+        return self._mmap[offset : offset + 4 * width * height].reshape(
+            (height, width, 4)
+        )
+
+    def image(self, key: int | str):
+        return Image.fromarray(self[key], "RGBA")
+
+
+class TextureArrayWriter:
+    """Writes images as a TextureArray: each image's pixels are written to the file as soon as it is added, only the
+    index is kept in memory. The header & index are written by close (or at the end of a with statement)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.index: list[tuple[bytes, int, int, int]] = []
+        self._names_set: set[str] = set()
+        self._file = open(path, "wb")
+        # Header placeholder, until close
+        self._file.write(b"\x00" * header_dtype.itemsize)
+
+    def _align(self):
+        self._file.write(b"\x00" * (-self._file.tell() % TextureArray.alignment))
+
+    def add(self, name: str, image: Image.Image | np.ndarray):
+        """Adds a PIL image, or a (height, width, 3 or 4) uint8 array. Names are at most 32 ASCII characters long."""
+        encoded_name = name.encode("ASCII")
+        if len(encoded_name) > index_entry_dtype["name"].itemsize:
+            raise ValueError(
+                f"Texture array names are limited to 32 characters: {name}"
+            )
+        if name in self._names_set:
+            raise ValueError(f"Duplicate texture array name: {name}")
+        if isinstance(image, Image.Image):
+            array = np.asarray(image.convert("RGBA"))
+        elif image.shape[2] == 3:
+            array = np.concatenate(
+                (image, np.full((*image.shape[:2], 1), 255, dtype=np.uint8)), axis=2
+            )
+        else:
+            array = image
+        self._align()
+        self.index.append(
+            (encoded_name, array.shape[1], array.shape[0], self._file.tell())
+        )
+        self._names_set.add(name)
+        self._file.write(np.ascontiguousarray(array, dtype=np.uint8).tobytes())
+
+    def close(self):
+        self._align()
+        index_offset = self._file.tell()
+        self._file.write(np.array(self.index, dtype=index_entry_dtype).tobytes())
+        self._file.seek(0)
+        self._file.write(
+            np.array(
+                [
+                    (
+                        TextureArray.magic,
+                        TextureArray.version,
+                        len(self.index),
+                        index_offset,
+                    )
+                ],
+                dtype=header_dtype,
+            ).tobytes()
+        )
+        self._file.close()
+        self.index, self._names_set = [], set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Without its header, the incomplete file isn't a valid texture array
+            self._file.close()
@@ -1,7 +1,10 @@
 import logging
+from contextlib import nullcontext
 from enum import Enum
 from struct import Struct
 
+from ps1_argonaut.Profiler import Profiler
+
 _default_struct = Struct("<12sII")
 
 
@@ -47,7 +50,16 @@ class G(Enum):
 
 
 class Configuration:
-    def __init__(self, game: G, ignore_warnings=False, debug=False):
+    def __init__(
+        self,
+        game: G,
+        ignore_warnings=False,
+        debug=False,
+        profiler: Profiler = None,
+        low_memory=False,
+    ):
+        """If low_memory is True, parsed sections don't keep a view of their raw data (which keeps the whole WAD's
+        data alive), so the WADs can't be serialized afterwards (see BaseWADSection.fallback_serialize)."""
         self.game = game
         self.ignore_warnings = (
             ignore_warnings  # If False, warnings stop program execution
@@ -56,6 +68,14 @@ class Configuration:
             format="%(message)s", level=logging.DEBUG if debug else logging.WARNING
         )
         self.debug = debug
+        self.profiler = profiler
+        self.low_memory = low_memory
+
+    def measure(self, stage: str, n_bytes=0, n_items=0):
+        """Measures the enclosed code with the profiler (see Profiler.measure), if profiling is enabled."""
+        if self.profiler is None:
+            return nullcontext({"bytes": n_bytes, "items": n_items})
+        return self.profiler.measure(stage, n_bytes, n_items)
 
 
 SUPPORTED_GAMES = (
@@ -77,4 +97,5 @@ PARSABLE_GAMES = (
 SLICEABLE_GAMES = SUPPORTED_GAMES
 
 wavefront_header = "# Generated by ps1_argonaut reverse tools: https://github.com/OverSurge/PS1-Argonaut-Reverse\n"
+gltf_generator = "ps1_argonaut reverse tools: https://github.com/OverSurge/PS1-Argonaut-Reverse"
 wav_header = b"Generated by ps1_argonaut reverse tools: https://github.com/OverSurge/PS1-Argonaut-Reverse"
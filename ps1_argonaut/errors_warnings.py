@@ -12,6 +12,14 @@ class UnsupportedSerialization(NotImplementedError):
         )
 
 
+class MissingFallbackData(ValueError):
+    def __init__(self, section_name):
+        super().__init__(
+            f"The {section_name} section can't be serialized: its raw data wasn't kept when it was parsed "
+            f"(low memory mode), parse it again without this mode."
+        )
+
+
 class ReverseError(Exception):
     def __init__(self, explanation: str, absolute_file_offset: int = None):
         Exception.__init__(self)
@@ -77,6 +85,15 @@ class IncompatibleAnimationError(ReverseError):
         )
 
 
+class SubChunksListError(ReverseError):
+    def __init__(self, absolute_file_offset: int, n_sub_chunks: int):
+        super().__init__(
+            f"The chunks' sub-chunks linked lists don't hold exactly the {n_sub_chunks} sub-chunks of the level "
+            f"(cyclic, overlong, too short or invalid lists).",
+            absolute_file_offset,
+        )
+
+
 class ZeroRunLengthError(ReverseError):
     def __init__(self, absolute_file_offset: int):
         super().__init__(
@@ -12,6 +12,9 @@ class DATFile:
     ):
         if data is not None:
             self._data = data
+        # Where the file is in its DAT archive (when it comes from one) and its size, kept after parsing
+        self.dat_offset: int | None = None
+        self.size = len(data) if data is not None else None
 
         self.suffix = suffix if suffix is not None else self.__class__.suffix
 
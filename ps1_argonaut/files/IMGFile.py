@@ -8,7 +8,11 @@ from PIL import Image
 from ps1_argonaut.BaseDataClasses import BaseDataClass
 from ps1_argonaut.configuration import Configuration
 from ps1_argonaut.files.DATFile import DATFile
-from ps1_argonaut.utils import parse_4bits_paletted, parse_high_color, parse_palette, XY
+from ps1_argonaut.utils import (
+    parse_4bits_paletted_array,
+    parse_high_color_array,
+    XY,
+)
 
 
 class ImageType(Enum):
@@ -33,9 +37,11 @@ class ImageType(Enum):
 
     @classmethod
     def guess_from_bytes_size(cls, bytes_size: int):
-        for member in cls._member_map_.values():  # type: ImageType
-            if member.bytes_size == bytes_size:
-                return member
+        return _image_types_by_bytes_size.get(bytes_size)
+
+    @property
+    def n_channels(self):
+        return 4 if self.has_alpha else 3
 
     LOAD = (262144, (512, 256), 0, False)
     STORY = (123392, (512, 240), 256)
@@ -61,6 +67,12 @@ class ImageType(Enum):
     WIZPAGE = (2080, (128, 32), 16)
 
 
+# First image type of each size, built once (WIZPAGE has the same size as WIZ, see IMGFile.parse)
+_image_types_by_bytes_size: dict[int, ImageType] = {}
+for _image_type in ImageType:
+    _image_types_by_bytes_size.setdefault(_image_type.bytes_size, _image_type)
+
+
 class IMGFile(list[Image.Image], DATFile, BaseDataClass):
     suffix = "IMG"
 
@@ -82,41 +94,64 @@ class IMGFile(list[Image.Image], DATFile, BaseDataClass):
             offsets = list(
                 accumulate((608, 288, 288, 288, 608, 608, 608, 608, 608, 608, 608, 608))
             )
-            images_data = [
-                self._data[offsets[i - 1] : offsets[i]] for i in range(1, len(offsets))
-            ]
         else:
-            images_data = (self._data,)
+            offsets = [0, len(self._data)]
 
-        self.clear()
-        for image_data in images_data:
-            if len(image_data) in [image_type.bytes_size for image_type in ImageType]:
-                # Fix for WIZPAGE.IMG that has the same bytes length than other WIZ files but not the same dimensions
-                if "stem" in kwargs and kwargs["stem"] == "WIZPAGE":
-                    image_type = ImageType.WIZPAGE
-                else:
-                    image_type: ImageType = ImageType.guess_from_bytes_size(
-                        len(image_data)
-                    )
-                if image_type.n_palette_colors != 0:
-                    palette = parse_palette(
-                        image_data, image_type.n_palette_colors, image_type.has_alpha
-                    )
-                else:
-                    palette = None
-                self.append(
-                    IMGFile.to_full_colorized(
-                        image_data,
-                        image_type.dimensions,
-                        palette,
-                        image_type.n_palette_colors,
-                        image_type.has_alpha,
-                    )
-                )
-            else:
+        images_types = []
+        for i in range(1, len(offsets)):
+            image_type = ImageType.guess_from_bytes_size(offsets[i] - offsets[i - 1])
+            if image_type is None:
                 raise ValueError("Unknown image size")
+            # Fix for WIZPAGE.IMG that has the same bytes length than other WIZ files but not the same dimensions
+            if "stem" in kwargs and kwargs["stem"] == "WIZPAGE":
+                image_type = ImageType.WIZPAGE
+            images_types.append(image_type)
+
+        # Images of the same type are decoded together, see to_images
+        data = np.frombuffer(self._data, dtype=np.uint8)
+        images: list[Image.Image | None] = [None] * len(images_types)
+        for image_type in dict.fromkeys(images_types):
+            images_ids = [i for i, t in enumerate(images_types) if t == image_type]
+            images_data = np.stack(
+                [data[offsets[i] : offsets[i + 1]] for i in images_ids]
+            )
+            for i, image in zip(images_ids, self.to_images(images_data, image_type)):
+                images[i] = image
+
+        self.clear()
+        self.extend(images)
         self.end_parse()
 
+    @staticmethod
+    def to_images(images_data: np.ndarray, image_type: ImageType):
+        """Decodes a (n_images, bytes_size) uint8 array of images of the same type in one batch. Paletted images are
+        "P" images (palette indexes & their palette), the others are RGB(A) images."""
+        width, height = image_type.dimensions
+        n_palette_colors = image_type.n_palette_colors
+        mode = "RGBA" if image_type.has_alpha else "RGB"
+        pixels_data = images_data[:, 2 * n_palette_colors :]
+        if n_palette_colors == 0:
+            pixels = parse_high_color_array(
+                pixels_data[:, : 2 * width * height], image_type.has_alpha
+            ).reshape((len(images_data), height, width, image_type.n_channels))
+            return [Image.fromarray(image_pixels, mode) for image_pixels in pixels]
+
+        palettes = parse_high_color_array(
+            images_data[:, : 2 * n_palette_colors], image_type.has_alpha
+        )
+        if n_palette_colors == 16:
+            indexes = parse_4bits_paletted_array(pixels_data[:, : width * height // 2])
+        else:
+            indexes = pixels_data[:, : width * height]
+        images = []
+        for image_indexes, palette in zip(
+            indexes.reshape((len(images_data), height, width)), palettes
+        ):
+            image = Image.fromarray(np.ascontiguousarray(image_indexes), "P")
+            image.putpalette(palette.tobytes(), mode)
+            images.append(image)
+        return images
+
     @staticmethod
     def to_full_colorized(
         data: bytes,
@@ -130,7 +165,7 @@ class IMGFile(list[Image.Image], DATFile, BaseDataClass):
         if n_palette_colors != 0:
             if n_palette_colors == 16:
                 pixels = np.reshape(
-                    np.array(parse_4bits_paletted(pixels_data), dtype=np.uint8),
+                    parse_4bits_paletted_array(pixels_data),
                     (dimensions[1], dimensions[0]),
                 )
                 image = Image.fromarray(pixels, "P")
@@ -139,8 +174,9 @@ class IMGFile(list[Image.Image], DATFile, BaseDataClass):
             image.putpalette(palette, mode)
             return image
         else:
-            pixels = np.reshape(
-                np.array(parse_high_color(pixels_data, has_alpha), dtype=np.uint8),
-                (dimensions[1], dimensions[0], 4 if has_alpha else 3),
+            return Image.fromarray(
+                parse_high_color_array(pixels_data, has_alpha).reshape(
+                    (dimensions[1], dimensions[0], 4 if has_alpha else 3)
+                ),
+                mode,
             )
-            return Image.fromarray(pixels, mode)
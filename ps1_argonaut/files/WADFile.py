@@ -1,19 +1,27 @@
-import math
+from collections.abc import Iterable
 from io import BufferedIOBase, BytesIO, SEEK_CUR, StringIO
 from pathlib import Path
 
+import numpy as np
+from PIL import Image
+
 from ps1_argonaut.BaseDataClasses import BaseWADSection
 from ps1_argonaut.configuration import Configuration, G, wavefront_header
+from ps1_argonaut.ContentStore import ContentStore
 from ps1_argonaut.errors_warnings import SectionNameError
+from ps1_argonaut.GLTFBuilder import GLTFBuilder
 from ps1_argonaut.files.DATFile import DATFile
-from ps1_argonaut.wad_sections.DPSX.ChunkClasses import ChunkHolder
+from ps1_argonaut.wad_sections.DPSX.ChunkClasses import ChunksIndex
 from ps1_argonaut.wad_sections.DPSX.DPSXSection import DPSXSection
+from ps1_argonaut.wad_sections.DPSX.LevelMesh import LevelMesh
 from ps1_argonaut.wad_sections.DPSX.Model3DData import Model3DData
 from ps1_argonaut.wad_sections.ENDSection import ENDSection
 from ps1_argonaut.wad_sections.PORTSection import PORTSection
 from ps1_argonaut.wad_sections.SPSX import VAGSoundData
 from ps1_argonaut.wad_sections.SPSX.Sounds import DialoguesBGMsSoundFlags
 from ps1_argonaut.wad_sections.SPSX.SPSXSection import SPSXSection
+from ps1_argonaut.wad_sections.SPSX.VAGIndex import VAGIndex
+from ps1_argonaut.wad_sections.TPSX.TextureAtlas import TextureAtlas
 from ps1_argonaut.wad_sections.TPSX.TPSXSection import TPSXSection
 
 
@@ -36,27 +44,49 @@ class WADFile(dict[bytes, BaseWADSection], DATFile):
     ):
         dict.__init__(self, sections if sections is not None else {})
         DATFile.__init__(self, stem, data=data)
+        # Offset of each section in the WAD, set by parse & scan
+        self.sections_offsets: dict[bytes, int] = {}
+        self.scan_summary: dict | None = None
 
     def __str__(self):
+        summary = self.summary
         titles = (
-            " ({})".format(", ".join(title.strip(" ") for title in self.titles))
-            if self.titles
+            " ({})".format(", ".join(title.strip(" ") for title in summary["titles"]))
+            if summary["titles"]
             else ""
         )
         res = f"Game level{titles}"
-        if self:
+        if self.sections_offsets:
             res += "\n"
-            if self.tpsx:
-                res += f" {self.n_textures:>4} texture(s)"
-            if isinstance(self.spsx, SPSXSection):
-                res += f" {self.n_sounds:>4} audio file(s)"
-            if self.dpsx:
+            if "n_textures" in summary:
+                res += f" {summary['n_textures']:>4} texture(s)"
+            if "n_sounds" in summary:
+                res += f" {summary['n_sounds']:>4} audio file(s)"
+            if "n_models" in summary:
                 res += (
-                    f" {self.n_models:>4} model(s) {self.n_animations:>4} animation(s)"
-                    f" {self.n_filled_chunks:>4} chunk(s)"
+                    f" {summary['n_models']:>4} model(s) {summary['n_animations']:>4} animation(s)"
+                    f" {summary['n_filled_chunks']:>4} chunk(s)"
                 )
         return res
 
+    @property
+    def summary(self) -> dict:
+        """Titles & assets counts, taken from the parsed sections, or from the last scan if the WAD isn't parsed."""
+        if not self and self.scan_summary is not None:
+            return self.scan_summary
+        res = {"titles": self.titles}
+        if self.tpsx:
+            res["n_textures"] = self.n_textures
+        if isinstance(self.spsx, SPSXSection):
+            res["n_sounds"] = self.n_sounds
+        if self.dpsx:
+            res.update(
+                n_models=self.n_models,
+                n_animations=self.n_animations,
+                n_filled_chunks=self.n_filled_chunks,
+            )
+        return res
+
     # WAD sections
 
     @property
@@ -173,6 +203,17 @@ class WADFile(dict[bytes, BaseWADSection], DATFile):
     def chunks_matrix(self):
         return None if (self.dpsx is None) else self.dpsx.level_file.chunks_matrix
 
+    @property
+    def chunks_index(self):
+        if self.dpsx is None:
+            return None
+        if not hasattr(self, "_chunks_index"):
+            self._chunks_index = ChunksIndex(
+                self.dpsx.level_file.chunks_matrix,
+                None if self.port is None else self.port.chunks_zones,
+            )
+        return self._chunks_index
+
     @property
     def n_filled_chunks(self):
         return (
@@ -181,65 +222,157 @@ class WADFile(dict[bytes, BaseWADSection], DATFile):
             else self.dpsx.level_file.chunks_matrix.n_filled_chunks
         )
 
-    def _prepare_obj_export(self, folder_path: Path, wad_filename: str):
-        """Exports the material (MTL) and texture (PNG) files that are needed by the OBJ Wavefront file."""
+    def _prepare_obj_export(
+        self,
+        folder_path: Path,
+        wad_filename: str,
+        textures_ids: Iterable[int] = None,
+        texture_page: Image.Image = None,
+    ):
+        """Exports the material (MTL) and texture (PNG) files that are needed by the OBJ Wavefront file.
+        If textures_ids is given, the texture only holds these textures (see TextureAtlas), the returned textures'
+        coordinates match the exported texture."""
         with (folder_path / (wad_filename + ".MTL")).open(
             "w", encoding="ASCII"
         ) as mtl_file:
             mtl_file.write(wavefront_header + f"newmtl mtl1\nmap_Kd {wad_filename}.PNG")
-        self.tpsx.texture_file.to_colorized_texture().save(
-            folder_path / (wad_filename + ".PNG")
+        if texture_page is None:
+            texture_page = self.tpsx.texture_file.to_colorized_texture()
+        if textures_ids is None:
+            texture_page.save(folder_path / (wad_filename + ".PNG"))
+            return self.textures
+        atlas = TextureAtlas.from_texture_page(
+            texture_page, self.textures, textures_ids
+        )
+        atlas.image.save(folder_path / (wad_filename + ".PNG"))
+        return atlas.textures
+
+    def _store_obj_materials(self, store: ContentStore, wad_filename: str):
+        """Content-addressed version of _prepare_obj_export, returns the MTL filename (without extension)."""
+        digest = self.tpsx.texture_file.digest
+        self.store_texture(store, wad_filename)
+        store.store(
+            wad_filename,
+            f"{wad_filename}.MTL",
+            digest,
+            "MTL",
+            lambda path: path.write_text(
+                wavefront_header + f"newmtl mtl1\nmap_Kd {digest}.PNG", encoding="ASCII"
+            ),
+        )
+        return digest
+
+    def store_texture(self, store: ContentStore, wad_filename: str):
+        """Stores the colorized texture in a content store, it is only drawn if no identical texture is stored."""
+        store.store(
+            wad_filename,
+            f"{wad_filename}.PNG",
+            self.tpsx.texture_file.digest,
+            "PNG",
+            lambda path: self.tpsx.texture_file.to_colorized_texture().save(
+                path, "PNG"
+            ),
         )
 
-    def export_experimental_models(self, folder_path: Path, wad_filename: str):
-        """Tries to find one compatible animation for each model in the WAD, animates it to make it clean
-        (see doc about 3D models) and exports them into Wavefront OBJ files at the given location."""
+    def _experimental_models(self):
+        """Tries to find one compatible animation for each model in the WAD and yields it animated to make it clean
+        (see doc about 3D models), or yields the model as is if it has a single vertices group / no animation fits.
+        """
         n_models = self.n_models
         n_animations = self.n_animations
 
-        def guess_compatible_animation(position: int, n_vertices_groups: int):
-            """EXPERIMENTAL: Band-aid, will be removed when animations' model id is found & reversed."""
-            position = int((position / n_models) * n_animations)
-            a = int(position)
-            b = int(math.ceil(position))
-            while a > -1 or b < n_animations:
-                if a > -1:
-                    if self.animations[a].n_vertices_groups == n_vertices_groups:
-                        return a
-                    a -= 1
-                if b < n_animations:
-                    if self.animations[b].n_vertices_groups == n_vertices_groups:
-                        return b
-                    b += 1
-            return None
+        for i, model_3d in enumerate(self.models_3d):
+            if model_3d.n_vertices_groups == 1:
+                yield model_3d
+            else:
+                # EXPERIMENTAL: Band-aid, will be removed when animations' model id is found & reversed
+                animation_id = self.dpsx.nearest_compatible_animation(
+                    model_3d.n_vertices_groups, int((i / n_models) * n_animations)
+                )
+                if animation_id is None:
+                    yield model_3d
+                else:
+                    yield model_3d.animate(self.animations[animation_id])
 
+    def export_experimental_models(
+        self, folder_path: Path, wad_filename: str, crop_textures=False
+    ):
+        """Exports each model of the WAD (see _experimental_models) into Wavefront OBJ files at the given location.
+        If crop_textures is True, each model gets its own texture, only made of the textures it uses."""
         if not folder_path.exists():
             folder_path.mkdir()
         elif folder_path.is_file():
             raise FileExistsError
 
-        self._prepare_obj_export(folder_path, wad_filename)
-        for i, model_3d in enumerate(self.dpsx.models_3d):
+        if crop_textures:
+            texture_page = self.tpsx.texture_file.to_colorized_texture()
+        else:
+            textures = self._prepare_obj_export(folder_path, wad_filename)
+        for i, model_3d in enumerate(self._experimental_models()):
             obj_filename = f"{wad_filename}_{i}"
+            if crop_textures:
+                textures = self._prepare_obj_export(
+                    folder_path,
+                    obj_filename,
+                    model_3d.faces_texture_ids,
+                    texture_page,
+                )
             with (folder_path / (obj_filename + ".OBJ")).open(
                 "w", encoding="ASCII"
             ) as obj_file:
-                if model_3d.n_vertices_groups == 1:
+                model_3d.to_single_obj(
+                    obj_file,
+                    obj_filename,
+                    textures,
+                    obj_filename if crop_textures else wad_filename,
+                )
+
+    def store_experimental_models(self, store: ContentStore, wad_filename: str):
+        """Content-addressed version of export_experimental_models: identical models (and textures) found in
+        several WADs are only written once."""
+        mtl_filename = self._store_obj_materials(store, wad_filename)
+        for i, model_3d in enumerate(self._experimental_models()):
+            obj_filename = f"{wad_filename}_{i}"
+
+            def write_obj(path: Path):
+                with path.open("w", encoding="ASCII") as obj_file:
                     model_3d.to_single_obj(
-                        obj_file, obj_filename, self.textures, wad_filename
-                    )
-                else:
-                    animation_id = guess_compatible_animation(
-                        i, self.models_3d[i].n_vertices_groups
+                        obj_file, obj_filename, self.textures, mtl_filename
                     )
-                    if animation_id is None:
-                        model_3d.to_single_obj(
-                            obj_file, obj_filename, self.textures, wad_filename
-                        )
-                    else:
-                        model_3d.animate(self.animations[animation_id]).to_single_obj(
-                            obj_file, obj_filename, self.textures, wad_filename
-                        )
+
+            store.store(
+                wad_filename,
+                f"{obj_filename}.OBJ",
+                # The OBJ also contains the texture coordinates & the MTL filename
+                ContentStore.digest(model_3d.digest, mtl_filename),
+                "OBJ",
+                write_obj,
+            )
+
+    def export_animated_models(self, folder_path: Path, wad_filename: str):
+        """Bakes every compatible animation of each multi-groups model of the WAD into a binary glTF file
+        (one file per model & animation, see BaseModel3DData.to_gltf_clip) at the given location."""
+        if not folder_path.exists():
+            folder_path.mkdir()
+        elif folder_path.is_file():
+            raise FileExistsError
+
+        self.tpsx.texture_file.to_colorized_texture().save(
+            folder_path / (wad_filename + ".PNG")
+        )
+        for i, model_3d in enumerate(self.models_3d):
+            if model_3d.n_vertices_groups == 1:
+                continue
+            for animation_id in self.dpsx.compatible_animations(
+                model_3d.n_vertices_groups
+            ):
+                clip_name = f"{wad_filename}_{i}_{animation_id}"
+                model_3d.to_gltf_clip(
+                    self.animations[animation_id],
+                    self.textures,
+                    f"{wad_filename}.PNG",
+                    clip_name,
+                ).save(folder_path / f"{clip_name}.GLB")
 
     def export_model_3d(self, model_id: int, folder_path: Path, filename: str):
         """Exports a 3D model into a Wavefront OBJ file along with a MTL file and a texture file.
@@ -255,10 +388,36 @@ class WADFile(dict[bytes, BaseWADSection], DATFile):
             )
             obj_file.write(obj.getvalue())
 
-    def export_audio(self, folder_path: Path, wad_filename: str, fmt: str):
+    def export_audio(
+        self,
+        folder_path: Path,
+        wad_filename: str,
+        fmt: str,
+        vag_index: VAGIndex = None,
+    ):
+        """If a VAG index is given, sounds that have already been exported (by this WAD or a previous one)
+        are neither decoded nor written again."""
         if fmt not in ("VAG", "WAV"):
             raise ValueError("Only VAG and WAV export is supported at the moment")
 
+        def export_sound(vag: VAGSoundData.VAGSoundData, filename: str):
+            if fmt == "VAG" and vag.n_channels == VAGSoundData.STEREO:
+                paths = [
+                    folder_path / f"{filename}_L.VAG",
+                    folder_path / f"{filename}_R.VAG",
+                ]
+            else:
+                paths = [folder_path / f"{filename}.{fmt}"]
+
+            def encode():
+                return vag.to_vag(filename) if fmt == "VAG" else (vag.to_wav(filename),)
+
+            if vag_index is None:
+                for path, audio_bytes in zip(paths, encode()):
+                    path.write_bytes(audio_bytes)
+            else:
+                vag_index.export(vag, paths, encode)
+
         if self.spsx:
             mono_sounds = {
                 "effect": self.spsx.common_sfx,
@@ -267,13 +426,7 @@ class WADFile(dict[bytes, BaseWADSection], DATFile):
             }
             for prefix, sounds in mono_sounds.items():
                 for i, vag in enumerate(sounds.vags):
-                    filename = f"{wad_filename}_{prefix}_{i}"
-                    audio_bytes = (
-                        vag.to_vag(filename)[0]
-                        if fmt == "VAG"
-                        else vag.to_wav(filename)
-                    )
-                    (folder_path / f"{filename}.{fmt}").write_bytes(audio_bytes)
+                    export_sound(vag, f"{wad_filename}_{prefix}_{i}")
 
             dialogue_index = 0
             bgm_index = 0
@@ -284,111 +437,221 @@ class WADFile(dict[bytes, BaseWADSection], DATFile):
                 else:
                     filename = f"{wad_filename}_dialogue_{dialogue_index}"
                     dialogue_index += 1
-                audio_bytes = (
-                    sound.vag.to_vag(filename)
-                    if fmt == "VAG"
-                    else sound.vag.to_wav(filename)
-                )
-                if fmt == "VAG" and len(audio_bytes) == VAGSoundData.STEREO:
-                    (folder_path / f"{filename}_L.VAG").write_bytes(audio_bytes[0])
-                    (folder_path / f"{filename}_R.VAG").write_bytes(audio_bytes[1])
-                else:
-                    (folder_path / f"{filename}.{fmt}").write_bytes(
-                        audio_bytes[0] if fmt == "VAG" else audio_bytes
-                    )
+                export_sound(sound.vag, filename)
 
-    def export_audio_to_wav(self, folder_path: Path, wad_filename: str):
-        return self.export_audio(folder_path, wad_filename, "WAV")
+    def export_audio_to_wav(
+        self, folder_path: Path, wad_filename: str, vag_index: VAGIndex = None
+    ):
+        return self.export_audio(folder_path, wad_filename, "WAV", vag_index)
 
-    def export_audio_to_vag(self, folder_path: Path, wad_filename: str):
-        return self.export_audio(folder_path, wad_filename, "VAG")
+    def export_audio_to_vag(
+        self, folder_path: Path, wad_filename: str, vag_index: VAGIndex = None
+    ):
+        return self.export_audio(folder_path, wad_filename, "VAG", vag_index)
 
-    def export_level(self, folder_path: Path, wad_filename: str):
+    def export_level(
+        self,
+        folder_path: Path,
+        wad_filename: str,
+        chunk_ids: Iterable[int] = None,
+        weld=False,
+        crop_textures=False,
+    ):
+        """Exports the level as an OBJ Wavefront file. If chunk_ids is given (see chunks_index), only these chunks
+        are exported. If weld is True, the level is exported as a single compact object, see LevelMesh.welded.
+        If crop_textures is True, the texture is only made of the textures that the exported chunks use."""
         if not folder_path.exists():
             folder_path.mkdir(parents=True, exist_ok=True)
         elif folder_path.is_file():
             raise FileExistsError
 
-        self._prepare_obj_export(folder_path, wad_filename)
+        if crop_textures:
+            chunks_matrix = self.dpsx.level_file.chunks_matrix
+            models_ids = chunks_matrix.sub_chunks_models_ids
+            if chunk_ids is not None:
+                models_ids = models_ids[self.chunks_index.sub_chunks(chunk_ids)]
+            models = [
+                chunks_matrix.chunks_models[model_id]
+                for model_id in np.unique(models_ids).tolist()
+            ]
+            textures_ids = [
+                texture_id for model in models for texture_id in model.faces_texture_ids
+            ]
+        else:
+            textures_ids = None
+        textures = self._prepare_obj_export(folder_path, wad_filename, textures_ids)
         with (folder_path / (wad_filename + ".OBJ")).open(
             "w", encoding="ASCII"
         ) as obj_file:
             obj = StringIO()
             obj.write(Model3DData.mtl_header.format(mtl_filename=wad_filename))
             vio = 0
-            sub_chunk_id = 0
             [
                 [
                     obj.write(f"vt {coord[0] / 1024} {(1024 - coord[1]) / 1024}\n")
                     for coord in texture.output_coords
                 ]
-                for texture in self.textures
+                for texture in textures
             ]
-            for i, chunk_holder in enumerate(
-                self.dpsx.level_file.chunks_matrix
-            ):  # type: int, ChunkHolder
-                if chunk_holder:
-                    x, z = self.dpsx.level_file.chunks_matrix.x_z_coords(i)
-                    for chunk in chunk_holder:
-                        cm = chunk.model_3d_data
-                        cm.to_batch_obj(
-                            obj,
-                            f"{wad_filename}_{sub_chunk_id}",
-                            x,
-                            chunk.height,
-                            z,
-                            chunk.rotation,
-                            vio,
-                        )
-                        vio += cm.n_vertices
-                        sub_chunk_id += 1
+            if weld:
+                self.level_mesh(chunk_ids).welded().to_obj(obj, wad_filename)
+                obj_file.write(obj.getvalue())
+                return
+            chunks_matrix = self.dpsx.level_file.chunks_matrix
+            sub_chunks_chunk_ids = chunks_matrix.sub_chunks_chunk_ids
+            for sub_chunk_id in (
+                range(chunks_matrix.n_sub_chunks)
+                if chunk_ids is None
+                else self.chunks_index.sub_chunks(chunk_ids)
+            ):
+                x, z = chunks_matrix.x_z_coords(sub_chunks_chunk_ids[sub_chunk_id])
+                chunk = chunks_matrix.sub_chunk(sub_chunk_id)
+                cm = chunk.model_3d_data
+                cm.to_batch_obj(
+                    obj,
+                    f"{wad_filename}_{sub_chunk_id}",
+                    x,
+                    chunk.height,
+                    z,
+                    chunk.rotation,
+                    vio,
+                )
+                vio += cm.n_vertices
             obj_file.write(obj.getvalue())
 
-    def parse(self, conf: Configuration, *args, **kwargs):
-        def parse_sections():
-            data_in.seek(4)
-            while True:
-                codename = data_in.read(4)
+    def level_mesh(self, chunk_ids: Iterable[int] = None, lighting=False):
+        """Batched geometry of the level (or of the given chunks, see chunks_index), with lighting colors if asked
+        and available."""
+        chunks_matrix = self.dpsx.level_file.chunks_matrix
+        return LevelMesh.from_chunks_matrix(
+            chunks_matrix,
+            None if chunk_ids is None else self.chunks_index.sub_chunks(chunk_ids),
+            self.dpsx.level_file.lighting if lighting else None,
+        )
 
-                # Detects incorrect WADs like FESOUND or FETHUND
-                if (
-                    len(sections_offsets) == 0
-                    and codename != TPSXSection.codename_bytes
-                ):
-                    raise SectionNameError(
-                        data_in.tell(),
-                        TPSXSection.codename_str,
-                        codename.decode("latin1"),
-                    )
+    def _add_gltf_actors(self, gltf: GLTFBuilder, name: str):
+        """Places an empty node per actor instance, holding its script id & sound level. Actors' models aren't placed,
+        as the link between an actor and its model isn't reversed yet."""
+        actors_instances = self.dpsx.level_file.actors_instances
+        script_ids = self.dpsx.actors_instances_scripts.tolist()
+        for i, actor_instance in enumerate(actors_instances):
+            gltf.add_node(
+                f"{name}_actor_{i}",
+                translation=(actor_instance["position"] / 1024).tolist(),
+                extras={
+                    "script_id": script_ids[i],
+                    "sound_level": int(actor_instance["sound_level"]),
+                },
+            )
 
-                sections_offsets[codename] = data_in.tell() - 4
-                data_in.seek(int.from_bytes(data_in.read(4), "little"), SEEK_CUR)
-                if codename == ENDSection.codename_bytes:  # ' DNE' (END)
-                    break
+    def export_level_gltf(
+        self,
+        folder_path: Path,
+        wad_filename: str,
+        chunk_ids: Iterable[int] = None,
+        lighting=True,
+        actors=False,
+        lods=False,
+    ):
+        """Exports the level as a binary glTF (GLB) file, see LevelMesh.add_gltf_mesh. If chunk_ids is given
+        (see chunks_index), only these chunks are exported. Actors are placed as empty nodes, see _add_gltf_actors.
+        If lods is True, decimated levels of detail are added to the level, see LevelMesh.add_gltf_lods."""
+        if not folder_path.exists():
+            folder_path.mkdir(parents=True, exist_ok=True)
+        elif folder_path.is_file():
+            raise FileExistsError
 
-        data_in = BytesIO(self._data)
+        self.tpsx.texture_file.to_colorized_texture().save(
+            folder_path / (wad_filename + ".PNG")
+        )
+        gltf = GLTFBuilder()
+        material = gltf.add_textured_material(wad_filename, f"{wad_filename}.PNG")
+        level_mesh = self.level_mesh(chunk_ids, lighting)
+        if lods:
+            level_mesh.add_gltf_lods(gltf, self.textures, material, wad_filename)
+        else:
+            gltf.add_node(
+                wad_filename,
+                level_mesh.add_gltf_mesh(gltf, self.textures, material, wad_filename),
+            )
+        if actors:
+            self._add_gltf_actors(gltf, wad_filename)
+        gltf.save(folder_path / f"{wad_filename}.GLB")
+
+    @staticmethod
+    def _parse_sections_offsets(data_in: BufferedIOBase):
         sections_offsets: dict[bytes, int] = {}
-        self.clear()
-        parse_sections()
-
-        for codename_bytes, offset in sections_offsets.items():
-            data_in.seek(offset)
-            if codename_bytes in WADFile.sections_conf:
-                section = WADFile.sections_conf[codename_bytes]
-                if conf.game in section.supported_games:
-                    if codename_bytes != ENDSection.codename_bytes:
+        data_in.seek(4)
+        while True:
+            codename = data_in.read(4)
+
+            # Detects incorrect WADs like FESOUND or FETHUND
+            if len(sections_offsets) == 0 and codename != TPSXSection.codename_bytes:
+                raise SectionNameError(
+                    data_in.tell(),
+                    TPSXSection.codename_str,
+                    codename.decode("latin1"),
+                )
+
+            sections_offsets[codename] = data_in.tell() - 4
+            data_in.seek(int.from_bytes(data_in.read(4), "little"), SEEK_CUR)
+            if codename == ENDSection.codename_bytes:  # ' DNE' (END)
+                break
+        return sections_offsets
+
+    def scan(self, conf: Configuration):
+        """Header-only alternative to parse, much faster: only reads the sections table and the assets counts of
+        the sections (see summary), without decoding any asset. The WAD keeps its raw data, so it can still be
+        parsed afterwards."""
+        with conf.measure("WADFile.scan", len(self._data)):
+            data_in = BytesIO(self._data)
+            self.sections_offsets = self._parse_sections_offsets(data_in)
+            self.scan_summary = {"titles": []}
+            for codename_bytes, offset in self.sections_offsets.items():
+                section = WADFile.sections_conf.get(codename_bytes)
+                if section is not None and conf.game in section.supported_games:
+                    data_in.seek(offset)
+                    self.scan_summary.update(section.scan(data_in, conf))
+            data_in.close()
+        return self.scan_summary
+
+    def parse(self, conf: Configuration, *args, **kwargs):
+        with conf.measure("WADFile.parse", len(self._data)):
+            data_in = BytesIO(self._data)
+            self.clear()
+            sections_offsets = self._parse_sections_offsets(data_in)
+            self.sections_offsets = sections_offsets
+            data_view = memoryview(self._data)
+
+            for codename_bytes, offset in sections_offsets.items():
+                data_in.seek(offset)
+                section = WADFile.sections_conf.get(codename_bytes)
+                if section is None or conf.game not in section.supported_games:
+                    section = BaseWADSection
+                section_size = 8 + int.from_bytes(
+                    self._data[offset + 4 : offset + 8], "little"
+                )
+                with conf.measure(f"{section.__name__}.parse", section_size):
+                    if section is BaseWADSection:
+                        self[codename_bytes] = BaseWADSection.fallback_parse(data_in)
+                    elif codename_bytes != ENDSection.codename_bytes:
                         self[codename_bytes] = section.parse(data_in, conf)
                     else:
                         self[codename_bytes] = section.parse(
                             data_in, conf, spsx_section=self[SPSXSection.codename_bytes]
                         )
-                else:
-                    self[codename_bytes] = BaseWADSection.fallback_parse(data_in)
-            else:
-                self[codename_bytes] = BaseWADSection.fallback_parse(data_in)
+                # Sections without their own serialization are serialized back from their raw data
+                if (
+                    section is not BaseWADSection
+                    and section.serialize is BaseWADSection.serialize
+                    and not conf.low_memory
+                ):
+                    self[codename_bytes].set_fallback_data(
+                        data_view[offset : offset + section_size]
+                    )
 
-        data_in.close()
-        self.end_parse()
+            data_in.close()
+            self.end_parse()
 
     def serialize(
         self, file_path_or_data_out: Path | BufferedIOBase, conf: Configuration
@@ -401,10 +664,14 @@ class WADFile(dict[bytes, BaseWADSection], DATFile):
         wad_size_offset = data_out.tell()
         data_out.write(b"\x00\x00\x00\x00")
         for section in self.values():
-            if section.serialize.__func__ is BaseWADSection.serialize:  # FIXME Dirty
-                section.fallback_serialize(data_out)
-            else:
-                section.serialize(data_out, conf)
+            with conf.measure(f"{type(section).__name__}.serialize") as counters:
+                section_offset = data_out.tell()
+                # FIXME Dirty
+                if section.serialize.__func__ is BaseWADSection.serialize:
+                    section.fallback_serialize(data_out)
+                else:
+                    section.serialize(data_out, conf)
+                counters["bytes"] = data_out.tell() - section_offset
         end_offset = data_out.tell()
         wad_size = end_offset - wad_size_offset
         if conf.game in (G.CROC_2_PS1, G.HARRY_POTTER_1_PS1, G.HARRY_POTTER_2_PS1):
@@ -0,0 +1,393 @@
+"""Generators of synthetic (but valid) raw data for the parsers, so that they can be tested & benchmarked without
+game files. The data is random, generated from a seed so that runs are reproducible."""
+
+import struct
+from io import BytesIO
+
+import numpy as np
+
+from ps1_argonaut.BaseDataClasses import BaseWADSection
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.errors_warnings import UnsupportedSerialization
+from ps1_argonaut.files.WADFile import WADFile
+from ps1_argonaut.wad_sections.DPSX.DPSXSection import DPSXSection
+from ps1_argonaut.wad_sections.DPSX.LevelFile import sub_chunk_transform_dtype
+from ps1_argonaut.wad_sections.ENDSection import ENDSection
+from ps1_argonaut.wad_sections.SPSX.SoundContainers import (
+    AmbientContainer,
+    CommonSFXContainer,
+    DialoguesBGMsContainer,
+)
+from ps1_argonaut.wad_sections.SPSX.Sounds import (
+    AmbientSound,
+    DialogueBGMSound,
+    DialoguesBGMsSoundFlags,
+    EffectSound,
+    SoundEffectsAmbientFlags,
+)
+from ps1_argonaut.wad_sections.SPSX.SPSXFlags import SPSXFlags
+from ps1_argonaut.wad_sections.SPSX.SPSXSection import SPSXSection
+from ps1_argonaut.wad_sections.SPSX.VAGSoundData import MONO, VAGSoundData
+from ps1_argonaut.wad_sections.TPSX.TextureData import TextureData
+from ps1_argonaut.wad_sections.TPSX.TextureFile import TextureFile
+from ps1_argonaut.wad_sections.TPSX.TextureFlags import TextureFlags
+from ps1_argonaut.wad_sections.TPSX.TPSXSection import TPSXSection
+
+HARRY_POTTER_GAMES = (G.HARRY_POTTER_1_PS1, G.HARRY_POTTER_2_PS1)
+
+
+def textures_entries_bytes(n_textures: int, seed=0):
+    """TextureData entries of random 16-colors paletted textures (see TextureData.parse)."""
+    rng = np.random.default_rng(seed)
+    res = bytearray()
+    for _ in range(n_textures):
+        x, y = rng.integers(0, 224, 2).tolist()
+        width, height = rng.integers(8, 32, 2).tolist()
+        res += TextureData.struct.pack(
+            x,
+            y,
+            int(rng.integers(0, 0x10000)) & 0xFFCF,
+            x + width,
+            y,
+            TextureFlags(0).value,
+            x,
+            y + height,
+            x + width,
+            y + height,
+        )
+    return bytes(res)
+
+
+def texture_file_bytes(conf: Configuration, n_textures: int, seed=0):
+    """Textures count, TextureData entries & run-length encoded texture page, as parsed by TextureFile.parse (with
+    has_legacy_textures=False and end=len(data)). Half of the texture page is made of random literal runs, the
+    other half of repeated runs."""
+    rng = np.random.default_rng(seed)
+    n_stored_textures = TextureFile.n_stored_textures(n_textures, conf)
+    res = bytearray(struct.pack("<II", n_textures, 4))
+    res += textures_entries_bytes(n_stored_textures, seed)
+    if conf.game in HARRY_POTTER_GAMES:
+        res += bytes(192)  # Empty textures
+    res += struct.pack("<II", 0, 0)
+
+    # Runs of 64 literal or repeated 2-bytes units
+    run_units = 64
+    n_runs = TextureFile.image_bytes_size // (TextureFile.rle_size * run_units)
+    for i in range(n_runs):
+        if i % 2:
+            res += struct.pack("<h", -run_units) + rng.bytes(TextureFile.rle_size)
+        else:
+            res += struct.pack("<h", run_units) + rng.bytes(
+                TextureFile.rle_size * run_units
+            )
+    return bytes(res)
+
+
+def model_3d_header_bytes(
+    conf: Configuration, n_vertices: int, n_faces: int, n_bounding_box_info=0
+):
+    """See Model3DHeader.parse."""
+    padding = 2 if conf.game not in HARRY_POTTER_GAMES else 6
+    return (
+        bytes(72)
+        + struct.pack("<I8xI4x3H", n_vertices, n_faces, n_bounding_box_info, 0, 0)
+        + bytes(padding)
+    )
+
+
+def vertices_bytes(n_vertices: int, n_vertices_groups: int, rng: np.random.Generator):
+    """Vertices (or vertices normals) split in groups, the last vertex of each group has a 1 index."""
+    vertices = np.empty((n_vertices, 4), dtype="<i2")
+    vertices[:, :3] = rng.integers(-2048, 2048, (n_vertices, 3))
+    vertices[:, 3] = 2
+    groups_ends = np.linspace(0, n_vertices, n_vertices_groups + 1).astype(int)[1:]
+    vertices[groups_ends - 1, 3] = 1
+    return vertices.tobytes()
+
+
+def model_3d_data_bytes(
+    conf: Configuration,
+    n_vertices: int,
+    n_faces: int,
+    n_textures: int,
+    n_vertices_groups=1,
+    is_world_model_3d=False,
+    seed=0,
+):
+    """3D model data following its header (see BaseModel3DData.parse), half quads & half triangles."""
+    rng = np.random.default_rng(seed)
+    res = vertices_bytes(n_vertices, n_vertices_groups, rng)
+    if not (is_world_model_3d and conf.game in HARRY_POTTER_GAMES):
+        res += vertices_bytes(n_vertices, n_vertices_groups, rng)
+
+    n_quads = n_faces // 2
+    vertices_ids = rng.integers(0, n_vertices, (n_faces, 4))
+    textures_ids = rng.integers(0, n_textures, n_faces)
+    quads_flags = np.where(np.arange(n_faces) < n_quads, 0x0800, 0)
+    if conf.game == G.CROC_2_DEMO_PS1_DUMMY or not is_world_model_3d:
+        faces = np.empty((n_faces, 10), dtype="<u2")
+        faces[:, :3] = rng.integers(0, 4096, (n_faces, 3))  # Faces normals
+        faces[:, 3] = 1
+        faces[:, 4:8] = vertices_ids
+        faces[:, 8] = textures_ids
+        faces[:, 9] = quads_flags
+    else:
+        faces = np.empty((n_faces, 6), dtype="<u2")
+        faces[:, :4] = vertices_ids
+        faces[:, 4] = textures_ids
+        faces[:, 5] = quads_flags
+    return res + faces.tobytes()
+
+
+def model_3d_bytes(
+    conf: Configuration,
+    n_vertices: int,
+    n_faces: int,
+    n_textures: int,
+    n_vertices_groups=1,
+    seed=0,
+):
+    """Actor 3D model (header & data), as parsed by Model3DData.parse."""
+    return model_3d_header_bytes(conf, n_vertices, n_faces) + model_3d_data_bytes(
+        conf, n_vertices, n_faces, n_textures, n_vertices_groups, seed=seed
+    )
+
+
+def animation_bytes(conf: Configuration, n_frames: int, n_vertices_groups: int, seed=0):
+    """Harry Potter animation made of unit quaternions frames (see AnimationHeader.parse & AnimationData.parse)."""
+    if conf.game not in HARRY_POTTER_GAMES:
+        raise UnsupportedSerialization("synthetic animations")
+    rng = np.random.default_rng(seed)
+    header = struct.pack(
+        "<I4xII8xI4xI12x", 0, n_frames, 1, n_vertices_groups, n_frames
+    ) + bytes(8 * n_frames)
+    sub_frames = np.empty((n_frames, n_vertices_groups, 8), dtype="<i2")
+    sub_frames[..., :4] = rng.integers(1, 4096, (n_frames, n_vertices_groups, 4))
+    sub_frames[..., 4:7] = rng.integers(-512, 512, (n_frames, n_vertices_groups, 3))
+    sub_frames[..., 7] = np.arange(n_frames)[:, None]
+    return header + sub_frames.tobytes()
+
+
+def vag_bytes(n_blocks: int, seed=0):
+    """Mono VAG audio data: a blank first block, then random 16-bytes ADPCM blocks, the last one ending the sound."""
+    rng = np.random.default_rng(seed)
+    blocks = np.frombuffer(rng.bytes(16 * n_blocks), dtype=np.uint8).reshape(
+        (n_blocks, 16)
+    )
+    blocks = blocks.copy()
+    blocks[:, 0] = (rng.integers(0, 5, n_blocks) << 4) | rng.integers(0, 13, n_blocks)
+    blocks[:, 1] = 0
+    blocks[-1, 1] = 1
+    return bytes(16) + blocks.tobytes()
+
+
+def section_bytes(codename: bytes, content: bytes):
+    """Section codename, size & content, as written by BaseWADSection.serialize."""
+    return codename + len(content).to_bytes(4, "little") + content
+
+
+def tpsx_section_bytes(
+    conf: Configuration, n_textures: int, titles=("SYNTHETIC LEVEL",), seed=0
+):
+    """TPSX section with translated titles and a texture file (see TPSXSection.parse)."""
+    content = struct.pack("<II", 16 | 4, len(titles))
+    content += b"".join(title.encode("latin1").ljust(48, b"\0") for title in titles)
+    content += bytes(2052) + texture_file_bytes(conf, n_textures, seed)
+    return section_bytes(TPSXSection.codename_bytes, content)
+
+
+def level_file_bytes(
+    conf: Configuration,
+    n_rows: int,
+    n_columns: int,
+    n_chunk_models: int,
+    n_vertices: int,
+    n_textures: int,
+    seed=0,
+):
+    """Harry Potter level file (see LevelFile.parse): a n_rows x n_columns chunks grid, three quarters of the chunks
+    hold one or two lit sub-chunks, each sub-chunk uses one of the n_chunk_models world 3D models.
+    """
+    if conf.game not in HARRY_POTTER_GAMES:
+        raise UnsupportedSerialization("synthetic level files")
+    rng = np.random.default_rng(seed)
+    n_chunks = n_rows * n_columns
+    n_chunk_sub_chunks = np.where(
+        rng.random(n_chunks) < 0.75, rng.integers(1, 3, n_chunks), 0
+    )
+    n_sub_chunks = int(n_chunk_sub_chunks.sum())
+    if n_sub_chunks and not n_chunk_models:
+        raise ValueError("Filled chunks need at least one chunk 3D model.")
+
+    res = n_chunk_models.to_bytes(4, "little")
+    res += b"".join(
+        model_3d_header_bytes(conf, n_vertices, n_vertices)
+        for _ in range(n_chunk_models)
+    )
+    res += b"".join(
+        model_3d_data_bytes(
+            conf, n_vertices, n_vertices, n_textures, is_world_model_3d=True, seed=i
+        )
+        for i in range(n_chunk_models)
+    )
+    # Sub-chunks count, no idk1, sub-chunks count again, no actors instances, chunks & grid sizes,
+    # no lighting headers / additional sub-chunks / idk4 and unknown data
+    res += bytes(8) + struct.pack("<II", n_sub_chunks, 0)
+    res += struct.pack("<IH6xIII", n_sub_chunks, 0, n_chunks, n_columns, n_rows)
+    res += struct.pack("<HHII116x", 0, 0, 0, 0)
+
+    # Each chunk's sub-chunks linked list, whose node i (8 bytes) holds the sub-chunk i
+    sub_chunks_ids = rng.permutation(n_sub_chunks)
+    chunks_ids = np.repeat(np.arange(n_chunks), n_chunk_sub_chunks)
+    starts = np.cumsum(n_chunk_sub_chunks) - n_chunk_sub_chunks
+    chunks_info_offsets = np.full(n_chunks, 0xFFFFFFFF, dtype="<u4")
+    filled = n_chunk_sub_chunks > 0
+    chunks_info_offsets[filled] = 8 * sub_chunks_ids[starts[filled]]
+    nodes = np.empty((n_sub_chunks, 2), dtype="<u4")
+    nodes[sub_chunks_ids, 0] = sub_chunks_ids
+    is_last = np.ones(n_sub_chunks, dtype=bool)
+    is_last[:-1] = chunks_ids[1:] != chunks_ids[:-1]
+    nodes[sub_chunks_ids, 1] = np.where(
+        is_last, 0xFFFFFFFF, 8 * np.roll(sub_chunks_ids, -1)
+    )
+    res += chunks_info_offsets.tobytes() + nodes.tobytes()
+
+    # Unknown header, zone ids & sub-chunks transforms, mapping & lighting, indexed by sub-chunk id
+    res += bytes(256) + n_chunks.to_bytes(4, "little")
+    res += rng.integers(0, 8, n_chunks, dtype="<u4").tobytes()
+    transforms = np.zeros(n_sub_chunks, dtype=sub_chunk_transform_dtype)
+    sub_chunks_chunk_ids = np.empty(n_sub_chunks, dtype=np.int64)
+    sub_chunks_chunk_ids[sub_chunks_ids] = chunks_ids
+    transforms["rotation"] = 4 * rng.integers(0, 4, n_sub_chunks)
+    transforms["x"] = 2048 + 4096 * (sub_chunks_chunk_ids % n_columns)
+    transforms["y"] = rng.integers(0, 4096, n_sub_chunks)
+    transforms["z"] = 2048 + 4096 * (sub_chunks_chunk_ids // n_columns)
+    res += transforms.tobytes()
+    res += rng.integers(0, max(n_chunk_models, 1), n_sub_chunks, dtype="<u4").tobytes()
+    res += bytes(4)  # No idk2
+    if n_sub_chunks:
+        # A single lighting block per sub-chunk, then empty unknown data
+        res += np.ones(n_sub_chunks, dtype="<u4").tobytes()
+        res += rng.bytes(4 * n_vertices * n_sub_chunks) + bytes(12)
+    return res
+
+
+def dpsx_section_bytes(
+    conf: Configuration,
+    n_models: int,
+    n_vertices: int,
+    n_animations: int,
+    n_frames: int,
+    n_vertices_groups: int,
+    n_rows: int,
+    n_columns: int,
+    n_chunk_models: int,
+    n_textures: int,
+    seed=0,
+):
+    """Harry Potter DPSX section (see DPSXSection.parse): actors' 3D models, animations of their vertices groups
+    and a level file, without scripts."""
+    content = bytes(2056) + n_models.to_bytes(4, "little")
+    content += b"".join(
+        model_3d_bytes(
+            conf, n_vertices, n_vertices, n_textures, n_vertices_groups, seed + i
+        )
+        for i in range(n_models)
+    )
+    content += n_animations.to_bytes(4, "little")
+    content += b"".join(
+        animation_bytes(conf, n_frames, n_vertices_groups, seed + i)
+        for i in range(n_animations)
+    )
+    content += bytes(4)  # No scripts
+    content += level_file_bytes(
+        conf, n_rows, n_columns, n_chunk_models, n_vertices, n_textures, seed
+    )
+    return section_bytes(DPSXSection.codename_bytes, content)
+
+
+def spsx_section(conf: Configuration, n_sounds: int, n_blocks: int, seed=0):
+    """SPSX section whose sounds are split between common sound effects, ambient tracks & dialogues, without level
+    sound effects. Dialogues are 2048 bytes-aligned, as they are in the END section."""
+    n_dialogues_blocks = 128 * -(-(n_blocks + 1) // 128) - 1
+    vags = [
+        VAGSoundData(
+            vag_bytes(n_dialogues_blocks if i % 3 == 2 else n_blocks, seed + i),
+            MONO,
+            22050,
+            conf,
+        )
+        for i in range(n_sounds)
+    ]
+    no_flags = SoundEffectsAmbientFlags(0)
+    return SPSXSection(
+        SPSXFlags.HAS_COMMON_SFX_AND_DIALOGUES_BGMS
+        | SPSXFlags.HAS_AMBIENT_TRACKS
+        | SPSXFlags.HAS_AMBIENT_TRACKS_,
+        CommonSFXContainer(
+            EffectSound(22050, 0x3FFF, no_flags, bytes(2), b"\x42\x00", vag.size, vag)
+            for vag in vags[::3]
+        ),
+        AmbientContainer(
+            AmbientSound(22050, 0x3FFF, no_flags, bytes(2), bytes(2), vag.size, vag)
+            for vag in vags[1::3]
+        ),
+        None,
+        None,
+        None,
+        None,
+        DialoguesBGMsContainer(
+            DialogueBGMSound(
+                22050, DialoguesBGMsSoundFlags.IS_MONO, bytes(4), vag.size, vag
+            )
+            for vag in vags[2::3]
+        ),
+    )
+
+
+def wad_file(
+    conf: Configuration,
+    stem="SYNTH",
+    n_textures=100,
+    n_models=10,
+    n_vertices=200,
+    n_animations=10,
+    n_frames=30,
+    n_vertices_groups=8,
+    n_rows=8,
+    n_columns=8,
+    n_chunk_models=16,
+    n_sounds=6,
+    n_sound_blocks=256,
+    seed=0,
+):
+    """Unparsed Harry Potter WAD made of TPSX, SPSX, DPSX & END sections, serialized with WADFile.serialize.
+    The default sizes are those of a small level: they can be scaled up as long as the models have at most 1000
+    vertices, the animations at most 500 frames and the texture file at most 4000 textures.
+    """
+    spsx = spsx_section(conf, n_sounds, n_sound_blocks, seed)
+    sections = {
+        TPSXSection.codename_bytes: BaseWADSection(
+            tpsx_section_bytes(conf, n_textures, seed=seed)
+        ),
+        SPSXSection.codename_bytes: spsx,
+        DPSXSection.codename_bytes: BaseWADSection(
+            dpsx_section_bytes(
+                conf,
+                n_models,
+                n_vertices,
+                n_animations,
+                n_frames,
+                n_vertices_groups,
+                n_rows,
+                n_columns,
+                n_chunk_models,
+                n_textures,
+                seed,
+            )
+        ),
+        ENDSection.codename_bytes: ENDSection(spsx),
+    }
+    data_out = BytesIO()
+    WADFile(stem, sections).serialize(data_out, conf)
+    return WADFile(stem, data=data_out.getvalue())
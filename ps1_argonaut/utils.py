@@ -1,6 +1,8 @@
 from io import BufferedIOBase
 from typing import BinaryIO
 
+import numpy as np
+
 padding_size = 2048
 
 XY = tuple[int, int]
@@ -24,33 +26,45 @@ def pad_in_2048_bytes(bio: BufferedIOBase | BinaryIO):
 # Images
 
 
+def _as_bytes_array(data: bytes | np.ndarray):
+    return np.frombuffer(data, dtype=np.uint8) if isinstance(data, bytes) else data
+
+
+def parse_high_color_array(data_in: bytes | np.ndarray, has_alpha: bool):
+    """Converts 15-bit high color raw bytes (see doc @Textures.md#15-bit-high-color)
+    into a (n_colors, 3 or 4) uint8 array. A (..., n_bytes) uint8 array is converted into a (..., n_colors, 3 or 4)
+    array."""
+    data_in = _as_bytes_array(data_in)
+    if data_in.shape[-1] % 2:  # Like int.from_bytes, a lone last byte is a color
+        data_in = np.concatenate(
+            (data_in, np.zeros((*data_in.shape[:-1], 1), dtype=np.uint8)), axis=-1
+        )
+    colors = np.ascontiguousarray(data_in).view("<u2").astype(np.uint32)
+    channels = [(((colors >> shift) & 0x1F) * 527 + 23) >> 6 for shift in (0, 5, 10)]
+    if has_alpha:
+        channels.append(255 * (colors != 0))
+    return np.stack(channels, axis=-1).astype(np.uint8)
+
+
 def parse_high_color(
     data_in: bytes, has_alpha: bool, legacy_alpha=False
 ):  # TODO Legacy alpha (Croc 2)
     """Converts 15-bit high color raw bytes (see doc @Textures.md#15-bit-high-color)
     into a flattened list of RGB colors."""
-    res = []
-    for i in range(0, len(data_in), 2):
-        color_bytes = int.from_bytes(data_in[i : i + 2], "little")
-        res.extend(
-            (
-                ((color_bytes & 0x1F) * 527 + 23) >> 6,
-                (((color_bytes & 0x3E0) >> 5) * 527 + 23) >> 6,
-                (((color_bytes & 0x7C00) >> 10) * 527 + 23) >> 6,
-            )
-        )
-        if has_alpha:
-            res.append(255 * (color_bytes != 0))
-    return res
+    return parse_high_color_array(data_in, has_alpha).flatten().tolist()
+
+
+def parse_4bits_paletted_array(data: bytes | np.ndarray):
+    """Splits each byte into two 4-bit palette indexes (low nibble first), as a uint8 array.
+    A (..., n_bytes) uint8 array is converted into a (..., 2 * n_bytes) array."""
+    data = _as_bytes_array(data)
+    return np.stack((data & 15, data >> 4), axis=-1).reshape(
+        (*data.shape[:-1], 2 * data.shape[-1])
+    )
 
 
 def parse_4bits_paletted(data: bytes):
-    res = []
-    for byte in data:
-        pixel1 = byte & 15
-        pixel2 = (byte & 240) >> 4
-        res.extend((pixel1, pixel2))
-    return res
+    return parse_4bits_paletted_array(data).tolist()
 
 
 def parse_palette(
@@ -1,4 +1,5 @@
 import math
+from collections.abc import Iterable
 from io import BufferedIOBase, SEEK_CUR
 
 import numpy as np
@@ -21,6 +22,19 @@ class AnimationData(BaseDataClass):
     def n_vertices_groups(self):
         return self.header.n_vertices_groups
 
+    @property
+    def n_frames(self):
+        return len(self.frames)
+
+    def transforms(self, frame_ids: Iterable[int] = None):
+        """Rotation & translation matrices of all frames (or of the given frames), as a (frames, groups, 3, 4) array."""
+        return np.array(
+            self.frames
+            if frame_ids is None
+            else [self.frames[frame_id] for frame_id in frame_ids],
+            dtype=np.float64,
+        ).reshape((-1, self.n_vertices_groups, 3, 4))
+
     @classmethod
     def parse(cls, data_in: BufferedIOBase, conf: Configuration, *args, **kwargs):
         super().parse(data_in, conf)
@@ -1,3 +1,4 @@
+import math
 import warnings
 from io import BufferedIOBase, SEEK_CUR
 
@@ -31,6 +32,17 @@ class AnimationHeader(BaseDataClass):
         self.n_inter_frames = n_inter_frames
         self.sub_frame_size = 24 if old_animation_format else 16
 
+    @property
+    def frames_size(self):
+        """Size of the frames that follow this header (see AnimationData.parse), used to skip them without parsing
+        them."""
+        inter_frames_size = (
+            4 * math.ceil((self.n_inter_frames * 2) / 4) if self.n_inter_frames else 0
+        )
+        return self.n_stored_frames * self.n_vertices_groups * self.sub_frame_size + (
+            max(self.n_stored_frames - 1, 0) * inter_frames_size
+        )
+
     @classmethod
     def parse(cls, data_in: BufferedIOBase, conf: Configuration, *args, **kwargs):
         super().parse(data_in, conf)
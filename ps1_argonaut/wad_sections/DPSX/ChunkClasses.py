@@ -1,7 +1,9 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from enum import IntEnum
 from io import StringIO
 
+import numpy as np
+
 from ps1_argonaut.BaseDataClasses import BaseDataClass
 from ps1_argonaut.wad_sections.DPSX.Model3DData import LevelGeom3DData
 
@@ -15,11 +17,16 @@ class ChunkRotation(IntEnum):
 
 class SubChunk(BaseDataClass):
     def __init__(
-        self, model_3d_data: LevelGeom3DData, height: int, rotation: ChunkRotation
+        self,
+        model_3d_data: LevelGeom3DData,
+        height: int,
+        rotation: ChunkRotation,
+        sub_chunk_id: int = None,
     ):
         self.model_3d_data = model_3d_data
         self.height = height
         self.rotation = rotation
+        self.sub_chunk_id = sub_chunk_id
 
 
 class ChunkHolder(list[SubChunk], BaseDataClass):
@@ -34,73 +41,175 @@ class ChunkHolder(list[SubChunk], BaseDataClass):
         self.fvw_data = fvw_data
 
 
-class ChunksMatrix(list[ChunkHolder]):
+class ChunksMatrix(Sequence[ChunkHolder]):
+    """Struct-of-arrays chunks matrix. The sub-chunks of chunk i are the items sub_chunks_offsets[i] to
+    sub_chunks_offsets[i + 1] (excluded) of the flat sub-chunks arrays, sorted by chunk.
+    ChunkHolder and SubChunk objects are only created on access, as views of these arrays."""
+
     def __init__(
         self,
-        chunks_holders: Iterable[ChunkHolder],
         chunks_models: Iterable[LevelGeom3DData],
         n_rows: int,
         n_columns: int,
-        has_zone_ids: bool,
+        sub_chunks_offsets: np.ndarray,
+        sub_chunks_ids: np.ndarray,
+        sub_chunks_models_ids: np.ndarray,
+        sub_chunks_heights: np.ndarray,
+        sub_chunks_rotations: np.ndarray,
+        zone_ids: np.ndarray = None,
+        fvw_data: np.ndarray = None,
     ):
-        super().__init__(chunks_holders)
+        self.chunks_models = list(chunks_models)
         self.n_rows = n_rows
         self.n_columns = n_columns
-        self.chunks_models = list(chunks_models)
+        self.sub_chunks_offsets = sub_chunks_offsets.astype(np.int32)
+        self.sub_chunks_ids = sub_chunks_ids.astype(np.int32)
+        self.sub_chunks_models_ids = sub_chunks_models_ids.astype(np.int32)
+        self.sub_chunks_heights = sub_chunks_heights.astype(np.int64)
+        self.sub_chunks_rotations = sub_chunks_rotations.astype(np.uint8)
+        self.zone_ids = zone_ids.astype(np.int64) if zone_ids is not None else None
+        self.fvw_data = fvw_data.astype(np.uint16) if fvw_data is not None else None
         self.max_zone_id = (
-            max(chunk_holder.zone_id for chunk_holder in chunks_holders)
-            if chunks_holders and has_zone_ids
+            int(self.zone_ids.max())
+            if self.zone_ids is not None and len(self.zone_ids)
             else None
         )
 
+    @classmethod
+    def from_sub_chunks_lists(
+        cls,
+        chunks_models: Iterable[LevelGeom3DData],
+        n_rows: int,
+        n_columns: int,
+        chunks_sub_chunks_ids: Iterable[Iterable[int] | None],
+        sub_chunks_models_ids: Iterable[int],
+        sub_chunks_heights: Iterable[int],
+        sub_chunks_rotations: Iterable[int],
+        zone_ids: Iterable[int] = None,
+        fvw_data: Iterable[int] = None,
+    ):
+        """Builds the matrix from the sub-chunks ids of each chunk (None if empty) and per-sub-chunk values
+        indexed by sub-chunk id."""
+        chunks_sub_chunks_ids = [
+            list(ids) if ids is not None else [] for ids in chunks_sub_chunks_ids
+        ]
+        offsets = np.zeros(len(chunks_sub_chunks_ids) + 1, dtype=np.int32)
+        np.cumsum([len(ids) for ids in chunks_sub_chunks_ids], out=offsets[1:])
+        sub_chunks_ids = np.array(
+            [i for ids in chunks_sub_chunks_ids for i in ids], dtype=np.int32
+        )
+        return cls(
+            chunks_models,
+            n_rows,
+            n_columns,
+            offsets,
+            sub_chunks_ids,
+            np.asarray(sub_chunks_models_ids, dtype=np.int32)[sub_chunks_ids],
+            np.asarray(sub_chunks_heights, dtype=np.int64)[sub_chunks_ids],
+            np.asarray(sub_chunks_rotations, dtype=np.uint8)[sub_chunks_ids],
+            np.asarray(zone_ids) if zone_ids is not None else None,
+            np.asarray(fvw_data) if fvw_data is not None else None,
+        )
+
+    @property
+    def n_chunks(self):
+        return len(self.sub_chunks_offsets) - 1
+
+    @property
+    def n_sub_chunks(self):
+        return len(self.sub_chunks_ids)
+
+    @property
+    def n_sub_chunks_grid(self):
+        """Sub-chunks count of each chunk, as a (rows, columns) array."""
+        return np.diff(self.sub_chunks_offsets).reshape((self.n_rows, self.n_columns))
+
+    @property
+    def offsets_grid(self):
+        """Offset of each chunk's first sub-chunk in the flat sub-chunks arrays, as a (rows, columns) array."""
+        return self.sub_chunks_offsets[:-1].reshape((self.n_rows, self.n_columns))
+
+    @property
+    def sub_chunks_chunk_ids(self):
+        """Chunk id of each item of the flat sub-chunks arrays."""
+        return np.repeat(
+            np.arange(self.n_chunks, dtype=np.int32), np.diff(self.sub_chunks_offsets)
+        )
+
+    @property
+    def filled_chunks_grid(self):
+        return self.n_sub_chunks_grid != 0
+
     @property
     def n_filled_chunks(self):
-        return sum(len(chunk) != 0 for chunk in self)
+        return int(np.count_nonzero(np.diff(self.sub_chunks_offsets)))
+
+    def __len__(self):
+        return self.n_chunks
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(self.n_chunks))]
+        if item < 0:
+            item += self.n_chunks
+        if not 0 <= item < self.n_chunks:
+            raise IndexError("chunk index out of range")
+        return ChunkHolder(
+            [
+                self.sub_chunk(i)
+                for i in range(
+                    self.sub_chunks_offsets[item], self.sub_chunks_offsets[item + 1]
+                )
+            ],
+            int(self.zone_ids[item]) if self.zone_ids is not None else None,
+            (
+                int(self.fvw_data[item]).to_bytes(2, "little")
+                if self.fvw_data is not None
+                else None
+            ),
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(self.n_chunks))
+
+    def sub_chunk(self, index: int):
+        """View of the sub-chunk at this index of the flat sub-chunks arrays."""
+        return SubChunk(
+            self.chunks_models[self.sub_chunks_models_ids[index]],
+            int(self.sub_chunks_heights[index]),
+            ChunkRotation(int(self.sub_chunks_rotations[index])),
+            int(self.sub_chunks_ids[index]),
+        )
 
     def __str__(self):
         return self.chunks_visual_map()
 
     def chunks_visual_map(self):
         return "\n".join(
-            [
-                " ".join(
-                    [
-                        "█" if self[x * self.n_columns + y] else "░"
-                        for y in range(self.n_columns)
-                    ]
-                )
-                for x in range(self.n_rows)
-            ]
+            " ".join("█" if filled else "░" for filled in row)
+            for row in self.filled_chunks_grid
         )
 
     def chunks_visual_ids(self):
         return "\n".join(
-            [
-                " ".join(
-                    [
-                        str(x * self.n_columns + y).ljust(4)
-                        if self[x * self.n_columns + y]
-                        else "░░░░"
-                        for y in range(self.n_columns)
-                    ]
-                )
-                for x in range(self.n_rows)
-            ]
+            " ".join(
+                str(x * self.n_columns + y).ljust(4) if filled else "░░░░"
+                for y, filled in enumerate(row)
+            )
+            for x, row in enumerate(self.filled_chunks_grid)
         )
 
     def subchunks_visual_ids(self):
-        subchunk_id = 0
         res = StringIO()
-        for x in range(self.n_rows):
-            for y in range(self.n_columns):
-                if y != 0:
-                    res.write(" ")
-                subchunks = self[x * self.n_columns + y]
-                if subchunks:
-                    res.write(str(subchunk_id).ljust(4))
-                    subchunk_id += len(subchunks)
-                else:
-                    res.write("░░░░")
+        for offsets_row, n_sub_chunks_row in zip(
+            self.offsets_grid, self.n_sub_chunks_grid
+        ):
+            res.write(
+                " ".join(
+                    str(offset).ljust(4) if n_sub_chunks else "░░░░"
+                    for offset, n_sub_chunks in zip(offsets_row, n_sub_chunks_row)
+                )
+            )
             res.write("\n")
         return res.getvalue()
 
@@ -108,15 +217,13 @@ class ChunksMatrix(list[ChunkHolder]):
         if self.max_zone_id is None:
             return "There are no zone ids in this level."
         res = StringIO()
-        for x in range(self.n_rows):
-            for y in range(self.n_columns):
-                if y != 0:
-                    res.write(" ")
-                zone_id = self[x * self.n_columns + y].zone_id
-                if zone_id is not None and zone_id != self.max_zone_id:
-                    res.write(str(zone_id).ljust(3))
-                else:
-                    res.write("░░░")
+        for row in self.zone_ids.reshape((self.n_rows, self.n_columns)):
+            res.write(
+                " ".join(
+                    str(zone_id).ljust(3) if zone_id != self.max_zone_id else "░░░"
+                    for zone_id in row
+                )
+            )
             res.write("\n")
         return res.getvalue()
 
@@ -126,3 +233,100 @@ class ChunksMatrix(list[ChunkHolder]):
             4096 * (chunk_id % self.n_columns) + 2048,
             4096 * (chunk_id // self.n_columns) + 2048,
         )
+
+
+class ChunksIndex:
+    """Spatial index of a chunks matrix, which answers area & zone queries without scanning the whole matrix.
+    Areas are given in level coordinates (x, z), with 4096-large chunks. Zones come from the level's zone ids and
+    from the PORT section's zones chunks ids, which are two views of the same data (see doc about PORT)."""
+
+    chunk_size = 4096
+
+    def __init__(
+        self, chunks_matrix: ChunksMatrix, chunks_zones: list[list[int]] = None
+    ):
+        self.chunks_matrix = chunks_matrix
+
+        zones, chunks = [], []
+        if chunks_matrix.zone_ids is not None:
+            # The highest zone id is used by the chunks which don't belong to any zone
+            in_zone = chunks_matrix.zone_ids != chunks_matrix.max_zone_id
+            zones.append(chunks_matrix.zone_ids[in_zone])
+            chunks.append(np.flatnonzero(in_zone))
+        if chunks_zones:
+            zones.append(
+                np.repeat(
+                    np.arange(len(chunks_zones)), [len(zone) for zone in chunks_zones]
+                )
+            )
+            chunks.append(
+                np.concatenate([np.array(z, dtype=np.int64) for z in chunks_zones])
+            )
+        if zones:
+            pairs = np.unique(
+                np.stack((np.concatenate(zones), np.concatenate(chunks)), axis=1),
+                axis=0,
+            )
+        else:
+            pairs = np.empty((0, 2), dtype=np.int64)
+        # Zone id -> chunks ids, stored like the sub-chunks in the chunks matrix
+        self.zones = pairs[:, 0]
+        self.zones_chunks_ids = pairs[:, 1]
+
+    @property
+    def zone_ids(self) -> list[int]:
+        return np.unique(self.zones).tolist()
+
+    def chunks_in_zone(self, zone_id: int) -> np.ndarray:
+        start, end = np.searchsorted(self.zones, (zone_id, zone_id + 1))
+        return self.zones_chunks_ids[start:end]
+
+    def chunks_in_box(self, x_min: int, z_min: int, x_max: int, z_max: int):
+        """Ids of the chunks that intersect the given rectangle."""
+        matrix = self.chunks_matrix
+        columns = np.arange(
+            max(x_min // self.chunk_size, 0),
+            min(x_max // self.chunk_size + 1, matrix.n_columns),
+        )
+        rows = np.arange(
+            max(z_min // self.chunk_size, 0),
+            min(z_max // self.chunk_size + 1, matrix.n_rows),
+        )
+        return (rows[:, None] * matrix.n_columns + columns).flatten()
+
+    def chunks_in_radius(self, x: int, z: int, radius: int):
+        """Ids of the chunks that intersect the given circle."""
+        chunk_ids = self.chunks_in_box(x - radius, z - radius, x + radius, z + radius)
+        columns = chunk_ids % self.chunks_matrix.n_columns
+        rows = chunk_ids // self.chunks_matrix.n_columns
+        # Distance between the center and the nearest point of each chunk
+        dx = x - np.clip(x, columns * self.chunk_size, (columns + 1) * self.chunk_size)
+        dz = z - np.clip(z, rows * self.chunk_size, (rows + 1) * self.chunk_size)
+        return chunk_ids[dx**2 + dz**2 <= radius**2]
+
+    def sub_chunks(self, chunk_ids: Iterable[int]) -> np.ndarray:
+        """Indexes of the given chunks' sub-chunks in the chunks matrix flat sub-chunks arrays, sorted."""
+        chunk_ids = np.unique(np.asarray(chunk_ids, dtype=np.int64))
+        n_chunks = self.chunks_matrix.n_chunks
+        invalid_ids = chunk_ids[(chunk_ids < 0) | (chunk_ids >= n_chunks)]
+        if len(invalid_ids):
+            raise ValueError(
+                f"Invalid chunk ids {invalid_ids.tolist()}, this level's chunk ids are between 0 and {n_chunks - 1}."
+            )
+        offsets = self.chunks_matrix.sub_chunks_offsets
+        starts, ends = offsets[chunk_ids], offsets[chunk_ids + 1]
+        lengths = ends - starts
+        # Concatenated ranges: each sub-chunk index is its chunk's start plus its rank in the chunk
+        ranks = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        return np.repeat(starts, lengths) + ranks
+
+    def sub_chunks_in_box(self, x_min: int, z_min: int, x_max: int, z_max: int):
+        return self.sub_chunks(self.chunks_in_box(x_min, z_min, x_max, z_max))
+
+    def sub_chunks_in_radius(self, x: int, z: int, radius: int):
+        return self.sub_chunks(self.chunks_in_radius(x, z, radius))
+
+    def sub_chunks_in_zone(self, zone_id: int):
+        return self.sub_chunks(self.chunks_in_zone(zone_id))
@@ -1,10 +1,15 @@
+from bisect import bisect_left
 from io import BufferedIOBase, SEEK_CUR
 
+import numpy as np
+
 from ps1_argonaut.BaseDataClasses import BaseWADSection
 from ps1_argonaut.configuration import Configuration, G
 from ps1_argonaut.wad_sections.DPSX.AnimationData import AnimationData
+from ps1_argonaut.wad_sections.DPSX.AnimationHeader import AnimationHeader
 from ps1_argonaut.wad_sections.DPSX.LevelFile import LevelFile
 from ps1_argonaut.wad_sections.DPSX.Model3DData import Model3DData
+from ps1_argonaut.wad_sections.DPSX.Model3DHeader import Model3DHeader
 from ps1_argonaut.wad_sections.DPSX.ScriptData import ScriptData
 
 
@@ -27,16 +32,76 @@ class DPSXSection(BaseWADSection):
         scripts: list[ScriptData],
         level_file: LevelFile,
         fallback_data: bytes = None,
+        scripts_offsets: list[int] = None,
+        models_3d_offsets: list[int] = None,
+        animations_offsets: list[int] = None,
     ):
+        """scripts_offsets are the scripts' offsets from the beginning of the section, used to resolve actors.
+        models_3d_offsets & animations_offsets are likewise the models' & animations' offsets (see AssetsCatalog).
+        """
         super().__init__(fallback_data)
         self.models_3d = models_3d
         self.animations = animations
         self.scripts = scripts
         self.level_file = level_file
+        self.scripts_offsets = scripts_offsets
+        self.models_3d_offsets = models_3d_offsets
+        self.animations_offsets = animations_offsets
+
+    @property
+    def actors_instances_scripts(self) -> np.ndarray:
+        """Id of the script each actor instance points to (the script which contains its actor offset), -1 if it
+        doesn't point to any script."""
+        actor_offsets = self.level_file.actors_instances["actor_offset"].astype(
+            np.int64
+        )
+        if not self.scripts_offsets:
+            return np.full(len(actor_offsets), -1, dtype=np.int64)
+        scripts_ends = np.array(self.scripts_offsets) + [
+            4 + script.size for script in self.scripts
+        ]
+        script_ids = (
+            np.searchsorted(self.scripts_offsets, actor_offsets, side="right") - 1
+        )
+        inside = (script_ids >= 0) & (
+            actor_offsets < scripts_ends[np.maximum(script_ids, 0)]
+        )
+        return np.where(inside, script_ids, -1)
+
+    @property
+    def animations_index(self) -> dict[int, np.ndarray]:
+        """Sorted ids of the animations, for each vertices groups count. Built once, at first use."""
+        if not hasattr(self, "_animations_index"):
+            n_vertices_groups = np.array(
+                [animation.n_vertices_groups for animation in self.animations],
+                dtype=np.int64,
+            )
+            animation_ids = np.argsort(n_vertices_groups, kind="stable")
+            groups_counts, starts = np.unique(
+                n_vertices_groups[animation_ids], return_index=True
+            )
+            self._animations_index = dict(
+                zip(groups_counts.tolist(), np.split(animation_ids, starts[1:]))
+            )
+        return self._animations_index
+
+    def compatible_animations(self, n_vertices_groups: int) -> np.ndarray:
+        """Sorted ids of the animations designed for models with this vertices groups count."""
+        return self.animations_index.get(n_vertices_groups, np.empty(0, dtype=np.int64))
+
+    def nearest_compatible_animation(self, n_vertices_groups: int, position: int):
+        """Id of the compatible animation that is the closest to the given position (the lowest id if tied),
+        None if no animation is compatible."""
+        animation_ids = self.compatible_animations(n_vertices_groups)
+        i = bisect_left(animation_ids, position)
+        if i < len(animation_ids) and (
+            i == 0 or animation_ids[i] - position < position - animation_ids[i - 1]
+        ):
+            return int(animation_ids[i])
+        return int(animation_ids[i - 1]) if i > 0 else None
 
     @classmethod
     def parse(cls, data_in: BufferedIOBase, conf: Configuration, *args, **kwargs):
-        fallback_data = super().fallback_parse_data(data_in)
         size, start = super().parse(data_in, conf)
         idk1 = data_in.read(4)
         n_idk_unique_textures = int.from_bytes(data_in.read(4), "little")
@@ -47,21 +112,71 @@ class DPSXSection(BaseWADSection):
             data_in.seek(2052, SEEK_CUR)
 
         n_models_3d = int.from_bytes(data_in.read(4), "little")
-        models_3d = [Model3DData.parse(data_in, conf) for _ in range(n_models_3d)]
+        models_3d = []
+        models_3d_offsets = []
+        for _ in range(n_models_3d):
+            models_3d_offsets.append(data_in.tell() - start + 8)
+            models_3d.append(Model3DData.parse(data_in, conf))
 
         n_animations = int.from_bytes(data_in.read(4), "little")
-        animations = [AnimationData.parse(data_in, conf) for _ in range(n_animations)]
+        animations = []
+        animations_offsets = []
+        for _ in range(n_animations):
+            animations_offsets.append(data_in.tell() - start + 8)
+            animations.append(AnimationData.parse(data_in, conf))
 
         if conf.game in (G.CROC_2_PS1, G.CROC_2_DEMO_PS1):
             n_dpsx_legacy_textures = int.from_bytes(data_in.read(4), "little")
             data_in.seek(n_dpsx_legacy_textures * 3072, SEEK_CUR)
 
         n_scripts = int.from_bytes(data_in.read(4), "little")
-        scripts = [ScriptData.parse(data_in, conf) for _ in range(n_scripts)]
+        scripts = []
+        scripts_offsets = []
+        for _ in range(n_scripts):
+            scripts_offsets.append(data_in.tell() - start + 8)
+            scripts.append(ScriptData.parse(data_in, conf))
 
         level_file = LevelFile.parse(data_in, conf)
 
         # FIXME End of Croc 2 & Croc 2 Demo Dummies' level files aren't reversed yet
         if conf.game not in (G.CROC_2_PS1, G.CROC_2_DEMO_PS1_DUMMY):
             cls.check_size(size, start, data_in.tell())
-        return cls(models_3d, animations, scripts, level_file, fallback_data)
+        return cls(
+            models_3d,
+            animations,
+            scripts,
+            level_file,
+            scripts_offsets=scripts_offsets,
+            models_3d_offsets=models_3d_offsets,
+            animations_offsets=animations_offsets,
+        )
+
+    @classmethod
+    def scan(cls, data_in: BufferedIOBase, conf: Configuration):
+        """Only reads the models, animations & level chunks counts, the models & animations data are skipped
+        according to their headers."""
+        super().parse(data_in, conf)
+        data_in.seek(2056 if conf.game != G.CROC_2_DEMO_PS1_DUMMY else 2060, SEEK_CUR)
+
+        n_models_3d = int.from_bytes(data_in.read(4), "little")
+        for _ in range(n_models_3d):
+            header = Model3DHeader.parse(data_in, conf)
+            data_in.seek(Model3DData.data_size(header, conf, False), SEEK_CUR)
+
+        n_animations = int.from_bytes(data_in.read(4), "little")
+        for _ in range(n_animations):
+            data_in.seek(AnimationHeader.parse(data_in, conf).frames_size, SEEK_CUR)
+
+        if conf.game in (G.CROC_2_PS1, G.CROC_2_DEMO_PS1):
+            n_dpsx_legacy_textures = int.from_bytes(data_in.read(4), "little")
+            data_in.seek(n_dpsx_legacy_textures * 3072, SEEK_CUR)
+
+        n_scripts = int.from_bytes(data_in.read(4), "little")
+        for _ in range(n_scripts):
+            data_in.seek(4 * int.from_bytes(data_in.read(4), "little"), SEEK_CUR)
+
+        return {
+            "n_models": n_models_3d,
+            "n_animations": n_animations,
+            "n_filled_chunks": LevelFile.scan(data_in, conf),
+        }
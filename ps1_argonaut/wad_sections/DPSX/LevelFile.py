@@ -1,20 +1,89 @@
 from io import BufferedIOBase, SEEK_CUR
 
+import numpy as np
+
 from ps1_argonaut.BaseDataClasses import BaseDataClass
 from ps1_argonaut.configuration import Configuration, G
-from ps1_argonaut.wad_sections.DPSX.ChunkClasses import (
-    ChunkHolder,
-    ChunkRotation,
-    ChunksMatrix,
-    SubChunk,
-)
+from ps1_argonaut.errors_warnings import SubChunksListError
+from ps1_argonaut.wad_sections.DPSX.ChunkClasses import ChunksMatrix
+from ps1_argonaut.wad_sections.DPSX.LevelLighting import LevelLighting
 from ps1_argonaut.wad_sections.DPSX.Model3DData import LevelGeom3DData
 from ps1_argonaut.wad_sections.DPSX.Model3DHeader import Model3DHeader
 
+sub_chunk_transform_dtype = np.dtype(
+    [
+        ("rotation", ">u4"),
+        ("padding1", "<u4"),
+        ("x", "<u4"),
+        ("y", "<u4"),
+        ("z", "<u4"),
+        ("padding2", "<u4"),
+    ]
+)
+
+# See doc about actor instances headers
+actor_instance_dtype = np.dtype(
+    [
+        # EXPERIMENTAL: Hypothesis, the first unknown bytes seem to be the instance's coordinates
+        ("position", "<i4", (3,)),
+        ("idk1", "V12"),
+        ("actor_offset", "<u4"),  # Starts at the beginning of DPSX
+        ("idk2", "V32"),
+        ("sound_level", "<u4"),
+    ]
+)
+
 
 class LevelFile(BaseDataClass):
-    def __init__(self, chunks_matrix: ChunksMatrix):
+    def __init__(
+        self,
+        chunks_matrix: ChunksMatrix,
+        lighting: LevelLighting = None,
+        actors_instances: np.ndarray = None,
+    ):
+        """actors_instances is a structured array, see actor_instance_dtype."""
         self.chunks_matrix = chunks_matrix
+        self.lighting = lighting
+        self.actors_instances = (
+            actors_instances
+            if actors_instances is not None
+            else np.empty(0, dtype=actor_instance_dtype)
+        )
+
+    @property
+    def n_actors_instances(self):
+        return len(self.actors_instances)
+
+    @classmethod
+    def scan(cls, data_in: BufferedIOBase, conf: Configuration):
+        """Only reads the level header & the chunks lists heads, returns the number of filled chunks (see parse)."""
+        n_chunk_models = int.from_bytes(data_in.read(4), "little")
+        chunk_models_headers = [
+            Model3DHeader.parse(data_in, conf) for _ in range(n_chunk_models)
+        ]
+        data_in.seek(
+            sum(
+                LevelGeom3DData.data_size(header, conf, True)
+                for header in chunk_models_headers
+            ),
+            SEEK_CUR,
+        )
+        if conf.game != G.CROC_2_DEMO_PS1_DUMMY:
+            data_in.seek(8, SEEK_CUR)
+        data_in.seek(4, SEEK_CUR)  # Sub-chunks count
+        n_idk1 = int.from_bytes(data_in.read(4), "little")
+        # Sub-chunks count again, actors instances count & padding
+        data_in.seek(
+            4 * n_idk1 + (12 if conf.game != G.CROC_2_DEMO_PS1_DUMMY else 8), SEEK_CUR
+        )
+        n_total_chunks = int.from_bytes(data_in.read(4), "little")
+        # Chunk columns & rows counts, lighting counts, idk4 count & unknown data
+        data_in.seek(136 if conf.game != G.CROC_2_DEMO_PS1_DUMMY else 92, SEEK_CUR)
+        chunks_info_offsets = np.frombuffer(
+            data_in.read(4 * n_total_chunks), dtype="<u4"
+        )
+        # Empty chunks have no linked list
+        return int(np.count_nonzero(chunks_info_offsets != 0xFFFFFFFF))
 
     @classmethod
     def parse(cls, data_in: BufferedIOBase, conf: Configuration, *args, **kwargs):
@@ -48,34 +117,37 @@ class LevelFile(BaseDataClass):
         n_idk4 = int.from_bytes(data_in.read(4), "little")
         data_in.seek(116 if conf.game != G.CROC_2_DEMO_PS1_DUMMY else 80, SEEK_CUR)
 
-        _chunks_matrix: list[list[int] | int | None] = [
-            int.from_bytes(data_in.read(4), "little") for _ in range(n_total_chunks)
-        ]
-        _sub_chunks_height = {}
-        chunks_info_start_offset = data_in.tell()
-
-        def parse_chunks_info(offset: int, chunks_ids_list: list[int]):
-            data_in.seek(chunks_info_start_offset + offset)
-            chunks_ids_list.append(int.from_bytes(data_in.read(4), "little"))
-            linked_chunk_offset = int.from_bytes(data_in.read(4), "little")
-            if linked_chunk_offset != 0xFFFFFFFF:
-                return parse_chunks_info(linked_chunk_offset, chunks_ids_list)
-            else:
-                return chunks_ids_list
-
-        for i in range(n_chunk_rows):
-            for j in range(n_chunk_columns):
-                index = i * n_chunk_columns + j
-                chunk_info_offset = _chunks_matrix[index]
-                if chunk_info_offset != 0xFFFFFFFF:
-                    sub_chunk_ids = parse_chunks_info(chunk_info_offset, [])
-                    _chunks_matrix[index] = sub_chunk_ids
-                    for sub_chunk_id in sub_chunk_ids:
-                        _sub_chunks_height[sub_chunk_id] = (i, j)
-                else:
-                    _chunks_matrix[index] = None
+        chunks_info_offsets = np.frombuffer(
+            data_in.read(4 * n_total_chunks), dtype="<u4"
+        )
+        # Linked lists nodes (sub-chunk id, next node offset), offsets are relative to the table's start
+        chunks_info_start = data_in.tell()
+        chunks_info = np.frombuffer(
+            data_in.read(8 * n_sub_chunks), dtype="<u4"
+        ).reshape((n_sub_chunks, 2))
+
+        sub_chunks_offsets = np.zeros(n_total_chunks + 1, dtype=np.int32)
+        sub_chunks_ids = np.empty(n_sub_chunks, dtype=np.int32)
+        nodes_ids = chunks_info[:, 0].tolist()
+        nodes_next_offsets = chunks_info[:, 1].tolist()
+        n_resolved = 0
+        for chunk_id, chunk_info_offset in enumerate(chunks_info_offsets.tolist()):
+            while chunk_info_offset != 0xFFFFFFFF:
+                node_index = chunk_info_offset // 8
+                # Cyclic or overlong lists would hold more than the level's sub-chunks
+                if n_resolved == n_sub_chunks or node_index >= n_sub_chunks:
+                    raise SubChunksListError(chunks_info_start, n_sub_chunks)
+                sub_chunks_ids[n_resolved] = nodes_ids[node_index]
+                chunk_info_offset = nodes_next_offsets[node_index]
+                n_resolved += 1
+            sub_chunks_offsets[chunk_id + 1] = n_resolved
+        if n_resolved != n_sub_chunks:
+            raise SubChunksListError(chunks_info_start, n_sub_chunks)
+        chunks_ids_by_sub_chunk_id = np.empty(n_sub_chunks, dtype=np.int64)
+        chunks_ids_by_sub_chunk_id[sub_chunks_ids] = np.repeat(
+            np.arange(n_total_chunks), np.diff(sub_chunks_offsets)
+        )
 
-        data_in.seek(chunks_info_start_offset + 8 * n_sub_chunks)
         if conf.game != G.CROC_2_DEMO_PS1_DUMMY:
             header256bytes = data_in.read(256)
             n_zone_ids = int.from_bytes(data_in.read(4), "little")
@@ -93,21 +165,22 @@ class LevelFile(BaseDataClass):
             zone_ids = None
             fvw_data = None
 
-        _sub_chunks_rotation = {}
-        for i in range(n_sub_chunks):
-            rotation = int.from_bytes(data_in.read(4), "big")
-            assert rotation in (0, 4, 8, 12)
-            _sub_chunks_rotation[i] = ChunkRotation(rotation)
-            assert data_in.read(4) == b"\x00\x00\x00\x00"
-            x = int.from_bytes(data_in.read(4), "little")
-            y = int.from_bytes(data_in.read(4), "little")
-            z = int.from_bytes(data_in.read(4), "little")
-            assert data_in.read(4) == b"\x00\x00\x00\x00"
-            assert (
-                x == 2048 + 4096 * _sub_chunks_height[i][1]
-            )  # Chunks are 4096-large, so +2048 for the chunk's center
-            assert z == 2048 + 4096 * _sub_chunks_height[i][0]
-            _sub_chunks_height[i] = y
+        sub_chunks_transforms = np.frombuffer(
+            data_in.read(sub_chunk_transform_dtype.itemsize * n_sub_chunks),
+            dtype=sub_chunk_transform_dtype,
+        )
+        assert np.isin(sub_chunks_transforms["rotation"], (0, 4, 8, 12)).all()
+        assert not sub_chunks_transforms["padding1"].any()
+        assert not sub_chunks_transforms["padding2"].any()
+        # Chunks are 4096-large, so +2048 for the chunk's center
+        assert (
+            sub_chunks_transforms["x"]
+            == 2048 + 4096 * (chunks_ids_by_sub_chunk_id % n_chunk_columns)
+        ).all()
+        assert (
+            sub_chunks_transforms["z"]
+            == 2048 + 4096 * (chunks_ids_by_sub_chunk_id // n_chunk_columns)
+        ).all()
         chunks_models_mapping = [
             int.from_bytes(data_in.read(4), "little") for _ in range(n_sub_chunks)
         ]
@@ -117,11 +190,10 @@ class LevelFile(BaseDataClass):
 
         idk_4 = [data_in.read(36) for _ in range(n_idk4)]
 
-        for i in range(n_actors_instances):
-            data_in.seek(24, SEEK_CUR)
-            actor_offset = int.from_bytes(data_in.read(4), "little")
-            data_in.seek(32, SEEK_CUR)
-            actor_sound_level = int.from_bytes(data_in.read(4), "little")
+        actors_instances = np.frombuffer(
+            data_in.read(actor_instance_dtype.itemsize * n_actors_instances),
+            dtype=actor_instance_dtype,
+        )
 
         if conf.game not in (G.CROC_2_DEMO_PS1, G.CROC_2_DEMO_PS1_DUMMY):
             add_models_mapping = []
@@ -140,24 +212,23 @@ class LevelFile(BaseDataClass):
             data_in.seek(32 * n_sub_chunks, SEEK_CUR)
             data_in.seek(32 if conf.game == G.CROC_2_DEMO_PS1 else 92, SEEK_CUR)
 
+        lighting = None
         if conf.game == G.CROC_2_PS1:
             data_in.seek(30732, SEEK_CUR)
         elif conf.game != G.CROC_2_DEMO_PS1_DUMMY and n_sub_chunks != 0:
-            sub_chunks_n_lighting = [
-                int.from_bytes(data_in.read(4), "little") for _ in range(n_sub_chunks)
-            ]
-            sub_chunks_n_add_lighting = [
-                int.from_bytes(data_in.read(4), "little")
-                for _ in range(n_add_sub_chunks_lighting)
-            ]
-            for model_id in range(n_sub_chunks):
-                for i in range(sub_chunks_n_lighting[model_id]):
-                    size = 4 * chunk_models[chunks_models_mapping[model_id]].n_vertices
-                    data_in.seek(size, SEEK_CUR)
-            for model_id in range(n_add_sub_chunks_lighting):
-                for i in range(sub_chunks_n_add_lighting[model_id]):
-                    size = 4 * chunk_models[add_models_mapping[model_id]].n_vertices
-                    data_in.seek(size, SEEK_CUR)
+            models_n_vertices = np.array(
+                [chunk_model.n_vertices for chunk_model in chunk_models], dtype=np.int64
+            )
+            lighting = LevelLighting.parse(
+                data_in,
+                conf,
+                sub_chunks_n_vertices=models_n_vertices[chunks_models_mapping],
+                add_sub_chunks_n_vertices=(
+                    models_n_vertices[add_models_mapping]
+                    if add_models_mapping is not None
+                    else np.zeros(n_add_sub_chunks_lighting, dtype=np.int64)
+                ),
+            )
             if conf.game != G.CROC_2_DEMO_PS1:  # Not present in Croc 2 Demo Dummy
                 idk_size = int.from_bytes(data_in.read(4), "little")
                 if idk_size != 0:
@@ -172,40 +243,24 @@ class LevelFile(BaseDataClass):
                 ]
             data_in.seek(12, SEEK_CUR)
 
-        chunks_holders = []
-        for i in range(n_total_chunks):
-            if _chunks_matrix[i] is not None:
-                sub_chunks = [
-                    SubChunk(
-                        chunk_models[chunks_models_mapping[sub_chunk_id]],
-                        _sub_chunks_height[sub_chunk_id],
-                        _sub_chunks_rotation[sub_chunk_id],
-                    )
-                    for sub_chunk_id in _chunks_matrix[i]
-                ]
-                if conf.game != G.CROC_2_DEMO_PS1_DUMMY:
-                    chunks_holders.append(
-                        ChunkHolder(
-                            sub_chunks, zone_ids[i], fvw_data[i] if fvw_data else None
-                        )
-                    )
-                else:
-                    chunks_holders.append(ChunkHolder(sub_chunks))
-            else:
-                chunks_holders.append(
-                    ChunkHolder(
-                        zone_id=zone_ids[i], fvw_data=fvw_data[i] if fvw_data else None
-                    )
-                    if conf.game != G.CROC_2_DEMO_PS1_DUMMY
-                    else ChunkHolder()
-                )
-
+        chunks_models_mapping = np.array(chunks_models_mapping, dtype=np.int32)
         return cls(
             ChunksMatrix(
-                chunks_holders,
                 chunk_models,
                 n_chunk_rows,
                 n_chunk_columns,
-                zone_ids is not None,
-            )
+                sub_chunks_offsets,
+                sub_chunks_ids,
+                chunks_models_mapping[sub_chunks_ids],
+                sub_chunks_transforms["y"][sub_chunks_ids],
+                sub_chunks_transforms["rotation"][sub_chunks_ids],
+                np.array(zone_ids) if zone_ids is not None else None,
+                (
+                    np.frombuffer(b"".join(fvw_data), dtype="<u2")
+                    if fvw_data is not None
+                    else None
+                ),
+            ),
+            lighting,
+            actors_instances,
         )
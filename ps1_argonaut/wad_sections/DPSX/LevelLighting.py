@@ -0,0 +1,107 @@
+from io import SEEK_CUR, BufferedIOBase, BytesIO
+
+import numpy as np
+
+from ps1_argonaut.BaseDataClasses import BaseDataClass
+from ps1_argonaut.configuration import Configuration
+
+
+class LevelLighting(BaseDataClass):
+    """Per-vertex lighting of the level's sub-chunks. Each sub-chunk (and each additional sub-chunk) has a number of
+    lighting blocks, made of 4 bytes per vertex of its 3D model. They are kept raw (as a view of the parsed
+    data, unless in low memory mode) and decoded on demand."""
+
+    def __init__(
+        self,
+        data: bytes | memoryview,
+        blocks_offsets: np.ndarray,
+        sub_chunks_blocks: np.ndarray,
+        add_sub_chunks_blocks: np.ndarray,
+    ):
+        """Block i is data[blocks_offsets[i]:blocks_offsets[i + 1]]. The blocks of sub-chunk i are the blocks
+        sub_chunks_blocks[i] to sub_chunks_blocks[i + 1] (excluded), likewise for the additional sub-chunks."""
+        self.data = data
+        self.blocks_offsets = blocks_offsets
+        self.sub_chunks_blocks = sub_chunks_blocks
+        self.add_sub_chunks_blocks = add_sub_chunks_blocks
+
+    @staticmethod
+    def _blocks_table(n_lighting: np.ndarray, n_vertices: np.ndarray):
+        blocks = np.zeros(len(n_lighting) + 1, dtype=np.int64)
+        np.cumsum(n_lighting, out=blocks[1:])
+        return blocks, np.repeat(4 * n_vertices, n_lighting)
+
+    @classmethod
+    def parse(
+        cls,
+        data_in: BufferedIOBase,
+        conf: Configuration,
+        *args,
+        sub_chunks_n_vertices: np.ndarray = None,
+        add_sub_chunks_n_vertices: np.ndarray = None,
+        **kwargs
+    ):
+        """sub_chunks_n_vertices & add_sub_chunks_n_vertices are the vertices counts of each (additional) sub-chunk's
+        3D model."""
+        super().parse(data_in, conf)
+        sub_chunks_n_lighting = np.frombuffer(
+            data_in.read(4 * len(sub_chunks_n_vertices)), dtype="<u4"
+        ).astype(np.int64)
+        add_sub_chunks_n_lighting = np.frombuffer(
+            data_in.read(4 * len(add_sub_chunks_n_vertices)), dtype="<u4"
+        ).astype(np.int64)
+
+        sub_chunks_blocks, sub_chunks_sizes = cls._blocks_table(
+            sub_chunks_n_lighting, sub_chunks_n_vertices
+        )
+        add_sub_chunks_blocks, add_sub_chunks_sizes = cls._blocks_table(
+            add_sub_chunks_n_lighting, add_sub_chunks_n_vertices
+        )
+        blocks_offsets = np.zeros(
+            len(sub_chunks_sizes) + len(add_sub_chunks_sizes) + 1, dtype=np.int64
+        )
+        np.cumsum(
+            np.concatenate((sub_chunks_sizes, add_sub_chunks_sizes)),
+            out=blocks_offsets[1:],
+        )
+        size = int(blocks_offsets[-1])
+        if isinstance(data_in, BytesIO) and not conf.low_memory:
+            # No copy: the blocks are a view of the parsed data (getvalue returns the BytesIO's initial bytes)
+            offset = data_in.tell()
+            data = memoryview(data_in.getvalue())[offset : offset + size]
+            data_in.seek(size, SEEK_CUR)
+        else:
+            # Only the lighting region is kept, not the whole parsed data
+            data = data_in.read(size)
+        return cls(
+            data,
+            blocks_offsets,
+            sub_chunks_blocks,
+            add_sub_chunks_blocks + sub_chunks_blocks[-1],
+        )
+
+    @property
+    def n_blocks(self):
+        return len(self.blocks_offsets) - 1
+
+    def n_lighting(self, sub_chunk_id: int, additional=False):
+        blocks = self.add_sub_chunks_blocks if additional else self.sub_chunks_blocks
+        return int(blocks[sub_chunk_id + 1] - blocks[sub_chunk_id])
+
+    def block_colors(self, block_id: int) -> np.ndarray:
+        """Decodes a lighting block as a (n_vertices, 4) uint8 array."""
+        return np.frombuffer(
+            self.data,
+            dtype=np.uint8,
+            count=int(
+                self.blocks_offsets[block_id + 1] - self.blocks_offsets[block_id]
+            ),
+            offset=int(self.blocks_offsets[block_id]),
+        ).reshape((-1, 4))
+
+    def colors(self, sub_chunk_id: int, lighting_id=0, additional=False):
+        """Per-vertex colors of the given lighting of a sub-chunk (or an additional sub-chunk), None if unlit."""
+        if lighting_id >= self.n_lighting(sub_chunk_id, additional):
+            return None
+        blocks = self.add_sub_chunks_blocks if additional else self.sub_chunks_blocks
+        return self.block_colors(int(blocks[sub_chunk_id]) + lighting_id)
@@ -0,0 +1,278 @@
+from collections.abc import Iterable
+from io import StringIO
+from typing import TextIO
+
+import numpy as np
+
+from ps1_argonaut.GLTFBuilder import GLTFBuilder
+from ps1_argonaut.wad_sections.DPSX.ChunkClasses import ChunksMatrix
+from ps1_argonaut.wad_sections.DPSX.LevelLighting import LevelLighting
+from ps1_argonaut.wad_sections.DPSX.Model3DData import BaseModel3DData
+from ps1_argonaut.wad_sections.TPSX.TextureData import TextureData
+
+# Vertex (row) x matrix, indexed by ChunkRotation // 4, same transforms as in OBJ level exports
+rotations_matrices = np.array(
+    [
+        [[1, 0, 0], [0, 1, 0], [0, 0, 1]],  # TOP
+        [[0, 0, -1], [0, 1, 0], [1, 0, 0]],  # RIGHT
+        [[-1, 0, 0], [0, 1, 0], [0, 0, -1]],  # BOTTOM
+        [[0, 0, 1], [0, 1, 0], [-1, 0, 0]],  # LEFT
+    ],
+    dtype=np.int64,
+)
+
+
+class LevelMesh:
+    """A level's geometry batched into a few flat arrays: the placed vertices of all the exported sub-chunks,
+    then their triangles (vertex indexes) and the matching texture coordinates indexes (see
+    BaseModel3DData.textures_coords)."""
+
+    # Decimation grids of the level-of-detail levels (see clustered), from the finest to the coarsest
+    lods_cells_sizes = (256, 1024)
+
+    def __init__(
+        self,
+        vertices: np.ndarray,
+        triangles: np.ndarray,
+        triangles_uvs_ids: np.ndarray,
+        vertices_sub_chunks: np.ndarray,
+        colors: np.ndarray = None,
+    ):
+        """vertices_sub_chunks gives the chunks matrix flat sub-chunk index of each vertex. colors are the raw
+        per-vertex lighting colors, as a (n_vertices, 4) uint8 array."""
+        self.vertices = vertices
+        self.triangles = triangles
+        self.triangles_uvs_ids = triangles_uvs_ids
+        self.vertices_sub_chunks = vertices_sub_chunks
+        self.colors = colors
+
+    @property
+    def n_vertices(self):
+        return len(self.vertices)
+
+    @property
+    def n_triangles(self):
+        return len(self.triangles)
+
+    @staticmethod
+    def _model_arrays(model_3d_data: BaseModel3DData):
+        vertices = (
+            np.concatenate(model_3d_data.vertices).astype(np.int64)
+            if model_3d_data.vertices
+            else np.empty((0, 3), dtype=np.int64)
+        )
+        return (vertices, *model_3d_data.triangulated_corners())
+
+    @classmethod
+    def from_chunks_matrix(
+        cls,
+        chunks_matrix: ChunksMatrix,
+        sub_chunks: Iterable[int] = None,
+        lighting: LevelLighting = None,
+        lighting_id=0,
+    ):
+        """Places the given sub-chunks (flat indexes, all of them by default) of the chunks matrix. If lighting is
+        given, the vertices of sub-chunks without this lighting are colored in neutral grey (128)."""
+        sub_chunks = (
+            np.arange(chunks_matrix.n_sub_chunks)
+            if sub_chunks is None
+            else np.asarray(sub_chunks, dtype=np.int64)
+        )
+        models_ids = chunks_matrix.sub_chunks_models_ids[sub_chunks]
+        # Each model is flattened once, however many sub-chunks use it
+        models_arrays = {
+            model_id: cls._model_arrays(chunks_matrix.chunks_models[model_id])
+            for model_id in np.unique(models_ids).tolist()
+        }
+        models_ids = models_ids.tolist()
+        n_vertices = np.array(
+            [len(models_arrays[model_id][0]) for model_id in models_ids],
+            dtype=np.int64,
+        )
+        n_triangles = np.array(
+            [len(models_arrays[model_id][1]) for model_id in models_ids],
+            dtype=np.int64,
+        )
+
+        vertices_sub_chunks = np.repeat(sub_chunks, n_vertices)
+        chunks_ids = chunks_matrix.sub_chunks_chunk_ids[vertices_sub_chunks]
+        # Chunks are 4096-large, so +2048 is needed to point to the chunk's center
+        translations = np.stack(
+            (
+                4096 * (chunks_ids % chunks_matrix.n_columns) + 2048,
+                chunks_matrix.sub_chunks_heights[vertices_sub_chunks],
+                4096 * (chunks_ids // chunks_matrix.n_columns) + 2048,
+            ),
+            axis=1,
+        )
+        rotations = rotations_matrices[
+            chunks_matrix.sub_chunks_rotations[vertices_sub_chunks] // 4
+        ]
+        vertices = (
+            np.einsum(
+                "nj,njk->nk",
+                np.concatenate(
+                    [models_arrays[model_id][0] for model_id in models_ids]
+                    or [np.empty((0, 3), dtype=np.int64)]
+                ),
+                rotations,
+            )
+            + translations
+        )
+
+        vertices_offsets = np.cumsum(n_vertices) - n_vertices
+        triangles = (
+            np.concatenate(
+                [models_arrays[model_id][1] for model_id in models_ids]
+                or [np.empty((0, 3), dtype=np.intp)]
+            )
+            + np.repeat(vertices_offsets, n_triangles)[:, None]
+        )
+        triangles_uvs_ids = np.concatenate(
+            [models_arrays[model_id][2] for model_id in models_ids]
+            or [np.empty((0, 3), dtype=np.intp)]
+        )
+
+        colors = None
+        if lighting is not None:
+            colors = np.full((len(vertices), 4), 128, dtype=np.uint8)
+            sub_chunks_ids = chunks_matrix.sub_chunks_ids[sub_chunks].tolist()
+            for sub_chunk_id, start, n in zip(
+                sub_chunks_ids, vertices_offsets.tolist(), n_vertices.tolist()
+            ):
+                sub_chunk_colors = lighting.colors(sub_chunk_id, lighting_id)
+                if sub_chunk_colors is not None and len(sub_chunk_colors) == n:
+                    colors[start : start + n] = sub_chunk_colors
+        return cls(vertices, triangles, triangles_uvs_ids, vertices_sub_chunks, colors)
+
+    def _merged(self, clusters_ids: np.ndarray, vertices: np.ndarray = None):
+        """Copy of this mesh where the vertices of each cluster are merged (into the given vertices, or their average
+        by default), and the triangles that collapse are dropped."""
+        n_clusters = int(clusters_ids.max()) + 1 if len(clusters_ids) else 0
+        counts = np.bincount(clusters_ids, minlength=n_clusters)[:, None]
+
+        def average(values: np.ndarray):
+            return (
+                np.stack(
+                    [
+                        np.bincount(clusters_ids, values[:, k], minlength=n_clusters)
+                        for k in range(values.shape[1])
+                    ],
+                    axis=1,
+                )
+                / counts
+            )
+
+        triangles = clusters_ids[self.triangles]
+        kept = (
+            (triangles[:, 0] != triangles[:, 1])
+            & (triangles[:, 1] != triangles[:, 2])
+            & (triangles[:, 0] != triangles[:, 2])
+        )
+        vertices_sub_chunks = np.empty(n_clusters, dtype=self.vertices_sub_chunks.dtype)
+        vertices_sub_chunks[clusters_ids] = self.vertices_sub_chunks
+        return LevelMesh(
+            average(self.vertices) if vertices is None else vertices,
+            triangles[kept],
+            self.triangles_uvs_ids[kept],
+            vertices_sub_chunks,
+            (
+                np.rint(average(self.colors)).astype(np.uint8)
+                if self.colors is not None
+                else None
+            ),
+        )
+
+    def clustered(self, cell_size: int):
+        """Decimated copy of this mesh, where the vertices of each cell of a cell_size-large grid are merged into their
+        average. Cell sizes dividing 4096 keep the grid aligned to the chunks, so each chunk is simplified
+        independently. A cell size of 1 only welds duplicate vertices."""
+        clusters_ids = np.unique(
+            np.floor_divide(self.vertices, cell_size).astype(np.int64),
+            axis=0,
+            return_inverse=True,
+        )[1].reshape(-1)
+        return self._merged(clusters_ids)
+
+    def welded(self, precision: int = 1):
+        """Compact indexed copy of this mesh: placed vertices are snapped to a precision-large grid, then the
+        duplicates (like the shared edges of adjacent sub-chunks) are merged."""
+        vertices, clusters_ids = np.unique(
+            np.rint(self.vertices / precision).astype(np.int64),
+            axis=0,
+            return_inverse=True,
+        )
+        return self._merged(clusters_ids.reshape(-1), vertices * precision)
+
+    def to_obj(self, obj: StringIO | TextIO, name: str):
+        """Appends the mesh to a Wavefront OBJ file as a single object, whose faces refer to the texture coordinates
+        written by level exports (see BaseModel3DData.textures_coords)."""
+        obj.write(f"o {name}\n")
+        # / 1024: Same scale as in other OBJ exports
+        np.savetxt(obj, self.vertices / 1024, fmt="v %.10g %.10g %.10g")
+        faces = np.empty((self.n_triangles, 6), dtype=np.int64)
+        faces[:, ::2] = self.triangles + 1
+        faces[:, 1::2] = self.triangles_uvs_ids + 1
+        np.savetxt(obj, faces, fmt="f %d/%d %d/%d %d/%d")
+
+    def add_gltf_mesh(
+        self,
+        gltf: GLTFBuilder,
+        textures: Iterable[TextureData],
+        material: int,
+        name: str,
+    ):
+        """Adds the level to a glTF model as a single mesh, with vertices split by triangle corner (corners sharing a
+        vertex may not share their texture coordinates), and returns the mesh's index (None if it's empty).
+        Lighting colors are doubled, as on PS1 128 is the neutral intensity."""
+        corners = self.triangles.flatten()
+        return gltf.add_mesh(
+            name,
+            # / 1024: Same scale as OBJ exports
+            self.vertices[corners] / 1024,
+            uvs=BaseModel3DData.corners_uvs(textures, self.triangles_uvs_ids),
+            colors=(
+                np.minimum(self.colors[corners, :3].astype(np.uint16) * 2, 255)
+                if self.colors is not None
+                else None
+            ),
+            material=material,
+        )
+
+    def add_gltf_lods(
+        self,
+        gltf: GLTFBuilder,
+        textures: Iterable[TextureData],
+        material: int,
+        name: str,
+        cells_sizes: Iterable[int] = None,
+    ):
+        """Adds the welded level and its decimated versions (see clustered) to a glTF model, as one node using the
+        MSFT_lod extension. The coarsest levels of detail are written first, so that viewers can stream them first.
+        Returns the root node's index."""
+        cells_sizes = list(
+            self.lods_cells_sizes if cells_sizes is None else cells_sizes
+        )
+        lods_meshes = [
+            self.clustered(cell_size).add_gltf_mesh(
+                gltf, textures, material, f"{name}_LOD{i + 1}"
+            )
+            for i, cell_size in reversed(list(enumerate(cells_sizes)))
+        ][::-1]
+        lods_nodes = [
+            gltf.add_node(f"{name}_LOD{i + 1}", mesh, root=False)
+            for i, mesh in enumerate(lods_meshes)
+            if mesh is not None
+        ]
+        if lods_nodes:
+            gltf.use_extension("MSFT_lod")
+        return gltf.add_node(
+            name,
+            self.clustered(1).add_gltf_mesh(gltf, textures, material, name),
+            extensions={"MSFT_lod": {"ids": lods_nodes}} if lods_nodes else None,
+            # Minimum screen coverage of each level of detail
+            extras={
+                "MSFT_screencoverage": [0.5 ** (i + 1) for i in range(len(lods_nodes))]
+                + [0]
+            },
+        )
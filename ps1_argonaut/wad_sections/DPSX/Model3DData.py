@@ -6,6 +6,8 @@ import numpy as np
 
 from ps1_argonaut.BaseDataClasses import BaseDataClass
 from ps1_argonaut.configuration import Configuration, G, wavefront_header
+from ps1_argonaut.ContentStore import ContentStore
+from ps1_argonaut.GLTFBuilder import GLTFBuilder
 from ps1_argonaut.errors_warnings import (
     IncompatibleAnimationError,
     NegativeIndexError,
@@ -58,6 +60,19 @@ class BaseModel3DData(BaseDataClass):
     def n_bounding_box_info(self):
         return self.header.n_bounding_box_info
 
+    @property
+    def digest(self):
+        """Content hash of this model's geometry (vertices, normals & faces)."""
+        return ContentStore.digest(
+            np.array((len(self.vertices), len(self.normals)), dtype=np.uint32),
+            *self.vertices,
+            *self.normals,
+            self.quads,
+            self.tris,
+            self.faces_normals,
+            np.array(self.faces_texture_ids, dtype=np.uint16),
+        )
+
     @classmethod
     def parse(cls, data_in: BufferedIOBase, conf: Configuration, *args, **kwargs):
         super().parse(data_in, conf)
@@ -184,11 +199,9 @@ class BaseModel3DData(BaseDataClass):
         tris = np.array(tris, dtype=np.uint16)
         faces_normals = np.array(faces_normals, dtype=np.int16)
 
-        if conf.game in (G.CROC_2_PS1, G.CROC_2_DEMO_PS1, G.CROC_2_DEMO_PS1_DUMMY):
-            bounding_box_info_size = 44
-        else:  # Harry Potter 1 & 2
-            bounding_box_info_size = 32
-        data_in.seek(header.n_bounding_box_info * bounding_box_info_size, SEEK_CUR)
+        data_in.seek(
+            header.n_bounding_box_info * cls.bounding_box_info_size(conf), SEEK_CUR
+        )
         return cls(
             header,
             is_world_model_3d,
@@ -201,25 +214,77 @@ class BaseModel3DData(BaseDataClass):
             n_vertices_groups,
         )
 
-    def animate(self, animation: AnimationData, frame_id: int = 0):
-        """Returns vertices and vertices normals of this model after application of an animation frame's
-        rotation & translation information. The model is **not** modified."""
+    @staticmethod
+    def bounding_box_info_size(conf: Configuration):
+        if conf.game in (G.CROC_2_PS1, G.CROC_2_DEMO_PS1, G.CROC_2_DEMO_PS1_DUMMY):
+            return 44
+        return 32  # Harry Potter 1 & 2
+
+    @classmethod
+    def data_size(
+        cls, header: Model3DHeader, conf: Configuration, is_world_model_3d: bool
+    ):
+        """Size of the 3D model data that follows its header (see parse), used to skip it without parsing it."""
+        has_normals = not (
+            is_world_model_3d
+            and conf.game in (G.HARRY_POTTER_1_PS1, G.HARRY_POTTER_2_PS1)
+        )
+        face_size = (
+            cls.face_size
+            if conf.game == G.CROC_2_DEMO_PS1_DUMMY or not is_world_model_3d
+            else cls.chunk_face_size
+        )
+        return (
+            (2 if has_normals else 1) * cls.vertex_size * header.n_vertices
+            + face_size * header.n_faces
+            + cls.bounding_box_info_size(conf) * header.n_bounding_box_info
+        )
+
+    @staticmethod
+    def groups_ids(groups: list[np.ndarray]):
+        """Group id of each vertex (or vertex normal) of the concatenated groups."""
+        return np.repeat(
+            np.arange(len(groups)), [len(group) for group in groups]
+        ).astype(np.intp)
+
+    def animate_all(self, animation: AnimationData, frame_ids: Iterable[int] = None):
+        """Returns vertices and vertices normals of this model after application of all the frames (or of the given
+        frames) of an animation, as two (frames, n_vertices, 3) arrays. The model is **not** modified."""
         if self.n_vertices_groups != animation.n_vertices_groups:
             raise IncompatibleAnimationError(
                 self.n_vertices_groups, animation.n_vertices_groups
             )
-        vertices: list[np.ndarray] = []
-        normals: list[np.ndarray] = []
-        for i in range(self.n_vertices_groups):
-            rotation = animation[frame_id][i][:, 0:3]
-            translation = animation[frame_id][i][:, 3]
-            vertices.append(np.add(self.vertices[i].dot(rotation), translation))
-            normals.append(np.add(self.normals[i].dot(rotation), translation))
+        transforms = animation.transforms(frame_ids)
+
+        def apply(groups: list[np.ndarray]):
+            if not groups:
+                return np.empty((len(transforms), 0, 3))
+            # Per-vertex transforms, gathered from the per-group ones
+            vertices_transforms = transforms[:, self.groups_ids(groups)]
+            return (
+                np.einsum(
+                    "nj,fnjk->fnk",
+                    np.concatenate(groups),
+                    vertices_transforms[..., :3],
+                )
+                + vertices_transforms[..., 3]
+            )
+
+        return apply(self.vertices), apply(self.normals)
+
+    def animate(self, animation: AnimationData, frame_id: int = 0):
+        """Returns vertices and vertices normals of this model after application of an animation frame's
+        rotation & translation information. The model is **not** modified."""
+        vertices, normals = self.animate_all(animation, (frame_id,))
+
+        def split(groups: list[np.ndarray], animated: np.ndarray):
+            return np.split(animated, np.cumsum([len(g) for g in groups])[:-1])
+
         return Model3DData(
             self.header,
             self.is_world_model_3d,
-            vertices,
-            normals,
+            split(self.vertices, vertices[0]),
+            split(self.normals, normals[0]) if self.normals else [],
             self.quads,
             self.tris,
             self.faces_normals,
@@ -227,6 +292,81 @@ class BaseModel3DData(BaseDataClass):
             self.n_vertices_groups,
         )
 
+    @staticmethod
+    def textures_coords(textures: Iterable[TextureData]):
+        """Output coordinates of all textures (1024x1024 space), as a (4 * n_textures, 2) array.
+        Like in OBJ exports, coordinate 4 * texture_id + i is the i-th coordinate of this texture."""
+        return np.array(
+            [texture.output_coords for texture in textures], dtype=np.float64
+        ).reshape((-1, 2))
+
+    @classmethod
+    def corners_uvs(cls, textures: Iterable[TextureData], uvs_ids: np.ndarray):
+        """glTF texture coordinates of the given texture coordinates indexes (see triangulated_corners), None if
+        there is no texture."""
+        textures_coords = cls.textures_coords(textures)
+        if not len(textures_coords):
+            return None
+        return (
+            textures_coords[np.minimum(uvs_ids.flatten(), len(textures_coords) - 1)]
+            / 1024
+        )
+
+    def triangulated_corners(self):
+        """Vertex index and texture coordinate index (see textures_coords) of each triangle corner, as two
+        (n_triangles, 3) arrays. Quads are split in two triangles, vertices are in the same order as in OBJ exports.
+        """
+        quads = self.quads.astype(np.intp).reshape((-1, 4))
+        tris = self.tris.astype(np.intp).reshape((-1, 3))
+        texture_ids = np.asarray(self.faces_texture_ids, dtype=np.intp)
+        n_q = len(quads)
+
+        # Quads' (and tris') corners order, as written in OBJ faces
+        quads_order = [1, 0, 2, 3]
+        tris_order = [1, 0, 2]
+        quads_corners = quads[:, quads_order]
+        quads_uvs = 4 * texture_ids[:n_q, None] + quads_order
+        # (a, b, c, d) polygon -> (a, b, c) & (a, c, d) triangles
+        split = [0, 1, 2, 0, 2, 3]
+        corners = np.concatenate(
+            (quads_corners[:, split].reshape((-1, 3)), tris[:, tris_order])
+        )
+        uvs = np.concatenate(
+            (
+                quads_uvs[:, split].reshape((-1, 3)),
+                4 * texture_ids[n_q : n_q + len(tris), None] + tris_order,
+            )
+        )
+        return corners, uvs
+
+    def to_gltf_clip(
+        self,
+        animation: AnimationData,
+        textures: Iterable[TextureData],
+        image_uri: str,
+        name: str,
+        fps: int = 30,
+    ):
+        """Bakes all the frames of an animation into a binary glTF model: the first frame is the base mesh and
+        each frame is a morph target, played in turn by a glTF animation."""
+        vertices, _ = self.animate_all(animation)
+        corners, uvs_ids = self.triangulated_corners()
+        # Vertices are split by corner, as corners sharing a vertex may not share their texture coordinates
+        frames = vertices[:, corners.flatten()] / 1024
+
+        gltf = GLTFBuilder()
+        mesh = gltf.add_mesh(
+            name,
+            frames[0],
+            uvs=self.corners_uvs(textures, uvs_ids),
+            material=gltf.add_textured_material(name, image_uri),
+            morph_targets=[frame - frames[0] for frame in frames],
+        )
+        node = gltf.add_node(name, mesh)
+        if mesh is not None:
+            gltf.add_morph_animation(name, node, len(frames), 1 / fps)
+        return gltf
+
     def _to_obj(
         self,
         obj: StringIO | TextIO,
@@ -34,7 +34,6 @@ class PORTSection(BaseWADSection):
 
     @classmethod
     def parse(cls, data_in: BufferedIOBase, conf: Configuration, *args, **kwargs):
-        fallback_data = cls.fallback_parse_data(data_in)
         size, start = super().parse(data_in, conf)
         n_zones = int.from_bytes(data_in.read(4), "little")
         n_idk1 = int.from_bytes(data_in.read(4), "little")
@@ -51,4 +50,4 @@ class PORTSection(BaseWADSection):
             )
 
         cls.check_size(size, start, data_in.tell())
-        return cls(idk1, chunks_zones, fallback_data)
+        return cls(idk1, chunks_zones)
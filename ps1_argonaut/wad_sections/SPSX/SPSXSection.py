@@ -1,5 +1,5 @@
 import logging
-from io import BufferedIOBase
+from io import BufferedIOBase, SEEK_CUR
 from struct import pack
 
 from ps1_argonaut.BaseDataClasses import BaseWADSection
@@ -183,6 +183,49 @@ class SPSXSection(BaseWADSection):
             dialogues_bgms,
         )
 
+    @classmethod
+    def scan(cls, data_in: BufferedIOBase, conf: Configuration):
+        """Only reads the sounds counts, skipping the sounds headers & audio data."""
+        super().parse(data_in, conf)
+        spsx_flags = SPSXFlags(int.from_bytes(data_in.read(4), "little"))
+        has_common_sfx_dialogues_bgms = (
+            SPSXFlags.HAS_COMMON_SFX_AND_DIALOGUES_BGMS in spsx_flags
+        )
+        n_sounds = 0
+
+        n_sfx = int.from_bytes(data_in.read(4), "little")
+        if has_common_sfx_dialogues_bgms:
+            n_sounds += n_sfx
+            data_in.seek(n_sfx * EffectSound.struct.size, SEEK_CUR)
+
+        if SPSXFlags.HAS_AMBIENT_TRACKS in spsx_flags:
+            ambient_tracks_headers_size = int.from_bytes(data_in.read(4), "little")
+            n_sounds += ambient_tracks_headers_size // AmbientSound.struct.size
+            data_in.seek(ambient_tracks_headers_size, SEEK_CUR)
+
+        if SPSXFlags.HAS_LEVEL_SFX in spsx_flags:
+            n_level_sfx_groups = int.from_bytes(data_in.read(4), "little")
+            data_in.seek(8, SEEK_CUR)
+            n_unique_level_sfx = int.from_bytes(data_in.read(4), "little")
+            # Groups headers: offset, sound effects count, end offset, VAGs size
+            n_level_sfx = sum(
+                LevelSFXGroupContainer.struct.unpack(
+                    data_in.read(LevelSFXGroupContainer.struct.size)
+                )[1]
+                for _ in range(n_level_sfx_groups)
+            )
+            n_sounds += n_level_sfx
+            # Level sound effects headers, then the 16-bytes mapping of each unique sound effect
+            data_in.seek(
+                n_level_sfx * EffectSound.struct.size + 16 * n_unique_level_sfx,
+                SEEK_CUR,
+            )
+
+        n_dialogues_bgms = int.from_bytes(data_in.read(4), "little")
+        if has_common_sfx_dialogues_bgms:
+            n_sounds += n_dialogues_bgms
+        return {"n_sounds": n_sounds}
+
     def serialize(self, data_out: BufferedIOBase, conf: Configuration, *args, **kwargs):
         start = super().serialize(data_out, conf)
 
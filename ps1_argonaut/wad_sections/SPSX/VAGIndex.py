@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from ps1_argonaut.wad_sections.SPSX.VAGSoundData import VAGSoundData
+
+
+class VAGIndex(dict[bytes, list[Path]]):
+    """Content-hash index of the already exported sounds, meant to be shared by all the WADs of a DIR/DAT.
+    The engine only loads one level WAD at a time, so each WAD stores its own copy of the shared sounds (like Harry's
+    voice lines), they are only decoded & written once. The index can be saved next to the exported sounds, so that
+    the next export to the same folder doesn't write them again."""
+
+    manifest_filename = "DUPLICATES.json"
+    index_filename = "SOUNDS_INDEX.json"
+
+    def __init__(self, hardlinks=False):
+        super().__init__()
+        self.hardlinks = hardlinks
+        self.duplicates: dict[Path, Path] = {}
+
+    @classmethod
+    def load(cls, folder_path: Path, hardlinks=False):
+        """Index (and duplicates manifest) of a previous export to the given folder, empty if there's none. Sounds
+        whose files have been deleted since are forgotten."""
+        res = cls(hardlinks)
+        index_path = folder_path / cls.index_filename
+        if index_path.is_file():
+            index = json.loads(index_path.read_text(encoding="ASCII"))
+            for fingerprint, paths in index.items():
+                paths = [folder_path / path for path in paths]
+                if all(path.is_file() for path in paths):
+                    res[bytes.fromhex(fingerprint)] = paths
+        manifest_path = folder_path / cls.manifest_filename
+        if manifest_path.is_file():
+            manifest = json.loads(manifest_path.read_text(encoding="ASCII"))
+            for duplicate, original in manifest.items():
+                if (folder_path / original).is_file():
+                    res.duplicates[folder_path / duplicate] = folder_path / original
+        return res
+
+    @staticmethod
+    def fingerprint(vag: VAGSoundData) -> bytes:
+        # The exported files also depend on the channels count & sampling rate, not only on the VAG data
+        fingerprint = hashlib.blake2b(vag.data, digest_size=16)
+        fingerprint.update(vag.n_channels.to_bytes(1, "little"))
+        fingerprint.update(vag.sampling_rate.to_bytes(4, "little"))
+        return fingerprint.digest()
+
+    def export(
+        self,
+        vag: VAGSoundData,
+        paths: list[Path],
+        encode: Callable[[], Iterable[bytes]],
+    ):
+        """Writes the files returned by encode() if this sound hasn't been exported yet.
+        Otherwise, the given paths are hardlinked to the original files or recorded as duplicates in the manifest.
+        """
+        fingerprint = self.fingerprint(vag)
+        originals = self.get(fingerprint)
+        if originals is None:
+            for path, audio_bytes in zip(paths, encode()):
+                path.write_bytes(audio_bytes)
+            self[fingerprint] = paths
+        else:
+            for path, original in zip(paths, originals):
+                if path == original:
+                    # Already exported by a previous export
+                    continue
+                if self.hardlinks:
+                    path.unlink(missing_ok=True)
+                    os.link(original, path)
+                else:
+                    self.duplicates[path] = original
+
+    @property
+    def n_duplicates(self):
+        return len(self.duplicates)
+
+    def save_manifest(self, folder_path: Path):
+        """Writes the duplicates manifest (duplicate file -> exported file, relative to the given folder)."""
+        manifest = {
+            duplicate.relative_to(folder_path).as_posix(): original.relative_to(
+                folder_path
+            ).as_posix()
+            for duplicate, original in self.duplicates.items()
+        }
+        (folder_path / self.manifest_filename).write_text(
+            json.dumps(manifest, indent=2), encoding="ASCII"
+        )
+
+    def save(self, folder_path: Path):
+        """Writes the index (fingerprint -> exported files, relative to the given folder), see load."""
+        index = {
+            fingerprint.hex(): [path.relative_to(folder_path).as_posix() for path in paths]
+            for fingerprint, paths in self.items()
+        }
+        (folder_path / self.index_filename).write_text(
+            json.dumps(index, indent=2), encoding="ASCII"
+        )
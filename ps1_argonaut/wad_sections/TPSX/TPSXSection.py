@@ -22,10 +22,9 @@ class TPSXSection(BaseWADSection):
         self.texture_file = texture_file
         self.titles = list(titles) if titles is not None else []
 
-    @classmethod
-    def parse(cls, data_in: BufferedIOBase, conf: Configuration, *args, **kwargs):
-        fallback_data = cls.fallback_parse_data(data_in)
-        size, start = super().parse(data_in, conf)
+    @staticmethod
+    def _parse_titles(data_in: BufferedIOBase, conf: Configuration):
+        """Reads the flags & titles, returns the titles and whether there are legacy textures."""
         if conf.game == G.CROC_2_DEMO_PS1_DUMMY:
             has_legacy_textures = False
             titles = None
@@ -46,9 +45,24 @@ class TPSXSection(BaseWADSection):
                 data_in.seek(2052, SEEK_CUR)
             else:
                 titles = None
+        return titles, has_legacy_textures
+
+    @classmethod
+    def parse(cls, data_in: BufferedIOBase, conf: Configuration, *args, **kwargs):
+        size, start = super().parse(data_in, conf)
+        titles, has_legacy_textures = cls._parse_titles(data_in, conf)
         texture_file = TextureFile.parse(
             data_in, conf, has_legacy_textures=has_legacy_textures, end=start + size
         )
 
         cls.check_size(size, start, data_in.tell())
-        return cls(texture_file, titles, fallback_data)
+        return cls(texture_file, titles)
+
+    @classmethod
+    def scan(cls, data_in: BufferedIOBase, conf: Configuration):
+        super().parse(data_in, conf)
+        titles, _ = cls._parse_titles(data_in, conf)
+        return {
+            "titles": titles if titles is not None else [],
+            "n_textures": TextureFile.scan(data_in, conf),
+        }
@@ -0,0 +1,78 @@
+import math
+from collections.abc import Iterable
+
+import numpy as np
+from PIL import Image
+
+from ps1_argonaut.wad_sections.TPSX.TextureData import TextureData
+
+
+class AtlasTexture:
+    """Stands for a TextureData in exports, with its coordinates in an atlas instead of the WAD's texture page."""
+
+    def __init__(self, output_coords: list[tuple[float, float]]):
+        self.output_coords = output_coords
+
+
+class TextureAtlas:
+    """Tight texture atlas, made of the crops of the texture page that some textures use.
+    Its textures' coordinates are scaled to the usual 1024x1024 space, so that exports can use them as they are."""
+
+    def __init__(self, image: Image.Image, textures: list[AtlasTexture]):
+        self.image = image
+        self.textures = textures
+
+    @staticmethod
+    def pack_boxes(sizes: np.ndarray):
+        """Shelf-packs boxes of the given (width, height) sizes, tallest first, into an about square area.
+        Returns the top-left corner of each box and the area's width & height."""
+        width = max(
+            int(sizes[:, 0].max(initial=1)),
+            math.ceil(math.sqrt(int(np.prod(sizes, axis=1).sum()))),
+        )
+        positions = np.zeros_like(sizes)
+        x = y = shelf_height = 0
+        for i in np.argsort(-sizes[:, 1], kind="stable").tolist():
+            box_width, box_height = sizes[i].tolist()
+            if x + box_width > width:
+                x, y = 0, y + shelf_height
+                shelf_height = 0
+            positions[i] = x, y
+            x += box_width
+            shelf_height = max(shelf_height, box_height)
+        return positions, (width, max(y + shelf_height, 1))
+
+    @classmethod
+    def from_texture_page(
+        cls,
+        texture_page: Image.Image,
+        textures: list[TextureData],
+        textures_ids: Iterable[int],
+    ):
+        """Packs the crops used by the given textures of the texture page (see TextureFile.to_colorized_texture).
+        The other textures get null coordinates."""
+        textures_ids = np.unique(np.asarray(list(textures_ids), dtype=np.int64))
+        textures_ids = textures_ids[textures_ids < len(textures)]
+        coords = np.array(
+            [textures[i].output_coords for i in textures_ids.tolist()], dtype=np.int64
+        ).reshape((-1, 4, 2))
+        # Left, top, right, bottom of each texture, textures sharing a box are only packed once
+        boxes = np.concatenate((coords.min(axis=1), coords.max(axis=1)), axis=1)
+        unique_boxes, boxes_ids = np.unique(boxes, axis=0, return_inverse=True)
+        positions, size = cls.pack_boxes(unique_boxes[:, 2:] - unique_boxes[:, :2])
+
+        image = Image.new(texture_page.mode, size, None)
+        for box, position in zip(unique_boxes.tolist(), positions.tolist()):
+            image.paste(texture_page.crop(box), position)
+
+        # Box math: each coordinate keeps its offset from its box's top-left corner
+        offsets = (positions - unique_boxes[:, :2])[boxes_ids.reshape(-1)]
+        atlas_coords = (coords + offsets[:, None]) * (1024 / np.array(size))
+        atlas_textures = [AtlasTexture([(0, 0)] * 4) for _ in range(len(textures))]
+        for texture_id, texture_coords in zip(
+            textures_ids.tolist(), atlas_coords.tolist()
+        ):
+            atlas_textures[texture_id] = AtlasTexture(
+                [tuple(coord) for coord in texture_coords]
+            )
+        return cls(image, atlas_textures)
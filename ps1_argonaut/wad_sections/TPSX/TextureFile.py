@@ -6,9 +6,14 @@ import numpy as np
 from PIL import Image
 
 from ps1_argonaut.BaseDataClasses import BaseDataClass
+from ps1_argonaut.ContentStore import ContentStore
 from ps1_argonaut.configuration import Configuration, G
 from ps1_argonaut.errors_warnings import TexturesWarning, ZeroRunLengthError
-from ps1_argonaut.utils import parse_4bits_paletted, parse_high_color, parse_palette
+from ps1_argonaut.utils import (
+    parse_4bits_paletted_array,
+    parse_high_color_array,
+    parse_palette,
+)
 from ps1_argonaut.wad_sections.TPSX.TextureData import TextureData
 from ps1_argonaut.wad_sections.TPSX.TextureFlags import TextureFlags
 
@@ -39,6 +44,42 @@ class TextureFile(list[TextureData], BaseDataClass):
     def n_textures(self):
         return len(self)
 
+    @property
+    def textures_layout(self):
+        """Flags, raw coordinates and palette start of each texture, one row per texture."""
+        return np.array(
+            [
+                (
+                    texture.flags.value,
+                    *(value for coord in texture.raw_coords for value in coord),
+                    -1 if texture.palette_start is None else texture.palette_start,
+                )
+                for texture in self.textures
+            ],
+            dtype=np.int32,
+        )
+
+    @property
+    def digest(self):
+        """Content hash of the colorized texture, computed without drawing it."""
+        return ContentStore.digest(
+            self.textures_data,
+            self.textures_layout,
+            bytes((self.has_alpha, self.legacy_alpha)),
+        )
+
+    @staticmethod
+    def n_stored_textures(n_textures: int, conf: Configuration):
+        # In Harry Potter, the last 16 textures are empty (full of 00 bytes)
+        if conf.game in (G.HARRY_POTTER_1_PS1, G.HARRY_POTTER_2_PS1):
+            return n_textures - 16
+        return n_textures
+
+    @classmethod
+    def scan(cls, data_in: BufferedIOBase, conf: Configuration):
+        """Only reads the textures count (see TPSXSection.scan)."""
+        return cls.n_stored_textures(int.from_bytes(data_in.read(4), "little"), conf)
+
     @classmethod
     def parse(cls, data_in: BufferedIOBase, conf: Configuration, *args, **kwargs):
         super().parse(data_in, conf)
@@ -64,13 +105,7 @@ class TextureFile(list[TextureData], BaseDataClass):
             else:
                 raise TexturesWarning(data_in.tell(), n_textures, n_rows)
 
-        # In Harry Potter, the last 16 textures are empty (full of 00 bytes)
-        n_stored_textures = (
-            n_textures - 16
-            if conf.game in (G.HARRY_POTTER_1_PS1, G.HARRY_POTTER_2_PS1)
-            else n_textures
-        )
-        for texture_id in range(n_stored_textures):
+        for texture_id in range(cls.n_stored_textures(n_textures, conf)):
             textures.append(TextureData.parse(data_in, conf))
         if conf.game in (G.HARRY_POTTER_1_PS1, G.HARRY_POTTER_2_PS1):
             data_in.seek(192, SEEK_CUR)  # 16 textures x 12 bytes
@@ -114,7 +149,7 @@ class TextureFile(list[TextureData], BaseDataClass):
         res = Image.new(rgba, self.image_dimensions, None)
 
         im_4bits_paletted = Image.fromarray(
-            np.array(parse_4bits_paletted(self.textures_data), dtype=np.uint8).reshape(
+            parse_4bits_paletted_array(self.textures_data).reshape(
                 self.image_dimensions[1], self.image_dimensions[0]
             ),
             "P",
@@ -126,9 +161,9 @@ class TextureFile(list[TextureData], BaseDataClass):
             "P",
         )
         im_high_color = Image.fromarray(
-            np.array(
-                parse_high_color(self.textures_data, True), dtype=np.uint8
-            ).reshape((self.image_dimensions[1], self.image_dimensions[0] // 4, 4)),
+            parse_high_color_array(self.textures_data, True).reshape(
+                (self.image_dimensions[1], self.image_dimensions[0] // 4, 4)
+            ),
             rgba,
         )
 
@@ -0,0 +1,128 @@
+import pytest
+
+from ps1_argonaut.files.WADFile import WADFile
+from ps1_argonaut.AssetsCatalog import *
+from ps1_argonaut.wad_sections.DPSX.ChunkClasses import ChunksMatrix
+from ps1_argonaut.wad_sections.DPSX.LevelFile import LevelFile
+from ps1_argonaut.wad_sections.DPSX.Model3DData import Model3DData
+from ps1_argonaut.wad_sections.DPSX.Model3DHeader import Model3DHeader
+
+
+@pytest.fixture
+def wad_file():
+    models_3d = [
+        Model3DData(
+            Model3DHeader(n_vertices, n_faces, 0),
+            False,
+            [],
+            [],
+            None,
+            None,
+            None,
+            [],
+            1,
+        )
+        for n_vertices, n_faces in ((8, 6), (4, 1))
+    ]
+    chunks_matrix = ChunksMatrix.from_sub_chunks_lists(
+        [], 2, 3, [[0], None, None, None, None, None], [0], [0], [0]
+    )
+    dpsx = DPSXSection(
+        models_3d, [], [], LevelFile(chunks_matrix), models_3d_offsets=[2060, 2200]
+    )
+    wad_file = WADFile("TEST", {DPSXSection.codename_bytes: dpsx})
+    wad_file.dat_offset = 4096
+    wad_file.sections_offsets = {DPSXSection.codename_bytes: 100}
+    return wad_file
+
+
+class TestAssetsCatalog:
+    @pytest.fixture
+    def catalog(self, tmp_path, wad_file):
+        with AssetsCatalog(tmp_path / "catalog.db") as catalog:
+            catalog.add_wad(wad_file)
+            yield catalog
+
+    def test_wad(self, catalog):
+        (wad,) = catalog.find("wads", name="TEST.WAD")
+        assert wad["dat_offset"] == 4096
+        assert (
+            wad["n_models"],
+            wad["n_rows"],
+            wad["n_columns"],
+            wad["n_filled_chunks"],
+        ) == (2, 2, 3, 1)
+
+    def test_find_models(self, catalog):
+        (model,) = catalog.find("models", n_vertices=4)
+        assert (model["name"], model["model_id"], model["wad_dat_offset"]) == (
+            "TEST.WAD",
+            1,
+            4096,
+        )
+        assert model["offset"] == 2300
+
+    def test_add_wad_again(self, catalog, wad_file):
+        catalog.add_wad(wad_file)
+        assert len(catalog.find("wads")) == 1
+        assert len(catalog.find("models")) == 2
+
+    def test_unknown_column(self, catalog):
+        with pytest.raises(ValueError):
+            catalog.find("models", size=1)
+
+    def test_contains(self, catalog):
+        assert "TEST.WAD" in catalog
+        assert "OTHER.WAD" not in catalog
+
+    def test_find_wads_names(self, catalog):
+        assert catalog.find_wads_names("models", n_faces=6) == {"TEST.WAD"}
+        assert catalog.find_wads_names("models", n_faces=7) == set()
+
+    def test_parse_query(self):
+        assert AssetsCatalog.parse_query("models:n_vertices=4,n_faces=1") == (
+            "models",
+            {"n_vertices": 4, "n_faces": 1},
+        )
+        assert AssetsCatalog.parse_query("wads:name=TEST.WAD") == (
+            "wads",
+            {"name": "TEST.WAD"},
+        )
+
+    @pytest.mark.parametrize(
+        "query", ["textures:n_vertices=4", "models:size=1", "models:n_vertices"]
+    )
+    def test_parse_invalid_query(self, query):
+        with pytest.raises(ValueError):
+            AssetsCatalog.parse_query(query)
+
+
+class TestAssetsCatalogCommits:
+    def test_interrupted_run(self, tmp_path, wad_file):
+        catalog = AssetsCatalog(tmp_path / "catalog.db")
+        catalog.add_wad(wad_file)
+        # The run stops before closing the catalog
+        with AssetsCatalog(tmp_path / "catalog.db") as other_catalog:
+            assert "TEST.WAD" in other_catalog
+            assert len(other_catalog.find("models")) == 2
+        catalog.close()
+
+    def test_failed_wad(self, tmp_path, wad_file):
+        failed_wad_file = WADFile(
+            "FAILED",
+            {
+                DPSXSection.codename_bytes: DPSXSection(
+                    [None], [], [], wad_file.dpsx.level_file
+                )
+            },
+        )
+        failed_wad_file.dat_offset = 0
+        failed_wad_file.sections_offsets = wad_file.sections_offsets
+        with AssetsCatalog(tmp_path / "catalog.db") as catalog:
+            catalog.add_wad(wad_file)
+            with pytest.raises(AttributeError):
+                catalog.add_wad(failed_wad_file)
+        with AssetsCatalog(tmp_path / "catalog.db") as catalog:
+            # The failed WAD's rows are rolled back, the previous WAD's rows are kept
+            assert catalog.find_wads_names("wads") == {"TEST.WAD"}
+            assert catalog.find_wads_names("sections") == {"TEST.WAD"}
@@ -0,0 +1,77 @@
+import pytest
+
+from ps1_argonaut.wad_sections.DPSX.ChunkClasses import *
+
+
+@pytest.fixture
+def chunks_matrix():
+    # 2 rows, 3 columns, the last zone id (5) is used by chunks without zone
+    return ChunksMatrix.from_sub_chunks_lists(
+        ["model_0", "model_1"],
+        2,
+        3,
+        [[0, 2], None, [1], None, None, [3]],
+        [0, 1, 1, 0],
+        [10, 20, 30, 40],
+        [0, 4, 8, 12],
+        [1, 2, 1, 4, 5, 5],
+        [1, 2, 3, 4, 5, 6],
+    )
+
+
+class TestChunksMatrix:
+    def test_len(self, chunks_matrix):
+        assert len(chunks_matrix) == 6
+        assert chunks_matrix.n_sub_chunks == 4
+
+    def test_n_filled_chunks(self, chunks_matrix):
+        assert chunks_matrix.n_filled_chunks == 3
+
+    def test_max_zone_id(self, chunks_matrix):
+        assert chunks_matrix.max_zone_id == 5
+
+    def test_chunk_view(self, chunks_matrix):
+        chunk = chunks_matrix[0]
+        assert [sub_chunk.sub_chunk_id for sub_chunk in chunk] == [0, 2]
+        assert [sub_chunk.height for sub_chunk in chunk] == [10, 30]
+        assert chunk[1].model_3d_data == "model_1"
+        assert chunk[1].rotation == ChunkRotation.BOTTOM
+        assert chunk.zone_id == 1
+        assert chunk.fvw_data == b"\x01\x00"
+
+    def test_empty_chunk_view(self, chunks_matrix):
+        assert not chunks_matrix[1]
+        assert chunks_matrix[1].zone_id == 2
+
+    def test_visual_map(self, chunks_matrix):
+        assert str(chunks_matrix) == "█ ░ █\n░ ░ █"
+
+
+class TestChunksIndex:
+    @pytest.fixture
+    def chunks_index(self, chunks_matrix):
+        return ChunksIndex(chunks_matrix, [[3], [0, 4]])
+
+    def test_chunks_in_box(self, chunks_index):
+        assert chunks_index.chunks_in_box(5000, 0, 9000, 5000).tolist() == [1, 2, 4, 5]
+
+    def test_chunks_in_box_outside(self, chunks_index):
+        assert chunks_index.chunks_in_box(-9000, -9000, -1, -1).tolist() == []
+
+    def test_chunks_in_radius(self, chunks_index):
+        assert chunks_index.chunks_in_radius(4096, 4096, 100).tolist() == [0, 1, 3, 4]
+        assert chunks_index.chunks_in_radius(2048, 2048, 100).tolist() == [0]
+
+    def test_chunks_in_zone(self, chunks_index):
+        assert chunks_index.chunks_in_zone(1).tolist() == [0, 2, 4]
+        assert chunks_index.chunks_in_zone(0).tolist() == [3]
+        assert chunks_index.chunks_in_zone(5).tolist() == []
+
+    def test_sub_chunks(self, chunks_index):
+        assert chunks_index.sub_chunks([5, 0, 1]).tolist() == [0, 1, 3]
+        assert chunks_index.sub_chunks_in_zone(1).tolist() == [0, 1, 2]
+
+    @pytest.mark.parametrize("chunk_ids", [[6], [-1, 0]])
+    def test_sub_chunks_invalid_ids(self, chunks_index, chunk_ids):
+        with pytest.raises(ValueError):
+            chunks_index.sub_chunks(chunk_ids)
@@ -0,0 +1,39 @@
+import json
+
+import numpy as np
+
+from ps1_argonaut.ContentStore import ContentStore
+
+
+class TestContentStore:
+    def test_digest(self):
+        assert ContentStore.digest(b"ab", b"c") != ContentStore.digest(b"a", b"bc")
+        assert ContentStore.digest(np.zeros(2, np.uint8)) != ContentStore.digest(
+            np.zeros(2, np.uint16)
+        )
+
+    def test_store(self, tmp_path):
+        written = []
+
+        def write(path):
+            written.append(path)
+            path.write_bytes(b"content")
+
+        store = ContentStore(tmp_path)
+        digest = ContentStore.digest(b"content")
+        for manifest_name in ("A", "B"):
+            store.store(manifest_name, f"{manifest_name}.BIN", digest, "BIN", write)
+        store.save_manifests()
+        assert written == [tmp_path / "objects" / f"{digest}.BIN"]
+        assert list((tmp_path / "objects").iterdir()) == written
+        assert json.loads((tmp_path / "B.json").read_text()) == {
+            "B.BIN": f"objects/{digest}.BIN"
+        }
+
+    def test_previous_export(self, tmp_path):
+        digest = ContentStore.digest(b"content")
+        ContentStore(tmp_path).store(
+            "A", "A.BIN", digest, "BIN", lambda path: path.write_bytes(b"content")
+        )
+        # Objects written by a previous export aren't written again
+        ContentStore(tmp_path).store("B", "B.BIN", digest, "BIN", None)
@@ -0,0 +1,47 @@
+from io import BytesIO
+
+import pytest
+
+# WADFile must be imported first to resolve the circular imports of the sections
+import ps1_argonaut.files.WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.wad_sections.DPSX.AnimationData import AnimationData
+from ps1_argonaut.wad_sections.DPSX.DPSXSection import DPSXSection
+from ps1_argonaut import synthetic
+
+
+@pytest.fixture
+def dpsx():
+    conf = Configuration(G.HARRY_POTTER_2_PS1)
+    # Animations 1 & 5 are designed for 3 vertices groups, the others for 2
+    animations = [
+        AnimationData.parse(
+            BytesIO(synthetic.animation_bytes(conf, 1, n_vertices_groups)), conf
+        )
+        for n_vertices_groups in (2, 3, 2, 2, 2, 3, 2)
+    ]
+    return DPSXSection([], animations, [], None)
+
+
+class TestCompatibleAnimations:
+    def test_compatible_animations(self, dpsx):
+        assert dpsx.compatible_animations(2).tolist() == [0, 2, 3, 4, 6]
+        assert dpsx.compatible_animations(3).tolist() == [1, 5]
+        assert dpsx.compatible_animations(4).tolist() == []
+
+    @pytest.mark.parametrize("position, animation_id", [(1, 1), (4, 5), (5, 5)])
+    def test_nearest(self, dpsx, position, animation_id):
+        assert dpsx.nearest_compatible_animation(3, position) == animation_id
+
+    def test_nearest_tied(self, dpsx):
+        # Animations 1 & 5 are as close to 3
+        assert dpsx.nearest_compatible_animation(3, 3) == 1
+
+    @pytest.mark.parametrize(
+        "position, animation_id", [(0, 1), (-5, 1), (6, 5), (50, 5)]
+    )
+    def test_nearest_outside(self, dpsx, position, animation_id):
+        assert dpsx.nearest_compatible_animation(3, position) == animation_id
+
+    def test_nearest_none(self, dpsx):
+        assert dpsx.nearest_compatible_animation(4, 3) is None
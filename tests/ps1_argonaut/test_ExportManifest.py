@@ -0,0 +1,47 @@
+import pytest
+
+from ps1_argonaut.ExportManifest import *
+
+
+@pytest.fixture
+def dat_file():
+    return DATFile("LEVEL", "WAD", b"\x01\x02\x03")
+
+
+class TestExportManifest:
+    @pytest.fixture
+    def output(self, tmp_path, dat_file):
+        """Output of a previous export of dat_file."""
+        output = tmp_path / "LEVEL.PNG"
+        output.write_bytes(b"")
+        manifest = ExportManifest(tmp_path / "manifest.json", {"option": 1}, "DIR_DAT")
+        manifest.update(dat_file, manifest.fingerprint(dat_file), [output])
+        manifest.save()
+        return output
+
+    def test_up_to_date(self, tmp_path, output, dat_file):
+        manifest = ExportManifest(tmp_path / "manifest.json", {"option": 1}, "DIR_DAT")
+        assert manifest.is_up_to_date(dat_file, manifest.fingerprint(dat_file))
+
+    def test_changed_file(self, tmp_path, output):
+        changed_file = DATFile("LEVEL", "WAD", b"\x01\x02\x04")
+        manifest = ExportManifest(tmp_path / "manifest.json", {"option": 1}, "DIR_DAT")
+        assert not manifest.is_up_to_date(
+            changed_file, manifest.fingerprint(changed_file)
+        )
+
+    def test_changed_options(self, tmp_path, output, dat_file):
+        manifest = ExportManifest(tmp_path / "manifest.json", {"option": 2}, "DIR_DAT")
+        assert not manifest.is_up_to_date(dat_file, manifest.fingerprint(dat_file))
+
+    def test_remove_stale(self, tmp_path, output):
+        manifest = ExportManifest(tmp_path / "manifest.json", {"option": 1}, "DIR_DAT")
+        assert manifest.remove_stale(["OTHER.WAD"]) == ["LEVEL.WAD"]
+        assert not output.exists()
+
+    def test_remove_stale_other_source(self, tmp_path, output):
+        manifest = ExportManifest(
+            tmp_path / "manifest.json", {"option": 1}, ["OTHER.WAD"]
+        )
+        assert manifest.remove_stale(["OTHER.WAD"]) == []
+        assert output.exists()
@@ -0,0 +1,21 @@
+import ps1_argonaut.files.WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.files.IMGFile import IMGFile, ImageType
+
+
+class TestIMGFile:
+    def test_paletted_image(self):
+        # 16 colors palette (red, then black), then 4-bit indexes
+        data = b"\x1f\x00" + bytes(30) + b"\x10" * (ImageType.GLOW.bytes_size - 32)
+        img_file = IMGFile("GLOW", data=data)
+        img_file.parse(Configuration(G.HARRY_POTTER_2_PS1))
+        image = img_file[0]
+        assert (image.mode, image.size) == ("P", ImageType.GLOW.dimensions)
+        assert image.convert("RGBA").getpixel((0, 0)) == (255, 0, 0, 255)
+        assert image.convert("RGBA").getpixel((1, 0)) == (0, 0, 0, 0)
+
+    def test_high_color_image(self):
+        img_file = IMGFile("LBAR", data=b"\xe0\x03" * 168)
+        img_file.parse(Configuration(G.HARRY_POTTER_2_PS1))
+        assert img_file[0].mode == "RGBA"
+        assert img_file[0].getpixel((11, 13)) == (0, 255, 0, 255)
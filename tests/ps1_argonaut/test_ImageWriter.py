@@ -0,0 +1,20 @@
+import pytest
+from PIL import Image
+
+from ps1_argonaut.ImageWriter import ImageWriter
+
+
+class TestImageWriter:
+    def test_threads(self, tmp_path):
+        with ImageWriter(n_threads=2) as image_writer:
+            for i in range(20):
+                image_writer.save(Image.new("RGB", (8, 8), (i, 0, 0)), tmp_path / str(i))
+        assert [
+            Image.open(tmp_path / f"{i}.PNG").getpixel((0, 0)) for i in range(20)
+        ] == [(i, 0, 0) for i in range(20)]
+
+    def test_threads_error(self, tmp_path):
+        image_writer = ImageWriter(n_threads=2)
+        image_writer.save(Image.new("RGB", (8, 8)), tmp_path / "missing" / "0")
+        with pytest.raises(FileNotFoundError):
+            image_writer.close()
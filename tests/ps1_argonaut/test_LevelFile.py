@@ -0,0 +1,87 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+# WADFile must be imported first to resolve the circular imports of the sections
+import ps1_argonaut.files.WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.errors_warnings import SubChunksListError
+from ps1_argonaut.wad_sections.DPSX.LevelFile import LevelFile
+from ps1_argonaut import synthetic
+
+n_vertices = 8
+n_textures = 4
+# With this seed, the 4 chunks hold respectively 1, 2, 2 & 2 sub-chunks
+seed = 0
+
+
+@pytest.fixture
+def conf():
+    return Configuration(G.HARRY_POTTER_2_PS1)
+
+
+@pytest.fixture
+def level_file_bytes(conf):
+    return bytearray(
+        synthetic.level_file_bytes(conf, 2, 2, 1, n_vertices, n_textures, seed)
+    )
+
+
+@pytest.fixture
+def chunks_info_start(conf):
+    """Offset of the chunks' linked lists heads, followed by the linked lists nodes."""
+    model_size = len(
+        synthetic.model_3d_header_bytes(conf, n_vertices, n_vertices)
+    ) + len(
+        synthetic.model_3d_data_bytes(
+            conf, n_vertices, n_vertices, n_textures, is_world_model_3d=True
+        )
+    )
+    # Chunk models count & chunk model, then the level header
+    return 4 + model_size + 168
+
+
+def linked_lists(data: bytearray, chunks_info_start: int):
+    """Writable views of the 4 chunks' linked lists heads and of the nodes (sub-chunk id, next node offset)."""
+    heads = np.frombuffer(data, dtype="<u4", count=4, offset=chunks_info_start)
+    nodes = np.frombuffer(data, dtype="<u4", count=14, offset=chunks_info_start + 16)
+    return heads, nodes.reshape((7, 2))
+
+
+def parse(data: bytearray, conf: Configuration):
+    return LevelFile.parse(BytesIO(data), conf)
+
+
+class TestSubChunksLists:
+    def test_parse(self, level_file_bytes, chunks_info_start, conf):
+        heads, nodes = linked_lists(level_file_bytes, chunks_info_start)
+        assert np.count_nonzero(heads != 0xFFFFFFFF) == 4
+        assert np.count_nonzero(nodes[:, 1] == 0xFFFFFFFF) == 4
+        parse(level_file_bytes, conf)
+
+    def test_cyclic(self, level_file_bytes, chunks_info_start, conf):
+        heads, nodes = linked_lists(level_file_bytes, chunks_info_start)
+        # The last node of the last chunk's list links back to its head
+        nodes[nodes[heads[3] // 8, 1] // 8, 1] = heads[3]
+        with pytest.raises(SubChunksListError):
+            parse(level_file_bytes, conf)
+
+    def test_overlong(self, level_file_bytes, chunks_info_start, conf):
+        heads, nodes = linked_lists(level_file_bytes, chunks_info_start)
+        # The first chunk's list goes on with the second chunk's list
+        nodes[heads[0] // 8, 1] = heads[1]
+        with pytest.raises(SubChunksListError):
+            parse(level_file_bytes, conf)
+
+    def test_too_short(self, level_file_bytes, chunks_info_start, conf):
+        heads, nodes = linked_lists(level_file_bytes, chunks_info_start)
+        nodes[heads[1] // 8, 1] = 0xFFFFFFFF
+        with pytest.raises(SubChunksListError):
+            parse(level_file_bytes, conf)
+
+    def test_invalid_offset(self, level_file_bytes, chunks_info_start, conf):
+        heads, nodes = linked_lists(level_file_bytes, chunks_info_start)
+        heads[2] = 8 * 7
+        with pytest.raises(SubChunksListError):
+            parse(level_file_bytes, conf)
@@ -0,0 +1,151 @@
+import json
+
+import numpy as np
+import pytest
+
+# WADFile must be imported first to resolve the circular imports of the sections
+from ps1_argonaut.files.WADFile import WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.GLTFBuilder import GLTFBuilder, component_types
+from ps1_argonaut.wad_sections.DPSX.LevelMesh import LevelMesh
+from ps1_argonaut import synthetic
+
+dtypes = {component_type: dtype for dtype, component_type in component_types.items()}
+
+
+@pytest.fixture(scope="module")
+def wad_file():
+    conf = Configuration(G.HARRY_POTTER_2_PS1)
+    wad_file = synthetic.wad_file(
+        conf,
+        n_textures=40,
+        n_models=1,
+        n_vertices=60,
+        n_animations=1,
+        n_rows=4,
+        n_columns=4,
+        n_chunk_models=4,
+    )
+    wad_file.parse(conf)
+    return wad_file
+
+
+def read_glb(path):
+    """glTF JSON & binary chunks of a GLB file."""
+    data = path.read_bytes()
+    json_size = int.from_bytes(data[12:16], "little")
+    gltf = json.loads(data[20 : 20 + json_size])
+    return gltf, data[20 + json_size + 8 :]
+
+
+def accessor_array(gltf: dict, binary: bytes, accessor_id: int):
+    accessor = gltf["accessors"][accessor_id]
+    buffer_view = gltf["bufferViews"][accessor["bufferView"]]
+    array = np.frombuffer(
+        binary,
+        dtype=dtypes[accessor["componentType"]],
+        count=buffer_view["byteLength"] // dtypes[accessor["componentType"]].itemsize,
+        offset=buffer_view["byteOffset"],
+    )
+    return array.reshape((accessor["count"], -1))
+
+
+class TestLitLevel:
+    def test_colors(self, tmp_path, wad_file: WADFile):
+        wad_file.export_level_gltf(tmp_path, "SYNTH")
+        gltf, binary = read_glb(tmp_path / "SYNTH.GLB")
+        attributes = gltf["meshes"][0]["primitives"][0]["attributes"]
+        colors = accessor_array(gltf, binary, attributes["COLOR_0"])
+        assert gltf["accessors"][attributes["COLOR_0"]]["normalized"]
+
+        level_mesh = wad_file.level_mesh(lighting=True)
+        # One color per triangle corner, as many as the positions
+        assert len(colors) == 3 * level_mesh.n_triangles
+        assert len(colors) == gltf["accessors"][attributes["POSITION"]]["count"]
+        raw_colors = level_mesh.colors[level_mesh.triangles.flatten(), :3]
+        assert (raw_colors >= 128).any() and (raw_colors < 128).any()
+        # Doubled, clamped to 255
+        assert (colors == np.minimum(2 * raw_colors.astype(np.int64), 255)).all()
+        assert (colors[raw_colors >= 128] == 255).all()
+
+
+class TestLODs:
+    @pytest.fixture
+    def level_mesh(self, wad_file: WADFile):
+        return wad_file.level_mesh()
+
+    def test_clustered(self, level_mesh):
+        lods = [
+            level_mesh.clustered(cell_size)
+            for cell_size in (1, *LevelMesh.lods_cells_sizes)
+        ]
+        n_triangles = [lod.n_triangles for lod in lods]
+        assert n_triangles == sorted(n_triangles, reverse=True)
+        assert n_triangles[-1] < n_triangles[0] <= level_mesh.n_triangles
+        for lod in lods:
+            triangles = np.sort(lod.triangles, axis=1)
+            assert (triangles[:, :-1] != triangles[:, 1:]).all()
+            assert len(lod.triangles_uvs_ids) == lod.n_triangles
+
+    def test_gltf_lods(self, level_mesh, wad_file: WADFile):
+        gltf = GLTFBuilder()
+        node_id = level_mesh.add_gltf_lods(gltf, wad_file.textures, 0, "SYNTH")
+        node = gltf.gltf["nodes"][node_id]
+        lods_ids = node["extensions"]["MSFT_lod"]["ids"]
+        coverages = node["extras"]["MSFT_screencoverage"]
+        assert "MSFT_lod" in gltf.gltf["extensionsUsed"]
+        assert len(lods_ids) == len(LevelMesh.lods_cells_sizes)
+        # The root node's mesh, then each level of detail
+        assert len(coverages) == len(lods_ids) + 1
+        assert coverages == sorted(coverages, reverse=True)
+        nodes = [node] + [gltf.gltf["nodes"][lod_id] for lod_id in lods_ids]
+        n_corners = [
+            gltf.gltf["accessors"][
+                gltf.gltf["meshes"][node["mesh"]]["primitives"][0]["attributes"][
+                    "POSITION"
+                ]
+            ]["count"]
+            for node in nodes
+        ]
+        assert n_corners == sorted(n_corners, reverse=True)
+        # The levels of detail aren't placed on their own
+        assert not set(lods_ids) & set(gltf.gltf["scenes"][0]["nodes"])
+
+
+class TestWelded:
+    @pytest.fixture
+    def level_mesh(self):
+        """Two adjacent square sub-chunks of two triangles, sharing the x = 4096 edge."""
+        square = np.array([[0, 0, 0], [4096, 0, 0], [4096, 0, 4096], [0, 0, 4096]])
+        triangles = np.array([[0, 1, 2], [0, 2, 3]])
+        return LevelMesh(
+            np.concatenate((square, square + [4096, 0, 0])),
+            np.concatenate((triangles, triangles + 4)),
+            np.arange(12).reshape((4, 3)),
+            np.repeat([0, 1], 4),
+        )
+
+    def test_welded(self, level_mesh):
+        welded = level_mesh.welded()
+        assert welded.n_vertices == 6
+        assert welded.n_triangles == level_mesh.n_triangles
+        assert (welded.triangles_uvs_ids == level_mesh.triangles_uvs_ids).all()
+        assert (
+            welded.vertices[welded.triangles]
+            == level_mesh.vertices[level_mesh.triangles]
+        ).all()
+        # The shared edge's vertices are used by both sub-chunks' triangles
+        shared = np.flatnonzero(welded.vertices[:, 0] == 4096)
+        assert len(shared) == 2
+        for sub_chunk_triangles in (welded.triangles[:2], welded.triangles[2:]):
+            assert set(shared) <= set(sub_chunk_triangles.flatten().tolist())
+
+    def test_welded_precision(self, level_mesh):
+        level_mesh.vertices = level_mesh.vertices + np.where(
+            level_mesh.vertices_sub_chunks[:, None] == 1, 3, 0
+        )
+        # The sub-chunks' edges are 3 units apart
+        assert level_mesh.welded().n_vertices == 8
+        welded = level_mesh.welded(8)
+        assert welded.n_vertices == 6
+        assert welded.n_triangles == level_mesh.n_triangles
@@ -0,0 +1,73 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+# WADFile must be imported first to resolve the circular imports of the sections
+import ps1_argonaut.files.WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.errors_warnings import IncompatibleAnimationError
+from ps1_argonaut.wad_sections.DPSX.AnimationData import AnimationData
+from ps1_argonaut.wad_sections.DPSX.Model3DData import Model3DData
+from ps1_argonaut import synthetic
+
+n_vertices_groups = 4
+
+
+@pytest.fixture
+def conf():
+    return Configuration(G.HARRY_POTTER_2_PS1)
+
+
+@pytest.fixture
+def model_3d(conf):
+    data = synthetic.model_3d_bytes(conf, 40, 20, 4, n_vertices_groups, seed=1)
+    return Model3DData.parse(BytesIO(data), conf)
+
+
+@pytest.fixture
+def animation(conf):
+    data = synthetic.animation_bytes(conf, 5, n_vertices_groups, seed=2)
+    return AnimationData.parse(BytesIO(data), conf)
+
+
+def animated_frame(groups: list[np.ndarray], animation: AnimationData, frame_id: int):
+    """Per-group rotation & translation of a frame, like before animate_all."""
+    res = []
+    for i, group in enumerate(groups):
+        transform = np.asarray(animation[frame_id][i], dtype=np.float64)
+        res.append(np.add(group.dot(transform[:, 0:3]), transform[:, 3]))
+    return np.concatenate(res)
+
+
+class TestModel3DDataAnimation:
+    def test_animate_all(self, model_3d, animation):
+        vertices, normals = model_3d.animate_all(animation)
+        assert vertices.shape == (5, 40, 3)
+        for frame_id in range(5):
+            np.testing.assert_allclose(
+                vertices[frame_id],
+                animated_frame(model_3d.vertices, animation, frame_id),
+            )
+            np.testing.assert_allclose(
+                normals[frame_id], animated_frame(model_3d.normals, animation, frame_id)
+            )
+
+    def test_animate_all_frame_ids(self, model_3d, animation):
+        vertices, _ = model_3d.animate_all(animation, (3, 1))
+        np.testing.assert_allclose(vertices[1], model_3d.animate_all(animation)[0][1])
+
+    def test_animate(self, model_3d, animation):
+        animated = model_3d.animate(animation, 2)
+        assert [len(group) for group in animated.vertices] == [
+            len(group) for group in model_3d.vertices
+        ]
+        np.testing.assert_allclose(
+            np.concatenate(animated.vertices),
+            animated_frame(model_3d.vertices, animation, 2),
+        )
+
+    def test_incompatible_animation(self, conf, model_3d):
+        data = synthetic.animation_bytes(conf, 5, n_vertices_groups + 1)
+        with pytest.raises(IncompatibleAnimationError):
+            model_3d.animate_all(AnimationData.parse(BytesIO(data), conf))
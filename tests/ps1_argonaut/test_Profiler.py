@@ -0,0 +1,72 @@
+import tracemalloc
+
+import pytest
+
+# WADFile must be imported first to resolve the circular imports of the sections
+import ps1_argonaut.files.WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.Profiler import Profiler
+from ps1_argonaut import synthetic
+
+
+class TestProfiler:
+    @pytest.fixture
+    def profiler(self):
+        profiler = Profiler()
+        for name, n_bytes in (("A.WAD", 10), ("B.WAD", 20)):
+            with profiler.file(name):
+                with profiler.measure("stage", n_bytes) as counters:
+                    counters["items"] = 2
+        return profiler
+
+    def test_files(self, profiler):
+        assert profiler.files["B.WAD"]["stage"]["bytes"] == 20
+        assert profiler.current_file is None
+
+    def test_slowest_files(self, profiler):
+        profiler.files_seconds["B.WAD"] += 1
+        assert profiler.slowest_files(1) == ["B.WAD"]
+        assert profiler.slowest_files(3) == ["B.WAD", "A.WAD"]
+
+    def test_total(self, profiler):
+        total = profiler.total["stage"]
+        assert (total["calls"], total["bytes"], total["items"]) == (2, 30, 4)
+
+    def test_wad_parse(self):
+        profiler = Profiler()
+        conf = Configuration(G.HARRY_POTTER_2_PS1, profiler=profiler)
+        wad_file = synthetic.wad_file(
+            conf, n_models=1, n_animations=1, n_rows=2, n_columns=2
+        )
+        size = wad_file.size
+        with profiler.file(wad_file.name):
+            wad_file.parse(conf)
+        stages = profiler.files[wad_file.name]
+        assert stages["WADFile.parse"]["bytes"] == size
+        # All but the WAD size
+        assert (
+            sum(
+                record["bytes"]
+                for stage, record in stages.items()
+                if stage.endswith("Section.parse")
+            )
+            == size - 4
+        )
+
+    def test_trace_memory(self):
+        profiler = Profiler(trace_memory=True)
+        with profiler.measure("outer"):
+            data = bytearray(10**6)
+            del data
+            with profiler.measure("inner"):
+                pass
+        tracemalloc.stop()
+        assert (
+            profiler.total["outer"]["peak_memory"]
+            >= 10**6
+            > profiler.total["inner"]["peak_memory"]
+        )
+
+    def test_no_profiler(self):
+        with Configuration(G.HARRY_POTTER_2_PS1).measure("stage", 10) as counters:
+            assert counters["bytes"] == 10
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from ps1_argonaut.TextureArray import *
+
+
+@pytest.fixture
+def texture_array(tmp_path):
+    path = tmp_path / "textures.bin"
+    with TextureArrayWriter(path) as writer:
+        writer.add("RGB", np.arange(2 * 3 * 3, dtype=np.uint8).reshape((2, 3, 3)))
+        writer.add("RGBA", Image.new("RGBA", (5, 1), (1, 2, 3, 4)))
+    return TextureArray(path)
+
+
+class TestTextureArray:
+    def test_names(self, texture_array):
+        assert len(texture_array) == 2
+        assert texture_array.names == ["RGB", "RGBA"]
+        assert "RGBA" in texture_array
+
+    def test_rgb_image(self, texture_array):
+        image = texture_array["RGB"]
+        assert image.shape == (2, 3, 4)
+        assert image[1, 2].tolist() == [15, 16, 17, 255]
+
+    def test_rgba_image(self, texture_array):
+        assert texture_array[1].tolist() == [[[1, 2, 3, 4]] * 5]
+        assert texture_array.index["offset"][1] % TextureArray.alignment == 0
+
+    def test_long_name(self, tmp_path):
+        with pytest.raises(ValueError):
+            with TextureArrayWriter(tmp_path / "textures.bin") as writer:
+                writer.add("X" * 33, Image.new("RGBA", (1, 1)))
+
+    def test_empty(self, tmp_path):
+        with TextureArrayWriter(tmp_path / "textures.bin"):
+            pass
+        assert len(TextureArray(tmp_path / "textures.bin")) == 0
+
+    def test_incomplete(self, tmp_path):
+        with pytest.raises(KeyError):
+            with TextureArrayWriter(tmp_path / "textures.bin") as writer:
+                writer.add("RGBA", Image.new("RGBA", (1, 1)))
+                raise KeyError
+        with pytest.raises(ValueError):
+            TextureArray(tmp_path / "textures.bin")
@@ -0,0 +1,83 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# WADFile must be imported first to resolve the circular imports of the sections
+import ps1_argonaut.files.WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.wad_sections.TPSX.TextureAtlas import TextureAtlas
+from ps1_argonaut.wad_sections.TPSX.TextureData import TextureData
+from ps1_argonaut import synthetic
+
+
+def overlap(box1, box2):
+    return (
+        box1[0] < box2[2]
+        and box2[0] < box1[2]
+        and box1[1] < box2[3]
+        and box2[1] < box1[3]
+    )
+
+
+class TestPackBoxes:
+    @pytest.mark.parametrize("seed", range(4))
+    def test_no_overlap(self, seed):
+        sizes = np.random.default_rng(seed).integers(1, 64, (50, 2))
+        positions, (width, height) = TextureAtlas.pack_boxes(sizes)
+        boxes = np.concatenate((positions, positions + sizes), axis=1).tolist()
+        for i, box in enumerate(boxes):
+            assert box[0] >= 0 and box[1] >= 0
+            assert box[2] <= width and box[3] <= height
+            assert not any(overlap(box, other) for other in boxes[i + 1 :])
+
+    def test_empty(self):
+        positions, size = TextureAtlas.pack_boxes(np.empty((0, 2), dtype=np.int64))
+        assert len(positions) == 0
+        assert size == (1, 1)
+
+
+class TestFromTexturePage:
+    @pytest.fixture
+    def textures(self):
+        conf = Configuration(G.HARRY_POTTER_2_PS1)
+        data = BytesIO(synthetic.textures_entries_bytes(20))
+        return [TextureData.parse(data, conf) for _ in range(20)]
+
+    @pytest.fixture
+    def texture_page(self):
+        """Texture page whose pixels are all different: they hold their own coordinates."""
+        y, x = np.mgrid[:1024, :1024]
+        pixels = np.stack((x % 256, y % 256, 4 * (x // 256) + y // 256), axis=2)
+        return Image.fromarray(pixels.astype(np.uint8), "RGB")
+
+    def test_coords(self, textures, texture_page):
+        # Texture 3 is used twice
+        textures_ids = [3, 0, 7, 3, 12, 19]
+        atlas = TextureAtlas.from_texture_page(texture_page, textures, textures_ids)
+        scale = np.array(atlas.image.size) / 1024
+        for texture_id, texture in enumerate(textures):
+            atlas_coords = np.array(atlas.textures[texture_id].output_coords)
+            if texture_id not in textures_ids:
+                assert not atlas_coords.any()
+                continue
+            # The atlas coordinates point to the same texels as in the texture page
+            atlas_coords = atlas_coords * scale
+            assert np.allclose(atlas_coords, np.rint(atlas_coords))
+            atlas_coords = np.rint(atlas_coords).astype(np.int64)
+            coords = np.array(texture.output_coords)
+            atlas_box = (*atlas_coords.min(axis=0), *atlas_coords.max(axis=0))
+            box = (*coords.min(axis=0), *coords.max(axis=0))
+            assert np.array_equal(
+                np.asarray(atlas.image.crop(atlas_box)),
+                np.asarray(texture_page.crop(box)),
+            )
+            assert (atlas_coords - atlas_box[:2] == coords - box[:2]).all()
+
+    def test_size(self, textures, texture_page):
+        atlas = TextureAtlas.from_texture_page(texture_page, textures, [0, 1])
+        areas = [
+            np.prod(np.ptp(np.array(textures[i].output_coords), axis=0)) for i in (0, 1)
+        ]
+        assert sum(areas) <= np.prod(atlas.image.size) < 1024 * 1024
@@ -0,0 +1,46 @@
+from io import BytesIO
+
+import pytest
+
+# WADFile must be imported first to resolve the circular imports of the sections
+import ps1_argonaut.files.WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.wad_sections.TPSX.TextureFile import TextureFile
+from ps1_argonaut.wad_sections.TPSX.TextureFlags import TextureFlags
+from ps1_argonaut import synthetic
+
+
+@pytest.fixture
+def texture_file():
+    conf = Configuration(G.HARRY_POTTER_2_PS1)
+    # The last 16 textures aren't stored
+    data = synthetic.texture_file_bytes(conf, 20)
+    return TextureFile.parse(
+        BytesIO(data), conf, has_legacy_textures=False, end=len(data)
+    )
+
+
+def with_byte(texture_file: TextureFile, offset: int):
+    """Copy of the texture file, with the given byte of its textures data changed."""
+    data = bytearray(texture_file.textures_data)
+    data[offset] ^= 0xFF
+    return TextureFile(
+        texture_file.n_rows, bytes(data), texture_file.legacy_alpha, texture_file
+    )
+
+
+class TestTextureFileDigest:
+    def test_same_content(self, texture_file):
+        assert with_byte(with_byte(texture_file, 0), 0).digest == texture_file.digest
+
+    def test_changed_palette(self, texture_file):
+        texture = texture_file[0]
+        assert TextureFlags.IS_NOT_PALETTED not in texture.flags
+        changed = with_byte(texture_file, texture.palette_start)
+        assert changed.digest != texture_file.digest
+
+    def test_changed_pixels(self, texture_file):
+        left, top, right, bottom = texture_file[0].input_box
+        # 16-colors textures have 2 pixels per byte
+        changed = with_byte(texture_file, top * 512 + left // 2)
+        assert changed.digest != texture_file.digest
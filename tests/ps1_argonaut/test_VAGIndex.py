@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+# WADFile must be imported first to resolve the circular imports of the sections
+from ps1_argonaut.files.WADFile import WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.wad_sections.SPSX.VAGIndex import VAGIndex
+from ps1_argonaut import synthetic
+
+
+@pytest.fixture
+def conf():
+    return Configuration(G.HARRY_POTTER_2_PS1)
+
+
+@pytest.fixture
+def wad_files(conf):
+    """Two WADs with the same sounds."""
+    res = []
+    for stem in ("A", "B"):
+        wad_file = synthetic.wad_file(
+            conf,
+            stem,
+            n_textures=4,
+            n_models=1,
+            n_animations=1,
+            n_rows=2,
+            n_columns=2,
+            n_sounds=3,
+            n_sound_blocks=8,
+        )
+        wad_file.parse(conf)
+        res.append(wad_file)
+    return res
+
+
+def export(wad_files: list[WADFile], folder_path, vag_index: VAGIndex):
+    for wad_file in wad_files:
+        wad_file.export_audio_to_wav(folder_path, wad_file.stem, vag_index)
+
+
+class TestVAGIndex:
+    def test_duplicates(self, tmp_path, wad_files):
+        vag_index = VAGIndex()
+        export(wad_files, tmp_path, vag_index)
+        vag_index.save_manifest(tmp_path)
+        assert sorted(path.name for path in tmp_path.glob("*.WAV")) == [
+            "A_ambient_0.WAV",
+            "A_dialogue_0.WAV",
+            "A_effect_0.WAV",
+        ]
+        manifest = json.loads((tmp_path / VAGIndex.manifest_filename).read_text())
+        assert manifest == {
+            "B_ambient_0.WAV": "A_ambient_0.WAV",
+            "B_dialogue_0.WAV": "A_dialogue_0.WAV",
+            "B_effect_0.WAV": "A_effect_0.WAV",
+        }
+
+    def test_hardlinks(self, tmp_path, wad_files):
+        export(wad_files, tmp_path, VAGIndex(hardlinks=True))
+        for prefix in ("ambient", "dialogue", "effect"):
+            assert (tmp_path / f"B_{prefix}_0.WAV").samefile(
+                tmp_path / f"A_{prefix}_0.WAV"
+            )
+
+    def test_load(self, tmp_path, wad_files):
+        vag_index = VAGIndex()
+        export(wad_files[:1], tmp_path, vag_index)
+        vag_index.save(tmp_path)
+        (tmp_path / "A_effect_0.WAV").unlink()
+
+        vag_index = VAGIndex.load(tmp_path)
+        assert len(vag_index) == 2
+        export(wad_files[1:], tmp_path, vag_index)
+        # Only the sound whose file was deleted is written again
+        assert sorted(path.name for path in tmp_path.glob("*.WAV")) == [
+            "A_ambient_0.WAV",
+            "A_dialogue_0.WAV",
+            "B_effect_0.WAV",
+        ]
+        assert vag_index.duplicates == {
+            tmp_path / "B_ambient_0.WAV": tmp_path / "A_ambient_0.WAV",
+            tmp_path / "B_dialogue_0.WAV": tmp_path / "A_dialogue_0.WAV",
+        }
+
+    def test_load_same_paths(self, tmp_path, wad_files):
+        vag_index = VAGIndex(hardlinks=True)
+        export(wad_files, tmp_path, vag_index)
+        vag_index.save(tmp_path)
+        vag_index = VAGIndex.load(tmp_path, hardlinks=True)
+        export(wad_files, tmp_path, vag_index)
+        assert not vag_index.duplicates
+        assert (tmp_path / "B_effect_0.WAV").samefile(tmp_path / "A_effect_0.WAV")
@@ -0,0 +1,119 @@
+import json
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+# WADFile must be imported first to resolve the circular imports of the sections
+from ps1_argonaut.files.WADFile import WADFile
+from ps1_argonaut.configuration import Configuration, G
+from ps1_argonaut.ContentStore import ContentStore
+from ps1_argonaut.errors_warnings import MissingFallbackData
+from ps1_argonaut.wad_sections.DPSX.DPSXSection import DPSXSection
+from ps1_argonaut.wad_sections.DPSX.LevelFile import actor_instance_dtype
+from ps1_argonaut.wad_sections.DPSX.Model3DData import Model3DData
+from ps1_argonaut import synthetic
+
+
+@pytest.fixture(params=[G.HARRY_POTTER_1_PS1, G.HARRY_POTTER_2_PS1])
+def conf(request):
+    return Configuration(request.param)
+
+
+@pytest.fixture
+def data(conf):
+    return synthetic.wad_file(
+        conf, n_textures=40, n_models=3, n_animations=2, n_rows=4, n_columns=5
+    )._data
+
+
+class TestSyntheticWADFile:
+    @pytest.fixture
+    def wad_file(self, conf, data):
+        wad_file = WADFile("SYNTH", data=data)
+        wad_file.parse(conf)
+        return wad_file
+
+    def test_parse(self, wad_file):
+        assert wad_file.titles == ["SYNTHETIC LEVEL"]
+        assert (
+            wad_file.n_textures,
+            wad_file.n_sounds,
+            wad_file.n_models,
+            wad_file.n_animations,
+        ) == (24, 6, 3, 2)
+        chunks_matrix = wad_file.chunks_matrix
+        assert (chunks_matrix.n_rows, chunks_matrix.n_columns) == (4, 5)
+
+    def test_scan(self, conf, data, wad_file):
+        assert WADFile("SYNTH", data=data).scan(conf) == wad_file.summary
+
+    def test_serialize(self, conf, data, wad_file):
+        data_out = BytesIO()
+        wad_file.serialize(data_out, conf)
+        assert data_out.getvalue() == data
+
+    def test_models_offsets(self, conf, data, wad_file):
+        dpsx_offset = wad_file.sections_offsets[DPSXSection.codename_bytes]
+        data_in = BytesIO(data)
+        for model_3d, offset in zip(
+            wad_file.models_3d, wad_file.dpsx.models_3d_offsets
+        ):
+            data_in.seek(dpsx_offset + offset)
+            assert (
+                Model3DData.parse(data_in, conf).vertices[0].tolist()
+                == model_3d.vertices[0].tolist()
+            )
+
+    def test_store_experimental_models(self, tmp_path, conf, data, wad_file):
+        store = ContentStore(tmp_path)
+        wad_file.store_experimental_models(store, "SYNTH")
+        n_objects = len(list(store.objects_path.iterdir()))
+        other_wad_file = WADFile("OTHER", data=data)
+        other_wad_file.parse(conf)
+        other_wad_file.store_experimental_models(store, "OTHER")
+        store.save_manifests()
+        # The identical WADs share all their objects
+        assert len(list(store.objects_path.iterdir())) == n_objects
+        for name in ("SYNTH", "OTHER"):
+            manifest = json.loads((tmp_path / f"{name}.json").read_text())
+            # Texture, material & models
+            assert len(manifest) == 2 + wad_file.n_models
+            assert all((tmp_path / path).is_file() for path in manifest.values())
+
+    def test_lighting_view(self, wad_file, data):
+        assert wad_file.dpsx.level_file.lighting.data.obj is data
+
+    def test_fallback_data(self, conf, data, wad_file):
+        offset = wad_file.sections_offsets[DPSXSection.codename_bytes]
+        assert isinstance(wad_file.dpsx._data, memoryview)
+        assert wad_file.dpsx._data.obj is data
+        assert wad_file.dpsx._data[:4] == data[offset : offset + 4]
+
+    def test_low_memory(self, conf, data):
+        conf.low_memory = True
+        wad_file = WADFile("SYNTH", data=data)
+        wad_file.parse(conf)
+        with pytest.raises(MissingFallbackData):
+            wad_file.serialize(BytesIO(), conf)
+
+    @pytest.mark.parametrize(
+        "options", [(True, False, False), (False, True, False), (False, False, True)]
+    )
+    def test_empty_level_gltf(self, tmp_path, wad_file, options):
+        wad_file.export_level_gltf(tmp_path, "SYNTH", [], *options)
+        assert (tmp_path / "SYNTH.GLB").is_file()
+
+    def test_level_gltf_actors(self, tmp_path, wad_file):
+        actors_instances = np.zeros(2, dtype=actor_instance_dtype)
+        actors_instances["position"] = [[0, 0, 0], [1024, 2048, 3072]]
+        wad_file.dpsx.level_file.actors_instances = actors_instances
+        wad_file.export_level_gltf(tmp_path, "SYNTH", lighting=False, actors=True)
+        glb = (tmp_path / "SYNTH.GLB").read_bytes()
+        nodes = json.loads(glb[20 : 20 + int.from_bytes(glb[12:16], "little")])["nodes"]
+        actors = [node for node in nodes if "_actor_" in node["name"]]
+        # Actors' models aren't reversed yet, they are placed as empty nodes
+        assert [node["translation"] for node in actors] == [[0, 0, 0], [1, 2, 3]]
+        assert all(
+            "mesh" not in node and node["extras"]["script_id"] == -1 for node in actors
+        )
@@ -57,3 +57,18 @@ class TestPad2048Bytes:
     def test_pad_in_2048_bytes_above_multiple(self, bio_above_multiple):
         pad_in_2048_bytes(bio_above_multiple)
         assert bio_above_multiple.tell() == 2 * padding_size
+
+
+class TestColorArrays:
+    def test_parse_high_color_array(self):
+        colors = parse_high_color_array(b"\x1f\x80\xe0\x03\x00\x00", True)
+        assert colors.tolist() == [[255, 0, 0, 255], [0, 255, 0, 255], [0, 0, 0, 0]]
+
+    def test_parse_high_color_array_matches_list(self):
+        data = bytes(range(1, 256, 3))
+        assert parse_high_color_array(data, False).flatten().tolist() == (
+            parse_high_color(data, False)
+        )
+
+    def test_parse_4bits_paletted_array(self):
+        assert parse_4bits_paletted_array(b"\x21\xf0").tolist() == [1, 2, 0, 15]